@@ -9,7 +9,7 @@ django.setup()
 # Now import Django models and services
 from schedule.services.section_registration_services.algorithm_service import AlgorithmService
 
-print("NOTE: Running with placeholder algorithms - no actual assignments will be made")
+print("Balancing language course sections")
 
 # Run the algorithm for language courses
 result = AlgorithmService.balance_section_assignments('SPA6')
@@ -8,6 +8,18 @@ class CSVUploadForm(forms.Form):
         help_text='Upload a CSV file to import data. Please ensure the format matches the templates provided.',
         widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv'})
     )
+    validate_only = forms.BooleanField(
+        label='Validate only',
+        required=False,
+        help_text='Check the file and report what would be created or updated without saving anything.',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    background = forms.BooleanField(
+        label='Import in the background',
+        required=False,
+        help_text='Recommended for large files. The page shows progress while the rows are imported.',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
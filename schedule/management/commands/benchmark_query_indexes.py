@@ -0,0 +1,37 @@
+"""
+Management command to measure the hot scheduler queries with and without their indexes.
+"""
+from django.core.management.base import BaseCommand
+from schedule.services.benchmark_services.index_benchmark_service import IndexBenchmarkService
+
+
+class Command(BaseCommand):
+    help = ("Generate a throwaway dataset and report the plan and median latency of the hot "
+            "conflict, enrollment and registration queries without and with their indexes")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students-per-grade', type=int, default=400, help="Students generated in each grade")
+        parser.add_argument('--grades', type=int, default=8, help="Number of grades generated")
+        parser.add_argument('--repeat', type=int, default=20, help="Times each query is run")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed for the generated dataset")
+        parser.add_argument('--plans', action='store_true', help="Print the query plans")
+
+    def handle(self, *args, **options):
+        result = IndexBenchmarkService.run(
+            students_per_grade=options['students_per_grade'],
+            grades=options['grades'],
+            repeat=options['repeat'],
+            seed=options['seed'],
+        )
+
+        self.stdout.write("Dataset: " + ", ".join(f"{count} {name}" for name, count in result['dataset'].items()))
+        self.stdout.write(f"{'query':<40} {'rows':>7} {'before ms':>10} {'after ms':>10}")
+        for query in result['queries']:
+            self.stdout.write(
+                f"{query['name']:<40} {query['rows']:>7} {query['before_ms']:>10.3f} {query['after_ms']:>10.3f}"
+            )
+            if options['plans']:
+                self.stdout.write(f"  before: {query['before_plan']}")
+                self.stdout.write(f"  after:  {query['after_plan']}")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished, generated data was rolled back"))
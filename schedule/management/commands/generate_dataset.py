@@ -0,0 +1,54 @@
+"""
+Management command to generate a synthetic school dataset for load and scale testing.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from schedule.services.benchmark_services.synthetic_dataset_service import SyntheticDataset, SyntheticDatasetService
+
+
+class Command(BaseCommand):
+    help = ("Generate a reproducible synthetic school (students, teachers, rooms, periods, courses, "
+            "sections and course requests) as CSV files or straight into the database")
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--output', help="Directory to write CSV files in the upload formats to")
+        target.add_argument('--database', action='store_true', help="Bulk insert the rows into the database")
+
+        parser.add_argument('--students-per-grade', type=int, default=375, help="Students in each grade")
+        parser.add_argument('--grades', type=int, default=8, help="Number of grades")
+        parser.add_argument('--first-grade', type=int, default=1, help="Lowest grade level")
+        parser.add_argument('--periods', type=int, default=8, help="Period slots per day")
+        parser.add_argument('--class-size', type=int, default=25, help="Target students per section")
+        parser.add_argument('--part-time-ratio', type=float, default=0.1,
+                            help="Share of new teachers who are only available in the early slots")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed; the same seed gives the same dataset")
+        parser.add_argument('--enroll', action='store_true',
+                            help="Also place every course request in a section (database only)")
+
+    def handle(self, *args, **options):
+        if options['enroll'] and not options['database']:
+            raise CommandError("--enroll needs --database, enrollments have no CSV format")
+
+        dataset = SyntheticDataset(
+            students_per_grade=options['students_per_grade'],
+            grades=options['grades'],
+            first_grade=options['first_grade'],
+            periods=options['periods'],
+            class_size=options['class_size'],
+            part_time_ratio=options['part_time_ratio'],
+            seed=options['seed'],
+        )
+        if options['enroll']:
+            dataset.assign_sections()
+
+        self.stdout.write("Generated " + ", ".join(f"{count} {name}" for name, count in dataset.counts().items()))
+
+        if options['database']:
+            try:
+                SyntheticDatasetService.write_database(dataset)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS("Dataset written to the database"))
+        else:
+            paths = SyntheticDatasetService.write_csv(dataset, options['output'])
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(paths)} files to {options['output']}"))
@@ -0,0 +1,48 @@
+"""
+Management command to import a directory or zip archive of CSV files in one transaction.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from schedule.services.import_services.dataset_import_service import DatasetImportService, MAX_PARSE_WORKERS
+
+
+class Command(BaseCommand):
+    help = "Import every CSV file in a directory or zip archive, in dependency order, in one transaction"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Directory or .zip file containing the CSV files")
+        parser.add_argument(
+            '--allow-errors',
+            action='store_true',
+            help="Save the valid rows even if some rows have errors"
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=MAX_PARSE_WORKERS,
+            help="Number of files parsed at the same time"
+        )
+
+    def handle(self, *args, **options):
+        result = DatasetImportService.import_dataset(
+            options['path'], allow_errors=options['allow_errors'], max_workers=options['workers']
+        )
+
+        for item in result['files']:
+            self.stdout.write(
+                f"{item['name']} ({item['data_type']}): {item['created']} created, "
+                f"{item['updated']} updated, {item['unchanged']} unchanged"
+            )
+            for error in item['errors'][:10]:
+                self.stdout.write(f"  {error}")
+            if len(item['errors']) > 10:
+                self.stdout.write(f"  ... and {len(item['errors']) - 10} more errors")
+
+        for item in result['skipped']:
+            self.stdout.write(self.style.WARNING(f"Skipped {item['name']}: {item['reason']}"))
+
+        if 'parse_time' in result:
+            self.stdout.write(f"Parsed in {result['parse_time']:.2f}s, written in {result['write_time']:.2f}s")
+
+        if not result['success']:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(result['message']))
@@ -0,0 +1,35 @@
+"""
+Management command to rebuild or verify the schedule conflict index.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from schedule.services.section_services.conflict_index_service import ConflictIndexService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the schedule conflict index from a full scan, or check it against one"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only compare the index with a full scan and report differences"
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            result = ConflictIndexService.check_consistency()
+            if result['consistent']:
+                self.stdout.write(self.style.SUCCESS("Conflict index is consistent with a full scan"))
+                return
+
+            for conflict in result['missing']:
+                self.stdout.write(f"Missing from index: {conflict}")
+            for conflict in result['stale']:
+                self.stdout.write(f"Stale in index: {conflict}")
+            raise CommandError(
+                f"Conflict index is out of date: {len(result['missing'])} missing, "
+                f"{len(result['stale'])} stale. Run without --check to rebuild it."
+            )
+
+        count = ConflictIndexService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt conflict index with {count} conflicts"))
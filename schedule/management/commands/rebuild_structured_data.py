@@ -0,0 +1,20 @@
+"""
+Management command to rebuild the structured copies of availability, eligible teachers and period days.
+"""
+from django.core.management.base import BaseCommand
+from schedule.models import Period
+from schedule.services.section_services.structured_data_service import StructuredDataService
+
+
+class Command(BaseCommand):
+    help = "Re-parse teacher availability, course eligible teachers and period days into their indexed tables"
+
+    def handle(self, *args, **options):
+        for period in Period.objects.all():
+            period.save(update_fields=['days'])
+
+        counts = StructuredDataService.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {counts['availability_rows']} availability rows and "
+            f"{counts['eligibility_rows']} eligible teacher rows"
+        ))
@@ -0,0 +1,35 @@
+"""
+Management command to check or repair the denormalized section enrollment counts.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from schedule.services.section_services.enrollment_count_service import EnrollmentCountService
+
+
+class Command(BaseCommand):
+    help = "Recompute each section's enrolled_count from its enrollments and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only report sections whose stored count differs from their enrollments"
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = EnrollmentCountService.find_drift()
+        else:
+            drift = EnrollmentCountService.reconcile()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Section enrollment counts match the enrollments"))
+            return
+
+        for row in drift:
+            self.stdout.write(f"Section {row['id']}: stored {row['stored']}, actual {row['actual']}")
+
+        if options['check']:
+            raise CommandError(
+                f"{len(drift)} section enrollment counts have drifted. Run without --check to repair them."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} section enrollment counts"))
@@ -0,0 +1,65 @@
+"""
+Management command to run the benchmark suite and compare it against a saved baseline.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from schedule.services.benchmark_services.benchmark_suite_service import (
+    BENCHMARK_SIZES, DEFAULT_TOLERANCE, BenchmarkSuiteService
+)
+
+
+class Command(BaseCommand):
+    help = ("Time CSV imports, conflict detection, reports, exports and the assignment algorithms "
+            "on generated datasets, and flag regressions against a baseline")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', choices=list(BENCHMARK_SIZES), default=['small'],
+                            help="Dataset sizes to run at")
+        parser.add_argument('--only', nargs='+', help="Glob patterns of benchmark names to run, e.g. 'export.*'")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed for the generated datasets")
+        parser.add_argument('--no-memory', action='store_true',
+                            help="Do not track peak memory (tracking slows the measured code down)")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--baseline', help="Compare against results saved from an earlier run")
+        parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help="Allowed relative slowdown or memory growth before a result is a regression")
+
+    def handle(self, *args, **options):
+        results = BenchmarkSuiteService.run(
+            sizes=options['sizes'],
+            only=options['only'],
+            track_memory=not options['no_memory'],
+            seed=options['seed'],
+        )
+
+        for size, size_results in results['sizes'].items():
+            self.stdout.write(f"{size}: " + ", ".join(
+                f"{count} {name}" for name, count in size_results['dataset'].items()
+            ))
+            self.stdout.write(f"  {'benchmark':<46} {'seconds':>9} {'queries':>8} {'peak KB':>9}")
+            for name, measurement in size_results['results'].items():
+                peak = measurement['peak_kb'] if measurement['peak_kb'] is not None else '-'
+                self.stdout.write(
+                    f"  {name:<46} {measurement['seconds']:>9.4f} {measurement['queries']:>8} {peak:>9}"
+                )
+
+        if options['output']:
+            BenchmarkSuiteService.save(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if not options['baseline']:
+            return
+
+        try:
+            baseline = BenchmarkSuiteService.load(options['baseline'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline: {str(e)}")
+
+        regressions = BenchmarkSuiteService.compare(results, baseline, options['tolerance'])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{regression['size']} {regression['name']}: {regression['metric']} "
+                f"{regression['baseline']} -> {regression['current']}"
+            ))
+        if regressions:
+            raise CommandError(f"{len(regressions)} regressions against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
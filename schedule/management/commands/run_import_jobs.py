@@ -0,0 +1,39 @@
+"""
+Management command to run pending background CSV imports.
+
+Running jobs whose worker stopped reporting progress are marked failed when
+the command starts.
+"""
+import time
+from django.core.management.base import BaseCommand
+from schedule.services.import_services.import_job_service import ImportJobService
+
+
+class Command(BaseCommand):
+    help = "Run pending CSV import jobs, once or continuously as a worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=0,
+            help="Keep running and check for new jobs every POLL seconds"
+        )
+
+    def handle(self, *args, **options):
+        failed, removed = ImportJobService.recover_interrupted_jobs()
+        if failed:
+            self.stdout.write(self.style.WARNING(f"Marked {failed} interrupted jobs as failed"))
+        if removed:
+            self.stdout.write(f"Removed {removed} orphaned upload files")
+
+        while True:
+            for job in ImportJobService.run_pending_jobs():
+                style = self.style.SUCCESS if job.status == 'completed' else self.style.ERROR
+                self.stdout.write(style(f"Job {job.id} ({job.file_name}): {job.message}"))
+                if job.error_count:
+                    self.stdout.write(f"  {job.error_count} rows had errors")
+
+            if not options['poll']:
+                return
+            time.sleep(options['poll'])
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copies of the occupancy rules at the time of this migration, so the
+# migration keeps working if the live conflict code changes
+DAY_CODES = ['M', 'T', 'W', 'TH', 'F']
+CONFLICT_KEYS = {'teacher': 'teacher_id', 'room': 'room_id', 'student': 'student_id'}
+
+
+def _segment_units(when):
+    """Get the twelfths of the school year a Section.when value covers."""
+    spans = {
+        's1': (0, 5), 's2': (6, 11),
+        't1': (0, 3), 't2': (4, 7), 't3': (8, 11),
+        'q1': (0, 2), 'q2': (3, 5), 'q3': (6, 8), 'q4': (9, 11),
+    }
+    first, last = spans.get((when or 'year').lower(), (0, 11))
+    return set(range(first, last + 1))
+
+
+def _days(days):
+    """Get the day codes in a Period.days string; no days listed means every day."""
+    codes = {code.strip().upper() for code in (days or '').split('|')} & set(DAY_CODES)
+    return codes or set(DAY_CODES)
+
+
+def build_conflict_index(apps, schema_editor):
+    """Index the conflicts already in the schedule, as ConflictIndexService.rebuild does."""
+    Section = apps.get_model('schedule', 'Section')
+    Enrollment = apps.get_model('schedule', 'Enrollment')
+    ScheduleConflict = apps.get_model('schedule', 'ScheduleConflict')
+
+    sections = {}
+    for row in Section.objects.exclude(period__isnull=True).values(
+        'id', 'period__slot', 'period__days', 'when', 'teacher_id', 'room_id'
+    ).order_by('id'):
+        row['days'] = _days(row['period__days'])
+        row['units'] = _segment_units(row['when'])
+        sections[row['id']] = row
+
+    student_rows = [
+        dict(sections[section_id], student_id=student_id)
+        for student_id, section_id in Enrollment.objects.values_list(
+            'student_id', 'section_id'
+        ).order_by('student_id', 'section_id')
+        if section_id in sections
+    ]
+
+    rows_by_type = {'teacher': sections.values(), 'room': sections.values(), 'student': student_rows}
+    conflicts = []
+    for conflict_type, rows in rows_by_type.items():
+        key = CONFLICT_KEYS[conflict_type]
+        groups = {}
+        for row in rows:
+            if row[key] is not None:
+                groups.setdefault((row[key], row['period__slot']), []).append(row)
+
+        # Pair each clashing section with the first earlier section it overlaps
+        for group in groups.values():
+            for position, section in enumerate(group[1:], start=1):
+                for first in group[:position]:
+                    if first['days'] & section['days'] and first['units'] & section['units']:
+                        conflicts.append(ScheduleConflict(
+                            conflict_type=conflict_type,
+                            resource_id=section[key],
+                            period_slot=section['period__slot'],
+                            section_id=first['id'],
+                            other_section_id=section['id'],
+                        ))
+                        break
+
+    ScheduleConflict.objects.bulk_create(conflicts, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0015_sectionsettings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleConflict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('conflict_type', models.CharField(choices=[('teacher', 'Teacher'), ('room', 'Room'), ('student', 'Student')], max_length=10)),
+                ('resource_id', models.CharField(help_text='ID of the teacher, room or student that is double-booked', max_length=20)),
+                ('period_slot', models.CharField(max_length=10)),
+                ('other_section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schedule.section')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schedule.section')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['conflict_type', 'resource_id'], name='schedule_sc_conflic_ddc6f7_idx')],
+            },
+        ),
+        migrations.RunPython(build_conflict_index, migrations.RunPython.noop),
+    ]
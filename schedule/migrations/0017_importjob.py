@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0016_scheduleconflict'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_type', models.CharField(max_length=20)),
+                ('file_name', models.CharField(max_length=255)),
+                ('source_path', models.CharField(help_text='Temporary copy of the upload, removed when the job finishes', max_length=500)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('bytes_processed', models.BigIntegerField(default=0)),
+                ('rows_processed', models.IntegerField(default=0)),
+                ('created_count', models.IntegerField(default=0)),
+                ('updated_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('errors', models.TextField(blank=True, default='', help_text='One error message per line')),
+                ('message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0017_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='unchanged_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
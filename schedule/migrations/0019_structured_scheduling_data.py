@@ -0,0 +1,121 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:01
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copies of the parsing rules at the time of this migration, so the
+# migration keeps working if the live utilities change
+DAY_CODES = ['M', 'T', 'W', 'TH', 'F']
+ENTRY_PATTERN = re.compile(r'^(TH|M|T|W|F)(\w+)$')
+
+
+def day_mask(days):
+    """Get a bitmask of the days in a Period.days string; no days listed means every day."""
+    mask = 0
+    for code in (days or '').split('|'):
+        code = code.strip().upper()
+        if code in DAY_CODES:
+            mask |= 1 << DAY_CODES.index(code)
+    return mask or (1 << len(DAY_CODES)) - 1
+
+
+def parse_availability(availability):
+    """Parse an availability string such as 'M1-M6,T1-T3' into (day, slot) pairs."""
+    slots = set()
+    for token in re.split(r'[,|;]', availability or ''):
+        start_text, _, end_text = token.strip().partition('-')
+        start = ENTRY_PATTERN.match(start_text.strip().upper())
+        if not start:
+            continue
+        end = ENTRY_PATTERN.match(end_text.strip().upper()) if end_text else start
+        if not end or end.group(1) != start.group(1):
+            slots.add(start.groups())
+            continue
+        if start.group(2).isdigit() and end.group(2).isdigit():
+            slots.update((start.group(1), str(slot)) for slot in range(int(start.group(2)), int(end.group(2)) + 1))
+        else:
+            slots.update((start.groups(), end.groups()))
+    return slots
+
+
+def populate_structured_data(apps, schema_editor):
+    """Parse the existing availability, eligible teacher and day text into the new storage."""
+    Period = apps.get_model('schedule', 'Period')
+    Teacher = apps.get_model('schedule', 'Teacher')
+    Course = apps.get_model('schedule', 'Course')
+    TeacherAvailability = apps.get_model('schedule', 'TeacherAvailability')
+    CourseEligibleTeacher = apps.get_model('schedule', 'CourseEligibleTeacher')
+
+    for period in Period.objects.all():
+        Period.objects.filter(pk=period.pk).update(day_mask=day_mask(period.days))
+
+    rows = []
+    unreadable = []
+    for teacher_id, availability in Teacher.objects.values_list('id', 'availability').order_by('id'):
+        slots = parse_availability(availability)
+        if availability.strip() and not slots:
+            unreadable.append(f"{teacher_id} ('{availability.strip()}')")
+        rows.extend(
+            TeacherAvailability(teacher_id=teacher_id, day=day, slot=slot)
+            for day, slot in sorted(slots)
+        )
+    TeacherAvailability.objects.bulk_create(rows, batch_size=500)
+
+    # These keep their text but get no rows, so they are treated as never available
+    # until the availability is corrected, rather than as free in every period
+    if unreadable:
+        print(f"\n  Unreadable availability left for review: {', '.join(unreadable)}")
+
+    rows = []
+    for course_id, eligible in Course.objects.values_list('id', 'eligible_teachers'):
+        teacher_ids = [teacher_id.strip() for teacher_id in (eligible or '').split('|') if teacher_id.strip()]
+        rows.extend(
+            CourseEligibleTeacher(course_id=course_id, teacher_id=teacher_id, position=position)
+            for position, teacher_id in enumerate(dict.fromkeys(teacher_ids))
+        )
+    CourseEligibleTeacher.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0018_importjob_unchanged_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='period',
+            name='day_mask',
+            field=models.IntegerField(db_index=True, default=1, help_text="Bitmask of the days in 'days' (bit 0 Monday to bit 4 Friday), kept in sync on save"),
+        ),
+        migrations.CreateModel(
+            name='TeacherAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.CharField(choices=[('M', 'Monday'), ('T', 'Tuesday'), ('W', 'Wednesday'), ('TH', 'Thursday'), ('F', 'Friday')], max_length=2)),
+                ('slot', models.CharField(max_length=10)),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_slots', to='schedule.teacher')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'slot'], name='schedule_te_day_e332d9_idx')],
+                'unique_together': {('teacher', 'day', 'slot')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseEligibleTeacher',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_teacher_links', to='schedule.course')),
+                ('teacher', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='eligible_course_links', to='schedule.teacher')),
+            ],
+            options={
+                'ordering': ['course', 'position'],
+                'unique_together': {('course', 'teacher')},
+            },
+        ),
+        migrations.RunPython(populate_structured_data, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0019_structured_scheduling_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseenrollment',
+            index=models.Index(fields=['course', 'student'], name='schedule_co_course__ba1d5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['section', 'student'], name='schedule_en_section_146403_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='period',
+            index=models.Index(fields=['slot'], name='schedule_pe_slot_25c8fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['teacher', 'period'], name='schedule_se_teacher_52415c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['room', 'period'], name='schedule_se_room_id_8e802e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['course', 'when'], name='schedule_se_course__edca30_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grade_level', 'id'], name='schedule_st_grade_l_e9273b_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_enrolled_count(apps, schema_editor):
+    """Count the existing enrollments of every section."""
+    Section = apps.get_model('schedule', 'Section')
+    Enrollment = apps.get_model('schedule', 'Enrollment')
+    counts = Enrollment.objects.filter(section=OuterRef('pk')).order_by().values('section') \
+        .annotate(total=Count('id')).values('total')
+    Section.objects.update(enrolled_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0020_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='enrolled_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of enrolled students, kept in step with the enrollments'),
+        ),
+        migrations.RunPython(populate_enrolled_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:29
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    """Create the single data version row the report cache is keyed on."""
+    DataVersion = apps.get_model('schedule', 'DataVersion')
+    DataVersion.objects.get_or_create(pk=1)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0021_section_enrolled_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
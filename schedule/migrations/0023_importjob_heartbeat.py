@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0022_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last time the running job reported progress', null=True),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='worker',
+            field=models.CharField(blank=True, default='', help_text='Host and process running the job', max_length=100),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from .utils.occupancy_utils import day_mask
 
 # Create your models here.
 
@@ -35,6 +36,11 @@ class Student(models.Model):
     grade_level = models.IntegerField()
     preferences = models.TextField(help_text="Format: 'Art|Robotics'")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['grade_level', 'id']),
+        ]
+
     def __str__(self):
         return f"{self.name} - Grade {self.grade_level}"
     
@@ -82,9 +88,22 @@ class Period(models.Model):
     id = models.CharField(max_length=10, primary_key=True)
     period_name = models.CharField(max_length=50, blank=True, null=True, help_text="Descriptive name for this period")
     days = models.TextField(default='M', help_text="Format: 'M|T|W' for Monday, Tuesday, Wednesday")
+    day_mask = models.IntegerField(default=1, db_index=True,
+                                   help_text="Bitmask of the days in 'days' (bit 0 Monday to bit 4 Friday), kept in sync on save")
     slot = models.CharField(max_length=10, help_text="Period identifier (e.g., 1, 2, A, B, L for Lunch)")
     start_time = models.TimeField()
     end_time = models.TimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['slot']),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.day_mask = day_mask(self.days)
+        if kwargs.get('update_fields') is not None and 'days' in kwargs['update_fields']:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'day_mask'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         if self.period_name:
@@ -124,6 +143,8 @@ class Section(models.Model):
     students = models.ManyToManyField(Student, through='Enrollment', related_name='sections', blank=True)
     max_size = models.IntegerField(null=True, blank=True)
     exact_size = models.IntegerField(null=True, blank=True, help_text="If set, this section should have exactly this many students")
+    enrolled_count = models.IntegerField(default=0, editable=False,
+                                         help_text="Number of enrolled students, kept in step with the enrollments")
     when = models.CharField(max_length=20, default='year',
                           choices=[('year', 'Full Year'), 
                                   ('semester', 'Semester'),
@@ -140,11 +161,30 @@ class Section(models.Model):
                                   ('t3', 'Trimester 3'),
                                   ])
     
+    class Meta:
+        # Conflict checks look up a teacher's or room's sections by period, and
+        # placement looks up a course's sections by term segment
+        indexes = [
+            models.Index(fields=['teacher', 'period']),
+            models.Index(fields=['room', 'period']),
+            models.Index(fields=['course', 'when']),
+        ]
+    
     def __str__(self):
         return f"{self.course.name} - Section {self.section_number}"
     
+    def save(self, *args, **kwargs):
+        # enrolled_count only changes through F() updates, so saving an instance
+        # loaded before other enrollments were written must not write it back
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'enrolled_count'
+            ]
+        super().save(*args, **kwargs)
+    
     def current_enrollment(self):
-        return self.students.count()
+        return self.enrolled_count
     
     def get_students_list(self):
         """Get a list of student IDs enrolled in this section."""
@@ -157,10 +197,52 @@ class Enrollment(models.Model):
     
     class Meta:
         unique_together = [('student', 'section')]
+        # The unique pair serves lookups by student; this one serves rosters by section
+        indexes = [
+            models.Index(fields=['section', 'student']),
+        ]
         
     def __str__(self):
         return f"{self.student.name} enrolled in {self.section}"
 
+class TeacherAvailability(models.Model):
+    """
+    One (day, slot) a teacher is available, parsed from Teacher.availability.
+    A teacher with blank availability text has no rows and no restrictions. Kept in sync by
+    StructuredDataService when teachers are saved or imported.
+    """
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='availability_slots')
+    day = models.CharField(max_length=2, choices=Period.DAY_CHOICES)
+    slot = models.CharField(max_length=10)
+    
+    class Meta:
+        unique_together = [('teacher', 'day', 'slot')]
+        indexes = [
+            models.Index(fields=['day', 'slot']),
+        ]
+    
+    def __str__(self):
+        return f"{self.teacher_id} available {self.day}{self.slot}"
+
+class CourseEligibleTeacher(models.Model):
+    """
+    A teacher listed in Course.eligible_teachers, in the order listed. The
+    teacher is not a database constraint because courses can name teachers
+    that have not been imported yet. Kept in sync by StructuredDataService
+    when courses are saved or imported.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='eligible_teacher_links')
+    teacher = models.ForeignKey(Teacher, on_delete=models.DO_NOTHING, db_constraint=False,
+                                related_name='eligible_course_links')
+    position = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = [('course', 'teacher')]
+        ordering = ['course', 'position']
+    
+    def __str__(self):
+        return f"{self.teacher_id} can teach {self.course_id}"
+
 class CourseEnrollment(models.Model):
     """Tracks students enrolled in courses (but not yet assigned to specific sections)"""
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='course_enrollments')
@@ -169,6 +251,9 @@ class CourseEnrollment(models.Model):
     
     class Meta:
         unique_together = [('student', 'course')]
+        indexes = [
+            models.Index(fields=['course', 'student']),
+        ]
         
     def __str__(self):
         return f"{self.student.name} enrolled in {self.course.name}"
@@ -267,3 +352,82 @@ class SectionSettings(models.Model):
             return self.language_min_size
         else:
             return self.elective_min_size  # Default to elective min size
+
+class ScheduleConflict(models.Model):
+    """
+    A current schedule conflict between two sections, kept up to date by the
+    signal handlers in schedule/signals.py so reports can read the conflict set
+    without rescanning the whole schedule.
+    """
+    CONFLICT_TYPES = [
+        ('teacher', 'Teacher'),
+        ('room', 'Room'),
+        ('student', 'Student'),
+    ]
+    
+    conflict_type = models.CharField(max_length=10, choices=CONFLICT_TYPES)
+    resource_id = models.CharField(max_length=20, help_text="ID of the teacher, room or student that is double-booked")
+    period_slot = models.CharField(max_length=10)
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='+')
+    other_section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='+')
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['conflict_type', 'resource_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_conflict_type_display()} {self.resource_id}: {self.section_id} / {self.other_section_id}"
+
+class ImportJob(models.Model):
+    """
+    A CSV import run in the background by ImportJobService, with progress the
+    upload page can poll while the rows are processed.
+    """
+    STATUSES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    data_type = models.CharField(max_length=20)
+    file_name = models.CharField(max_length=255)
+    source_path = models.CharField(max_length=500, help_text="Temporary copy of the upload, removed when the job finishes")
+    file_size = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUSES, default='pending')
+    bytes_processed = models.BigIntegerField(default=0)
+    rows_processed = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    unchanged_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    errors = models.TextField(blank=True, default='', help_text="One error message per line")
+    message = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True, default='', help_text="Host and process running the job")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last time the running job reported progress")
+    
+    def __str__(self):
+        return f"Import {self.id} ({self.data_type}, {self.get_status_display()})"
+    
+    def get_errors_list(self):
+        return self.errors.split('\n') if self.errors else []
+    
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+class DataVersion(models.Model):
+    """
+    A single-row counter bumped by every write to the scheduling data.
+    Cached report snapshots are tagged with the version they were built at,
+    and since the counter lives in the database every process and the import
+    worker see the same version, whatever cache backend is configured.
+    """
+    version = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Data version {self.version}"
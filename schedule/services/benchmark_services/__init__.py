@@ -0,0 +1 @@
+# Benchmark services package for measuring query and job performance on generated data
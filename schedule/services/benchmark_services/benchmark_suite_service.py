@@ -0,0 +1,243 @@
+import csv
+import fnmatch
+import json
+import time
+import tracemalloc
+from io import StringIO
+from django.db import connection, transaction
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ...models import Enrollment, Section
+from ..csv_processors.processor_factory import ProcessorFactory
+from ..enrollment_services.section_assignment_service import SectionAssignmentService
+from ..schedule_generation_services.section_placement_service import SectionPlacementService
+from ..section_registration_services.algorithm_service import AlgorithmService
+from ..section_registration_services.registration_service import RegistrationService
+from ..section_services.conflict_index_service import ConflictIndexService
+from ..section_services.conflict_service import ConflictService
+from ..section_services.enrollment_count_service import EnrollmentCountService
+from ..section_services.export_service import ExportService
+from ...views.schedule_generation_views import admin_reports
+from .synthetic_dataset_service import SyntheticDataset, SyntheticDatasetService
+
+# Dataset sizes the suite can run at, as SyntheticDataset arguments
+BENCHMARK_SIZES = {
+    'small': {'students_per_grade': 50, 'grades': 2},
+    'medium': {'students_per_grade': 150, 'grades': 4},
+    'large': {'students_per_grade': 375, 'grades': 8},
+}
+
+# A result is a regression when it is this much slower or bigger than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and the slowdown is also more than this many seconds, so noise on fast paths is ignored
+MIN_SLOWDOWN_SECONDS = 0.05
+
+
+def _consume(response):
+    """Read a whole (possibly streamed) response and return its size in bytes."""
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _admin_reports():
+    return _consume(admin_reports(RequestFactory().get('/reports/')))
+
+
+def _without_enrollments():
+    """Remove every enrollment so the assignment algorithms start from scratch."""
+    with ConflictIndexService.deferred(), EnrollmentCountService.deferred():
+        Enrollment.objects.all().delete()
+
+
+def _without_sections():
+    """Remove every section so section placement starts from scratch."""
+    with ConflictIndexService.deferred():
+        Section.objects.all().delete()
+
+
+def _first_grade():
+    return Section.objects.order_by('course__grade_level').values_list('course__grade_level', flat=True).first()
+
+
+# Paths measured against a fully loaded dataset, as (name, setup, run). Each one
+# runs in its own savepoint that is rolled back, so they all see the same data.
+BENCHMARKS = [
+    ('conflicts.find_all_conflicts', None, ConflictService.find_all_conflicts),
+    ('reports.admin_reports', None, _admin_reports),
+    ('registration.get_section_stats', None, lambda: RegistrationService.get_section_stats(
+        Section.objects.all().select_related('course', 'period', 'teacher', 'room')
+    )),
+    ('export.master_schedule', None, lambda: _consume(ExportService.export_master_schedule())),
+    ('export.student_schedules', None, lambda: _consume(ExportService.export_student_schedules())),
+    ('export.student_roster', None, lambda: _consume(ExportService.export_student_roster())),
+    ('algorithm.assign_students_to_sections', _without_enrollments,
+     SectionAssignmentService.assign_students_to_sections),
+    ('algorithm.assign_student_schedules', _without_enrollments,
+     SectionAssignmentService.assign_student_schedules),
+    ('algorithm.register_language_and_core_courses', _without_enrollments,
+     lambda: AlgorithmService.register_language_and_core_courses(grade_level=_first_grade())),
+    ('algorithm.balance_section_assignments', None, AlgorithmService.balance_section_assignments),
+    ('algorithm.generate_sections', _without_sections, SectionPlacementService.generate_sections),
+]
+
+
+class BenchmarkSuiteService:
+    """
+    Service class for timing the scheduler's key paths on generated datasets.
+
+    Each size generates a SyntheticDataset, imports it one CSV data type at a
+    time through the upload path (timing each import), adds the course
+    requests and enrollments, and then runs every benchmark in BENCHMARKS. Wall time, query count and peak
+    Python memory are recorded for each path. Everything runs in a transaction
+    that is rolled back, so the database is left as it was.
+    """
+
+    @staticmethod
+    def run(sizes=('small',), only=None, track_memory=True, seed=1):
+        """
+        Run the suite at one or more dataset sizes.
+
+        Args:
+            sizes: Names from BENCHMARK_SIZES
+            only: Optional glob patterns; only benchmarks whose name matches one are run
+            track_memory: Record peak memory with tracemalloc (slows the measured code down)
+            seed: Random seed for the generated datasets
+
+        Returns:
+            dict: JSON-serializable results keyed by size, with the dataset row
+                  counts and a {'seconds', 'queries', 'peak_kb'} entry per benchmark
+        """
+        results = {
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'seed': seed,
+            'sizes': {},
+        }
+        for size in sizes:
+            results['sizes'][size] = BenchmarkSuiteService.run_size(size, only, track_memory, seed)
+        return results
+
+    @staticmethod
+    def run_size(size, only=None, track_memory=True, seed=1):
+        """Run every selected benchmark at one dataset size."""
+        dataset = SyntheticDataset(seed=seed, **BENCHMARK_SIZES[size])
+        dataset.assign_sections()
+
+        def selected(name):
+            return not only or any(fnmatch.fnmatch(name, pattern) for pattern in only)
+
+        measurements = {}
+        with transaction.atomic():
+            for level in ProcessorFactory.get_import_order():
+                for data_type in level:
+                    reader = csv.reader(StringIO(BenchmarkSuiteService.to_csv(data_type, dataset.rows[data_type])))
+                    next(reader)
+                    processor = ProcessorFactory.get_processor(data_type)
+                    measurement = BenchmarkSuiteService.measure(
+                        lambda: processor.process_csv_stream(reader), track_memory
+                    )
+                    if selected(f'import.{data_type}'):
+                        measurements[f'import.{data_type}'] = measurement
+            SyntheticDatasetService.write_extras(dataset)
+
+            for name, setup, run in BENCHMARKS:
+                if not selected(name):
+                    continue
+                with transaction.atomic():
+                    if setup:
+                        setup()
+                    measurements[name] = BenchmarkSuiteService.measure(run, track_memory)
+                    transaction.set_rollback(True)
+
+            transaction.set_rollback(True)
+
+        return {'dataset': dataset.counts(), 'results': measurements}
+
+    @staticmethod
+    def to_csv(data_type, rows):
+        """Render data type rows as the CSV file an upload would contain."""
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(ProcessorFactory.get_expected_headers(data_type))
+        writer.writerows(rows)
+        return output.getvalue()
+
+    @staticmethod
+    def measure(func, track_memory=True):
+        """
+        Call func once and measure it.
+
+        Returns:
+            dict: 'seconds' of wall time, number of 'queries' and 'peak_kb' of
+                  Python memory allocated (None when memory is not tracked)
+        """
+        if track_memory:
+            tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                func()
+                seconds = time.perf_counter() - start
+            peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024) if track_memory else None
+        finally:
+            if track_memory:
+                tracemalloc.stop()
+
+        return {'seconds': round(seconds, 4), 'queries': len(queries), 'peak_kb': peak_kb}
+
+    @staticmethod
+    def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+        """
+        Find the benchmarks that got worse than a saved baseline.
+
+        A benchmark regresses when it runs more queries, when it is slower by more
+        than the tolerance (and by more than MIN_SLOWDOWN_SECONDS), or when its
+        peak memory grows by more than the tolerance. Benchmarks missing from
+        the baseline are not compared.
+
+        Args:
+            results: Output of run()
+            baseline: Output of an earlier run()
+            tolerance: Allowed relative growth, e.g. 0.25 for 25%
+
+        Returns:
+            list: One dict per regression with size, name, metric, baseline and current values
+        """
+        regressions = []
+        for size, current in results['sizes'].items():
+            base_results = baseline.get('sizes', {}).get(size, {}).get('results', {})
+            for name, measurement in current['results'].items():
+                base = base_results.get(name)
+                if base is None:
+                    continue
+
+                worse = []
+                if measurement['queries'] > base['queries']:
+                    worse.append('queries')
+                if (measurement['seconds'] > base['seconds'] * (1 + tolerance)
+                        and measurement['seconds'] - base['seconds'] > MIN_SLOWDOWN_SECONDS):
+                    worse.append('seconds')
+                if (measurement['peak_kb'] is not None and base.get('peak_kb') is not None
+                        and measurement['peak_kb'] > base['peak_kb'] * (1 + tolerance)):
+                    worse.append('peak_kb')
+
+                regressions.extend(
+                    {'size': size, 'name': name, 'metric': metric,
+                     'baseline': base[metric], 'current': measurement[metric]}
+                    for metric in worse
+                )
+        return regressions
+
+    @staticmethod
+    def load(path):
+        """Load results saved as JSON."""
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def save(results, path):
+        """Save results as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
@@ -0,0 +1,168 @@
+import statistics
+import time
+from django.db import connection, transaction
+from django.db.models import Count
+from ...models import CourseEnrollment, Enrollment, Period, Section, Student
+from .synthetic_dataset_service import SyntheticDataset, SyntheticDatasetService
+
+# Indexes added for the hot query shapes below, as (model, indexed fields)
+HOT_QUERY_INDEXES = [
+    (Section, ('teacher', 'period')),
+    (Section, ('room', 'period')),
+    (Section, ('course', 'when')),
+    (Period, ('slot',)),
+    (Enrollment, ('section', 'student')),
+    (CourseEnrollment, ('course', 'student')),
+    (Student, ('grade_level', 'id')),
+]
+
+
+def _hot_queries(sample):
+    """
+    The query shapes the conflict, enrollment and registration services run most,
+    built for one sample section, student, course and grade.
+
+    Returns:
+        list: (name, QuerySet) pairs
+    """
+    same_slot = Section.objects.filter(period__slot=sample['slot']).exclude(id=sample['section_id'])
+    return [
+        # ConflictService.check_section_conflicts
+        ('conflict.teacher_sections', same_slot.filter(teacher_id=sample['teacher_id'])),
+        ('conflict.room_sections', same_slot.filter(room_id=sample['room_id'])),
+        ('conflict.student_sections', Enrollment.objects.filter(
+            student__in=Enrollment.objects.filter(section_id=sample['section_id']).values('student_id'),
+            section__in=same_slot
+        )),
+        # EnrollmentService.get_section_enrollments / check_enrollment_conflicts
+        ('enrollment.section_roster', Enrollment.objects.filter(section_id=sample['section_id'])
+            .select_related('student')),
+        ('enrollment.student_conflicts', Enrollment.objects.filter(
+            student_id=sample['student_id'], section__period__slot=sample['slot']
+        ).exclude(section_id=sample['section_id'])),
+        # RegistrationService.deregister_sections / section assignment requests
+        ('registration.grade_course_sections', Enrollment.objects.filter(
+            section__course_id=sample['course_id'], student__grade_level=sample['grade_level']
+        )),
+        ('registration.grade_course_requests', CourseEnrollment.objects.filter(
+            course_id=sample['course_id'], student__grade_level=sample['grade_level']
+        )),
+        ('registration.course_term_sections', Section.objects.filter(
+            course_id=sample['course_id'], when=sample['when']
+        )),
+    ]
+
+
+class IndexBenchmarkService:
+    """
+    Service class for measuring the hot scheduler queries with and without the
+    composite indexes in HOT_QUERY_INDEXES.
+
+    Everything happens inside one transaction that is rolled back, so the
+    generated dataset and the dropped indexes never outlive the run.
+    """
+
+    @staticmethod
+    def run(students_per_grade=400, grades=8, repeat=20, seed=1):
+        """
+        Generate a dataset, then time and explain each hot query without and with the indexes.
+
+        Args:
+            students_per_grade: Students generated in each grade
+            grades: Number of grades generated
+            repeat: Times each query is run; the median is reported
+            seed: Random seed for the generated dataset
+
+        Returns:
+            dict: 'dataset' row counts and a 'queries' list with the plan and
+                  median milliseconds before and after the indexes
+        """
+        with transaction.atomic():
+            dataset = IndexBenchmarkService.generate_dataset(students_per_grade, grades, seed)
+            sample = IndexBenchmarkService.pick_sample()
+            queries = _hot_queries(sample)
+
+            indexes = IndexBenchmarkService.get_indexes()
+            editor = connection.schema_editor()
+            for model, index in indexes:
+                editor.execute(index.remove_sql(model, editor))
+            without = [IndexBenchmarkService.measure(queryset, repeat) for _, queryset in queries]
+
+            for model, index in indexes:
+                editor.execute(index.create_sql(model, editor))
+            with_indexes = [IndexBenchmarkService.measure(queryset, repeat) for _, queryset in queries]
+
+            transaction.set_rollback(True)
+
+        return {
+            'dataset': dataset,
+            'queries': [
+                {
+                    'name': name,
+                    'rows': after['rows'],
+                    'before_ms': before['median_ms'],
+                    'after_ms': after['median_ms'],
+                    'before_plan': before['plan'],
+                    'after_plan': after['plan'],
+                }
+                for (name, _), before, after in zip(queries, without, with_indexes)
+            ],
+        }
+
+    @staticmethod
+    def get_indexes():
+        """Get the (model, Index) pairs named in HOT_QUERY_INDEXES."""
+        pairs = []
+        for model, fields in HOT_QUERY_INDEXES:
+            index = next(index for index in model._meta.indexes if tuple(index.fields) == fields)
+            pairs.append((model, index))
+        return pairs
+
+    @staticmethod
+    def measure(queryset, repeat):
+        """
+        Run a query several times and get its plan.
+
+        Returns:
+            dict: 'plan' text, 'rows' returned and 'median_ms'
+        """
+        timings = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            rows = len(queryset.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        return {
+            'plan': queryset.explain(),
+            'rows': rows,
+            'median_ms': round(statistics.median(timings), 3),
+        }
+
+    @staticmethod
+    def pick_sample():
+        """Pick the busiest section and one of its students as the query parameters."""
+        section = Section.objects.annotate(size=Count('students')).select_related('period', 'course') \
+            .order_by('-size', 'id').first()
+        enrollment = Enrollment.objects.filter(section=section).select_related('student').order_by('student_id').first()
+        return {
+            'section_id': section.id,
+            'slot': section.period.slot,
+            'teacher_id': section.teacher_id,
+            'room_id': section.room_id,
+            'course_id': section.course_id,
+            'when': section.when,
+            'student_id': enrollment.student_id,
+            'grade_level': enrollment.student.grade_level,
+        }
+
+    @staticmethod
+    def generate_dataset(students_per_grade, grades, seed):
+        """
+        Write a synthetic school with every course request placed in a section.
+
+        Returns:
+            dict: Number of rows generated per table
+        """
+        dataset = SyntheticDataset(students_per_grade=students_per_grade, grades=grades, seed=seed)
+        dataset.assign_sections()
+        SyntheticDatasetService.write_database(dataset)
+        return dataset.counts()
@@ -0,0 +1,392 @@
+import csv
+import math
+import os
+import random
+from django.db import transaction
+from ...models import Course, CourseEnrollment, CourseGroup, Enrollment, Period, TrimesterCourseGroup
+from ...utils.occupancy_utils import SEGMENT_UNITS, OccupancyIndex, day_mask, segment_mask
+from ..csv_processors.processor_factory import ProcessorFactory
+from ..section_services.conflict_index_service import ConflictIndexService
+from ..section_services.enrollment_count_service import EnrollmentCountService
+from ..report_services.data_version_service import DataVersionService
+
+# Course catalog repeated for every grade: (code, name, course type, duration, subject, room type)
+YEAR_COURSES = [
+    ('ENG', 'English', 'core', 'year', 'English', 'classroom'),
+    ('MATH', 'Math', 'core', 'year', 'Math', 'classroom'),
+    ('SCI', 'Science', 'core', 'year', 'Science', 'lab'),
+    ('SOC', 'Social Studies', 'core', 'year', 'Social Studies', 'classroom'),
+    ('PE', 'Physical Education', 'required_elective', 'year', 'PE', 'gym'),
+]
+QUARTER_COURSES = [
+    ('HLTH', 'Health', 'required_elective', 'quarter', 'Health', 'classroom'),
+]
+# Every student takes each language in a different trimester of the same period
+LANGUAGE_COURSES = [
+    ('SPA', 'Spanish', 'language', 'trimester', 'Spanish', 'classroom'),
+    ('FRE', 'French', 'language', 'trimester', 'French', 'classroom'),
+    ('CHI', 'Chinese', 'language', 'trimester', 'Chinese', 'classroom'),
+]
+# Students pick one elective per trimester
+ELECTIVE_COURSES = [
+    ('ART', 'Art', 'elective', 'trimester', 'Art', 'art'),
+    ('MUS', 'Music', 'elective', 'trimester', 'Music', 'music'),
+    ('ROBO', 'Robotics', 'elective', 'trimester', 'Robotics', 'lab'),
+    ('CODE', 'Coding', 'elective', 'trimester', 'Coding', 'lab'),
+    ('DRAM', 'Drama', 'elective', 'trimester', 'Drama', 'classroom'),
+]
+
+SEGMENTS = {
+    'year': ['year'],
+    'trimester': ['t1', 't2', 't3'],
+    'quarter': ['q1', 'q2', 'q3', 'q4'],
+}
+
+ROOM_CAPACITY = {'classroom': 30, 'lab': 24, 'gym': 60, 'art': 24, 'music': 30}
+
+FIRST_NAMES = ['Ava', 'Ben', 'Chloe', 'Diego', 'Emma', 'Finn', 'Grace', 'Hiro', 'Isla', 'Jamal',
+               'Kai', 'Lena', 'Mateo', 'Nora', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sam', 'Tara',
+               'Uma', 'Victor', 'Wen', 'Xavier', 'Yara', 'Zane']
+LAST_NAMES = ['Adams', 'Brown', 'Chen', 'Davis', 'Evans', 'Garcia', 'Hughes', 'Ito', 'Jones', 'Kim',
+              'Lopez', 'Moore', 'Nguyen', 'Ortiz', 'Patel', 'Reed', 'Singh', 'Torres', 'Walker', 'Young']
+
+COURSE_REQUEST_HEADERS = ['student_id', 'course_id']
+
+
+class SyntheticDataset:
+    """
+    A generated school: CSV rows in the ProcessorFactory formats plus the
+    course requests, course groups and (optionally) enrollments that have no
+    CSV format.
+
+    The generator places every section in a period with a teacher and room
+    that are free for its term segment, adding teachers and rooms as needed,
+    so the result is a conflict-free master schedule sized like a real
+    building. The same seed always produces the same dataset.
+    """
+
+    def __init__(self, students_per_grade=375, grades=8, first_grade=1, periods=8, class_size=25,
+                 part_time_ratio=0.1, seed=1):
+        self.rng = random.Random(seed)
+        self.students_per_grade = students_per_grade
+        self.grade_levels = list(range(first_grade, first_grade + grades))
+        self.slot_count = max(3, periods)
+        self.class_size = max(1, class_size)
+        self.part_time_ratio = part_time_ratio
+
+        self.rows = {data_type: [] for data_type in ProcessorFactory.get_available_data_types()}
+        self.course_requests = []
+        self.enrollments = []
+        self.groups = []
+
+        self._index = OccupancyIndex()
+        self._teachers = {}  # subject -> [teacher dicts]
+        self._rooms = {}     # room type -> [room dicts]
+        self._teacher_count = 0
+        self._room_count = 0
+        self._sections = []
+
+        self._build_periods()
+        for grade in self.grade_levels:
+            self._build_grade(grade)
+        self._build_teacher_and_room_rows()
+        self._build_course_requests()
+
+    def _build_periods(self):
+        """One period per slot every day, except the last slot which alternates M|W|F and T|TH."""
+        self.periods = []
+        for slot in range(1, self.slot_count + 1):
+            start = 8 * 60 + (slot - 1) * 55
+            times = f'{start // 60:02d}:{start % 60:02d}', f'{(start + 50) // 60:02d}:{(start + 50) % 60:02d}'
+            if slot < self.slot_count:
+                patterns = [(f'P{slot}', f'Period {slot}', 'M|T|W|TH|F')]
+            else:
+                patterns = [(f'P{slot}A', f'Period {slot}A', 'M|W|F'), (f'P{slot}B', f'Period {slot}B', 'T|TH')]
+            for period_id, name, days in patterns:
+                period = {'id': period_id, 'slot': str(slot), 'days': days, 'day_mask': day_mask(days)}
+                self.periods.append(period)
+                self.rows['periods'].append([period_id, name, days, str(slot), times[0], times[1]])
+
+    def _build_grade(self, grade):
+        """Add the courses and sections of one grade."""
+        daily = [period for period in self.periods if period['days'] == 'M|T|W|TH|F']
+        grade_offset = self.grade_levels.index(grade) * 2
+        language_period = daily[grade_offset % len(daily)]
+        elective_period = daily[(grade_offset + 1) % len(daily)]
+        open_periods = [period for period in self.periods if period not in (language_period, elective_period)]
+
+        students = self.students_per_grade
+        for code, name, course_type, duration, subject, room_type in YEAR_COURSES + QUARTER_COURSES:
+            # Each student takes a quarter course in just one of the quarters
+            per_segment = math.ceil(students / len(SEGMENTS[duration]) / self.class_size)
+            self._add_course(grade, code, name, course_type, duration, subject, room_type,
+                             per_segment, open_periods, grade_offset)
+
+        # A third of the grade takes each language in each trimester
+        per_segment = math.ceil(students / 3 / self.class_size)
+        language_ids = [
+            self._add_course(grade, code, name, course_type, duration, subject, room_type,
+                             per_segment, [language_period], 0)
+            for code, name, course_type, duration, subject, room_type in LANGUAGE_COURSES
+        ]
+        self.groups.append({'kind': 'course', 'name': f'Grade {grade} Languages',
+                            'courses': language_ids, 'period': language_period['id']})
+
+        # Elective sections are spread evenly with some slack for uneven choices
+        per_segment = math.ceil(students * 1.2 / len(ELECTIVE_COURSES) / self.class_size)
+        elective_ids = [
+            self._add_course(grade, code, name, course_type, duration, subject, room_type,
+                             per_segment, [elective_period], 0)
+            for code, name, course_type, duration, subject, room_type in ELECTIVE_COURSES
+        ]
+        self.groups.append({'kind': 'trimester', 'name': f'Grade {grade} Electives',
+                            'courses': elective_ids, 'period': elective_period['id']})
+
+    def _add_course(self, grade, code, name, course_type, duration, subject, room_type,
+                    per_segment, periods, offset):
+        """Add a course and its sections, spreading year and quarter sections over the periods."""
+        course_id = f'{code}{grade}'
+        teacher_ids = []
+        number = 0
+        for segment in SEGMENTS[duration]:
+            for i in range(per_segment):
+                number += 1
+                start = (offset + i) % len(periods)
+                teacher, room, period = self._place(subject, room_type, periods[start:] + periods[:start], segment)
+                teacher_ids.append(teacher['id'])
+                self._sections.append({'id': f'{course_id}-{number}', 'course_id': course_id,
+                                       'mask': self._mask(period, segment), 'size': 0})
+                self.rows['sections'].append([
+                    course_id, str(number), teacher['id'], period['id'], room['id'],
+                    str(min(self.class_size + 5, room['capacity'])), segment
+                ])
+
+        self.rows['courses'].append([
+            course_id, f'{name} {grade}', course_type, '|'.join(dict.fromkeys(teacher_ids)),
+            str(grade), str(number), duration
+        ])
+        return course_id
+
+    def _mask(self, period, segment):
+        return self._index.section_mask(period['slot'], period['day_mask'], segment)
+
+    def _place(self, subject, room_type, periods, segment):
+        """Find the first period with a free teacher and room, hiring or building when none are free."""
+        teachers = self._teachers.setdefault(subject, [])
+        rooms = self._rooms.setdefault(room_type, [])
+
+        for period in periods:
+            mask = self._mask(period, segment)
+            teacher = next((t for t in teachers if t['load'] < t['max_load'] and not t['busy'] & mask
+                            and (t['slots'] is None or int(period['slot']) in t['slots'])), None)
+            if teacher is not None:
+                break
+        else:
+            period = periods[0]
+            mask = self._mask(period, segment)
+            teacher = self._new_teacher(subject, int(period['slot']))
+
+        room = next((r for r in rooms if not r['busy'] & mask), None)
+        if room is None:
+            self._room_count += 1
+            room = {'id': f'R{self._room_count:04d}', 'type': room_type,
+                    'capacity': ROOM_CAPACITY[room_type], 'busy': 0}
+            rooms.append(room)
+
+        teacher['busy'] |= mask
+        # Load is counted in year-long periods, so three trimester sections add up to one
+        teacher['load'] += bin(segment_mask(segment)).count('1') / SEGMENT_UNITS
+        room['busy'] |= mask
+        return teacher, room, period
+
+    def _new_teacher(self, subject, first_slot):
+        """Hire a teacher for a subject; some are part time and only teach the early slots."""
+        self._teacher_count += 1
+        part_time_slots = self.slot_count // 2
+        part_time = first_slot <= part_time_slots and self.rng.random() < self.part_time_ratio
+        teacher = {
+            'id': f'T{self._teacher_count:04d}',
+            'subject': subject,
+            'first_name': self.rng.choice(FIRST_NAMES),
+            'last_name': self.rng.choice(LAST_NAMES),
+            'slots': set(range(1, part_time_slots + 1)) if part_time else None,
+            'max_load': part_time_slots - 1 if part_time else self.slot_count - 2,
+            'load': 0,
+            'busy': 0,
+        }
+        self._teachers[subject].append(teacher)
+        return teacher
+
+    def _build_teacher_and_room_rows(self):
+        for teachers in self._teachers.values():
+            for teacher in teachers:
+                availability = ''
+                if teacher['slots'] is not None:
+                    last = max(teacher['slots'])
+                    availability = ','.join(f'{day}1-{day}{last}' for day in ['M', 'T', 'W', 'TH', 'F'])
+                self.rows['teachers'].append([
+                    teacher['id'], teacher['first_name'], teacher['last_name'], availability, teacher['subject']
+                ])
+        for rooms in self._rooms.values():
+            for room in rooms:
+                self.rows['rooms'].append([room['id'], str(100 + int(room['id'][1:])), str(room['capacity']), room['type']])
+        self.rows['teachers'].sort()
+        self.rows['rooms'].sort()
+
+    def _build_course_requests(self):
+        """Every student requests their grade's required courses, all languages and one elective per trimester."""
+        number = 0
+        for grade in self.grade_levels:
+            required = [f'{code}{grade}' for code, *_ in YEAR_COURSES + QUARTER_COURSES + LANGUAGE_COURSES]
+            electives = [f'{code}{grade}' for code, *_ in ELECTIVE_COURSES]
+            for _ in range(self.students_per_grade):
+                number += 1
+                student_id = f'S{number:05d}'
+                nickname = self.rng.choice(FIRST_NAMES) if self.rng.random() < 0.1 else ''
+                self.rows['students'].append([
+                    student_id, self.rng.choice(FIRST_NAMES), nickname, self.rng.choice(LAST_NAMES), str(grade)
+                ])
+                for course_id in required + self.rng.sample(electives, 3):
+                    self.course_requests.append([student_id, course_id])
+
+    def assign_sections(self):
+        """
+        Place every course request in the emptiest section of its course that
+        fits the student's timetable, skipping requests that fit nowhere.
+
+        Returns:
+            list: [student_id, section_id] pairs, also kept in self.enrollments
+        """
+        course_sections = {}
+        for section in self._sections:
+            course_sections.setdefault(section['course_id'], []).append(section)
+
+        self.enrollments = []
+        busy = {}
+        for student_id, course_id in self.course_requests:
+            student_busy = busy.get(student_id, 0)
+            candidates = [
+                section for section in course_sections.get(course_id, [])
+                if not section['mask'] & student_busy and section['size'] < self.class_size + 5
+            ]
+            if not candidates:
+                continue
+            section = min(candidates, key=lambda s: (s['size'], s['id']))
+            section['size'] += 1
+            busy[student_id] = student_busy | section['mask']
+            self.enrollments.append([student_id, section['id']])
+        return self.enrollments
+
+    def counts(self):
+        """Get the number of rows generated for each table."""
+        counts = {data_type: len(rows) for data_type, rows in self.rows.items()}
+        counts['course_requests'] = len(self.course_requests)
+        counts['enrollments'] = len(self.enrollments)
+        return counts
+
+
+class SyntheticDatasetService:
+    """Service class for writing a SyntheticDataset to CSV files or straight to the database."""
+
+    @staticmethod
+    def write_csv(dataset, directory):
+        """
+        Write one CSV file per data type in the upload formats, plus course_requests.csv.
+
+        The data type files can be loaded with the import_dataset command, which
+        skips course_requests.csv since it has no upload format.
+
+        Args:
+            dataset: SyntheticDataset
+            directory: Directory to write to, created if missing
+
+        Returns:
+            list: Paths of the files written
+        """
+        os.makedirs(directory, exist_ok=True)
+        tables = [(data_type, ProcessorFactory.get_expected_headers(data_type), rows)
+                  for data_type, rows in dataset.rows.items()]
+        tables.append(('course_requests', COURSE_REQUEST_HEADERS, dataset.course_requests))
+
+        paths = []
+        for name, headers, rows in tables:
+            path = os.path.join(directory, f'{name}.csv')
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                writer.writerows(rows)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def write_database(dataset):
+        """
+        Bulk insert a dataset in one transaction.
+
+        The data type rows go through the same processors as a CSV import, so
+        structured availability and eligibility are filled in; course requests,
+        groups and enrollments are inserted directly.
+
+        Args:
+            dataset: SyntheticDataset
+
+        Returns:
+            dict: Number of rows written per table
+        """
+        written = {}
+        with transaction.atomic(), ConflictIndexService.deferred():
+            for level in ProcessorFactory.get_import_order():
+                for data_type in level:
+                    processor = ProcessorFactory.get_processor(data_type)
+                    errors, records = processor.parse_rows(dataset.rows[data_type])
+                    counts = processor.import_records(records, errors)
+                    if counts['errors']:
+                        raise ValueError(f'Generated {data_type} rows did not import: {counts["errors"][0]}')
+                    written[data_type] = counts['created'] + counts['updated'] + counts['unchanged']
+
+            written.update(SyntheticDatasetService.write_extras(dataset))
+
+        return written
+
+    @staticmethod
+    def write_extras(dataset):
+        """
+        Insert the parts of a dataset that have no CSV format: course requests,
+        course groups and enrollments. The data type rows must already exist.
+
+        Args:
+            dataset: SyntheticDataset
+
+        Returns:
+            dict: Number of rows written per table
+        """
+        written = {}
+        with transaction.atomic(), ConflictIndexService.deferred():
+            CourseEnrollment.objects.bulk_create(
+                [CourseEnrollment(student_id=student_id, course_id=course_id)
+                 for student_id, course_id in dataset.course_requests],
+                batch_size=1000, ignore_conflicts=True
+            )
+            DataVersionService.bump()
+            written['course_requests'] = len(dataset.course_requests)
+
+            for group in dataset.groups:
+                model = CourseGroup if group['kind'] == 'course' else TrimesterCourseGroup
+                extra = {} if group['kind'] == 'course' else {'group_type': 'elective'}
+                record, _ = model.objects.update_or_create(
+                    name=group['name'], defaults={'preferred_period': Period.objects.get(id=group['period']), **extra}
+                )
+                record.courses.set(Course.objects.filter(id__in=group['courses']))
+            written['groups'] = len(dataset.groups)
+
+            Enrollment.objects.bulk_create(
+                [Enrollment(student_id=student_id, section_id=section_id)
+                 for student_id, section_id in dataset.enrollments],
+                batch_size=1000, ignore_conflicts=True
+            )
+            written['enrollments'] = len(dataset.enrollments)
+            if dataset.enrollments:
+                ConflictIndexService.refresh_students({student_id for student_id, _ in dataset.enrollments})
+                EnrollmentCountService.recount({section_id for _, section_id in dataset.enrollments})
+
+        return written
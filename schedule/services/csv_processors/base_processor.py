@@ -2,18 +2,47 @@
 Base processor for CSV data handling with common functionality 
 for validation and processing.
 """
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterable
+from itertools import islice
 import csv
+from django.db import transaction
+from ..report_services.data_version_service import DataVersionService
+
+# Number of rows written per bulk_create/bulk_update statement
+BATCH_SIZE = 500
+
+# Number of CSV rows read, validated and committed together when streaming an upload
+IMPORT_BATCH_ROWS = 2000
 
 
 class BaseProcessor:
     """Base class for CSV data processors"""
     
+    # Model the processor imports into
+    model = None
+    
+    # Foreign key fields in the parsed defaults, mapped to the model they refer to
+    foreign_keys: Dict[str, Any] = {}
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for this processor"""
         raise NotImplementedError("Subclasses must implement this method")
     
+    @classmethod
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse and validate a single row from the CSV file without touching the database
+        
+        Args:
+            row: The CSV row as a list of strings
+            line_num: The line number in the CSV file (for error reporting)
+            
+        Returns:
+            Dictionary with the primary key ('pk') and field values ('defaults'),
+            or with an 'error' message
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+    
     @classmethod
     def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
         """Process a single row from the CSV file
@@ -25,18 +54,42 @@ class BaseProcessor:
         Returns:
             Dictionary with processed data and any errors
         """
-        raise NotImplementedError("Subclasses must implement this method")
+        result = {'created': False, 'updated': False, 'error': None}
+        
+        record = cls.parse_row(row, line_num)
+        if record.get('error'):
+            result['error'] = record['error']
+            return result
+        
+        error = cls.resolve_foreign_keys(record, line_num, cls.load_lookups([record]))
+        if error:
+            result['error'] = error
+            return result
+        
+        try:
+            _, created = cls.model.objects.update_or_create(pk=record['pk'], defaults=record['defaults'])
+            result['created'] = created
+            result['updated'] = not created
+            
+        except Exception as e:
+            result['error'] = f'Line {line_num}: Error processing {cls.model._meta.verbose_name}: {str(e)}'
+            
+        return result
     
     @classmethod
-    def process_csv(cls, reader: csv.reader) -> Dict[str, Any]:
+    def process_csv(cls, reader: csv.reader, bulk: bool = True) -> Dict[str, Any]:
         """Process multiple rows from a CSV reader
         
         Args:
             reader: CSV reader object (after header row has been consumed)
+            bulk: Write all valid rows with bulk_create/bulk_update instead of row by row
             
         Returns:
             Dictionary with counts of created, updated objects and any errors
         """
+        if bulk:
+            return cls.process_csv_bulk(reader)
+        
         created, updated, errors = 0, 0, []
         
         for i, row in enumerate(reader, start=2):  # Start from 2 for line number (after header)
@@ -60,6 +113,338 @@ class BaseProcessor:
         
         return {'created': created, 'updated': updated, 'errors': errors}
     
+    @classmethod
+    def process_csv_stream(cls, reader: Iterable[List[str]], batch_rows: int = IMPORT_BATCH_ROWS,
+                           progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Process rows from a CSV reader in fixed-size batches, committing each batch
+        
+        Only one batch of rows is held at a time, so memory is bounded by the batch
+        size rather than the size of the file.
+        
+        Args:
+            reader: CSV reader object (after header row has been consumed)
+            batch_rows: Number of rows per batch
+            progress: Optional callback given the running totals after each batch
+            
+        Returns:
+            Dictionary with counts of created, updated and unchanged objects, rows and batches read, and any errors
+        """
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': [], 'rows': 0, 'batches': 0}
+        
+        while True:
+            rows = list(islice(reader, batch_rows))
+            if not rows:
+                break
+            
+            with transaction.atomic():
+                counts = cls.process_csv_bulk(rows, start_line=totals['rows'] + 2)
+            
+            totals['created'] += counts['created']
+            totals['updated'] += counts['updated']
+            totals['unchanged'] += counts['unchanged']
+            totals['errors'].extend(counts['errors'])
+            totals['rows'] += len(rows)
+            totals['batches'] += 1
+            
+            if progress:
+                progress(dict(totals))
+        
+        return totals
+    
+    @classmethod
+    def process_csv_bulk(cls, reader: Iterable[List[str]], start_line: int = 2) -> Dict[str, Any]:
+        """Process multiple rows from a CSV reader in bulk
+        
+        All rows are parsed and validated first, and foreign keys are checked against
+        lookups loaded once. The stored values of existing rows are loaded in one
+        query and compared with each parsed row, so rows that match what is already
+        stored are counted as unchanged and not written. New and changed rows are
+        then written with bulk_create and bulk_update in batches. A batch that fails
+        is retried row by row so errors are still reported against their line.
+        
+        Args:
+            reader: CSV reader object (after header row has been consumed)
+            start_line: Line number of the first row, for error reporting
+            
+        Returns:
+            Dictionary with counts of created, updated and unchanged objects and any errors
+        """
+        errors, records = cls.parse_rows(reader, start_line)
+        return cls.import_records(records, errors)
+    
+    @classmethod
+    def import_records(cls, records: List[Dict[str, Any]],
+                       errors: Optional[List[Tuple[int, str]]] = None) -> Dict[str, Any]:
+        """Write records already parsed by parse_row, skipping the ones that are unchanged
+        
+        Args:
+            records: Parsed records, each with the 'line' it came from
+            errors: (line number, error message) tuples from parsing, reported with any new errors
+            
+        Returns:
+            Dictionary with counts of created, updated and unchanged objects and any errors
+        """
+        errors = list(errors or [])
+        lookups = cls.load_lookups(records)
+        fields = list(records[0]['defaults']) if records else []
+        existing = cls.existing_values([record['pk'] for record in records], fields)
+        
+        # Later rows for the same primary key win, as they would when saved one at a time
+        pending = {}
+        for record in cls._resolve_records(records, lookups, errors):
+            previous = pending.get(record['pk'])
+            stored = previous['defaults'] if previous else existing.get(record['pk'])
+            
+            record['counts'] = dict(previous['counts']) if previous else {'created': 0, 'updated': 0, 'unchanged': 0}
+            if stored is None:
+                record['counts']['created'] += 1
+            elif stored == record['defaults']:
+                record['counts']['unchanged'] += 1
+            else:
+                record['counts']['updated'] += 1
+            
+            record['lines'] = (previous['lines'] if previous else []) + [record['line']]
+            record['exists'] = record['pk'] in existing
+            pending[record['pk']] = record
+        
+        creates = [record for record in pending.values() if not record['exists']]
+        updates = [
+            record for record in pending.values()
+            if record['exists'] and record['defaults'] != existing[record['pk']]
+        ]
+        
+        for batch_start in range(0, len(creates), BATCH_SIZE):
+            errors.extend(cls._write_batch(creates[batch_start:batch_start + BATCH_SIZE], fields))
+        for batch_start in range(0, len(updates), BATCH_SIZE):
+            errors.extend(cls._write_batch(updates[batch_start:batch_start + BATCH_SIZE], fields))
+        
+        written = [record for record in pending.values() if not record.get('failed')]
+        counts = {
+            key: sum(record['counts'][key] for record in written)
+            for key in ('created', 'updated', 'unchanged')
+        }
+        
+        created_pks = [record['pk'] for record in creates if not record.get('failed')]
+        updated_pks = [record['pk'] for record in updates if not record.get('failed')]
+        if created_pks or updated_pks:
+            # bulk_create and bulk_update skip the signals that bump the data version
+            DataVersionService.bump()
+        cls.after_write(created_pks, updated_pks)
+        
+        errors.sort(key=lambda error: error[0])
+        counts['errors'] = [message for _, message in errors]
+        return counts
+    
+    @classmethod
+    def validate_csv(cls, reader: Iterable[List[str]], batch_rows: int = IMPORT_BATCH_ROWS) -> Dict[str, Any]:
+        """Check a CSV file without writing anything (dry run)
+        
+        Rows are parsed and type checked exactly as an import would, foreign keys
+        are checked against ID sets loaded once up front, and each valid row is
+        compared with the stored object to say whether importing it would create,
+        update or leave it unchanged. Rows are read in batches, so this costs one
+        query per related model plus one per batch.
+        
+        Args:
+            reader: CSV reader object (after header row has been consumed)
+            batch_rows: Number of rows compared with the database per query
+            
+        Returns:
+            Dictionary with 'valid', row count, 'create'/'update'/'unchanged' counts and all errors
+        """
+        report = {'valid': True, 'rows': 0, 'create': 0, 'update': 0, 'unchanged': 0, 'errors': []}
+        lookups = {
+            field: set(related_model.objects.values_list('pk', flat=True))
+            for field, related_model in cls.foreign_keys.items()
+        }
+        
+        # Field values each primary key would have after the rows read so far
+        seen = {}
+        
+        while True:
+            rows = list(islice(reader, batch_rows))
+            if not rows:
+                break
+            
+            errors, records = cls.parse_rows(rows, start_line=report['rows'] + 2)
+            records = [
+                record for record in cls._resolve_records(records, lookups, errors)
+                if not cls._check_required(record, errors)
+            ]
+            existing = cls.existing_values(
+                [record['pk'] for record in records if record['pk'] not in seen],
+                list(records[0]['defaults']) if records else []
+            )
+            
+            for record in records:
+                previous = seen.get(record['pk'], existing.get(record['pk']))
+                if previous is None:
+                    report['create'] += 1
+                elif previous == record['defaults']:
+                    report['unchanged'] += 1
+                else:
+                    report['update'] += 1
+                seen[record['pk']] = record['defaults']
+            
+            errors.sort(key=lambda error: error[0])
+            report['errors'].extend(message for _, message in errors)
+            report['rows'] += len(rows)
+        
+        report['valid'] = not report['errors']
+        return report
+    
+    @classmethod
+    def check_headers(cls, headers: List[str]) -> List[str]:
+        """Get the expected headers missing from a CSV header row
+        
+        Returns:
+            List of missing header names, empty if the headers are valid
+        """
+        present = {header.strip() for header in headers}
+        return [header for header in cls.get_expected_headers() if header not in present]
+    
+    @classmethod
+    def existing_values(cls, pks: List[Any], fields: List[str]) -> Dict[Any, Dict[str, Any]]:
+        """Load the stored field values of existing objects in one query
+        
+        Args:
+            pks: Primary keys to look up
+            fields: Model fields to load, as named in parsed records' defaults
+            
+        Returns:
+            Dictionary of primary key to {field: value}
+        """
+        if not pks:
+            return {}
+        return {
+            values.pop('pk'): values
+            for values in cls.model.objects.filter(pk__in=pks).values('pk', *fields)
+        }
+    
+    @classmethod
+    def parse_rows(cls, rows: Iterable[List[str]], start_line: int = 2) -> Tuple[List[Tuple[int, str]], List[Dict[str, Any]]]:
+        """Parse rows, skipping empty ones
+        
+        Returns:
+            Tuple of ((line number, error message) list, parsed records with their 'line')
+        """
+        errors, records = [], []
+        
+        for i, row in enumerate(rows, start=start_line):
+            try:
+                if not any(row):  # Skip empty rows
+                    continue
+                record = cls.parse_row(row, i)
+            except Exception as e:
+                errors.append((i, f'Line {i}: Unexpected error: {str(e)}'))
+                continue
+            
+            if record.get('error'):
+                errors.append((i, record['error']))
+            else:
+                record['line'] = i
+                records.append(record)
+        
+        return errors, records
+    
+    @classmethod
+    def _resolve_records(cls, records: List[Dict[str, Any]], lookups: Dict[str, Any],
+                         errors: List[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """Get the records whose foreign keys all exist, adding an error for each other record"""
+        resolved = []
+        for record in records:
+            error = cls.resolve_foreign_keys(record, record['line'], lookups)
+            if error:
+                errors.append((record['line'], error))
+            else:
+                resolved.append(record)
+        return resolved
+    
+    @classmethod
+    def _check_required(cls, record: Dict[str, Any], errors: List[Tuple[int, str]]) -> bool:
+        """Add an error if a record leaves a non-nullable model field empty
+        
+        Returns:
+            True if an error was added
+        """
+        for field, value in record['defaults'].items():
+            model_field = cls.model._meta.get_field(field)
+            if value is None and not model_field.null:
+                errors.append((record['line'], f'Line {record["line"]}: Missing value for {model_field.name}'))
+                return True
+        return False
+    
+    @classmethod
+    def _write_batch(cls, batch: List[Dict[str, Any]], fields: List[str]) -> List[Tuple[int, str]]:
+        """Write one batch of new or existing records, falling back to row by row on failure
+        
+        Returns:
+            List of (line number, error message) tuples for rows that could not be written
+        """
+        if not batch:
+            return []
+        
+        try:
+            with transaction.atomic():
+                objects = [cls.model(pk=record['pk'], **record['defaults']) for record in batch]
+                if batch[0]['exists']:
+                    cls.model.objects.bulk_update(objects, fields)
+                else:
+                    cls.model.objects.bulk_create(objects)
+            return []
+        except Exception:
+            pass
+        
+        errors = []
+        for record in batch:
+            try:
+                with transaction.atomic():
+                    cls.model.objects.update_or_create(pk=record['pk'], defaults=record['defaults'])
+            except Exception as e:
+                record['failed'] = True
+                line = record['lines'][-1]
+                errors.append((line, f'Line {line}: Error processing {cls.model._meta.verbose_name}: {str(e)}'))
+        return errors
+    
+    @classmethod
+    def load_lookups(cls, records: List[Dict[str, Any]]) -> Dict[str, Dict[Any, Any]]:
+        """Load the objects referenced by the records' foreign keys, one query per related model
+        
+        Args:
+            records: Parsed records
+            
+        Returns:
+            Dictionary of field name to {primary key: object}
+        """
+        lookups = {}
+        for field, related_model in cls.foreign_keys.items():
+            ids = {record['defaults'][field] for record in records if record['defaults'].get(field)}
+            lookups[field] = related_model.objects.in_bulk(list(ids)) if ids else {}
+        return lookups
+    
+    @classmethod
+    def resolve_foreign_keys(cls, record: Dict[str, Any], line_num: int,
+                             lookups: Dict[str, Dict[Any, Any]]) -> Optional[str]:
+        """Check that every foreign key in a record refers to an existing object
+        
+        Returns:
+            Error message for the first missing object, or None
+        """
+        for field, related_model in cls.foreign_keys.items():
+            value = record['defaults'].get(field)
+            if value and value not in lookups[field]:
+                return f'Line {line_num}: {related_model.__name__} with ID {value} does not exist'
+        return None
+    
+    @classmethod
+    def after_write(cls, created_pks: List[Any], updated_pks: List[Any]) -> None:
+        """Hook run after rows are written, for work that model signals would otherwise do
+        
+        Args:
+            created_pks: Primary keys of created objects
+            updated_pks: Primary keys of updated objects
+        """
+    
     @classmethod
     def get_field_value(cls, row: List[str], index: int, default=None, required: bool = False) -> Tuple[Any, str]:
         """Helper method to extract field values from CSV rows
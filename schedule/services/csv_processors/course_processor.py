@@ -3,29 +3,32 @@ Course CSV data processor
 """
 from typing import List, Dict, Any
 from ...models import Course
+from ..section_services.structured_data_service import StructuredDataService
 from .base_processor import BaseProcessor
 
 
 class CourseProcessor(BaseProcessor):
     """Process CSV data for Course records"""
     
+    model = Course
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for course data"""
         return ['course_id', 'name', 'course_type', 'eligible_teachers', 'grade_level', 'sections_needed', 'duration']
     
     @classmethod
-    def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
-        """Process a single row of course data from CSV
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse a single row of course data from CSV
         
         Args:
             row: The CSV row as a list of strings
             line_num: The line number in the CSV file (for error reporting)
             
         Returns:
-            Dictionary with processing results and any errors
+            Dictionary with the primary key and field values, or an error
         """
-        result = {'created': False, 'updated': False, 'error': None}
+        result = {'error': None}
         
         # Get field values with validation
         course_id, error = cls.get_field_value(row, 0, required=True)
@@ -62,23 +65,19 @@ class CourseProcessor(BaseProcessor):
             result['error'] = f'Line {line_num}: Invalid sections needed, must be a number'
             return result
         
-        # Create or update course
-        try:
-            course, created = Course.objects.update_or_create(
-                id=course_id,
-                defaults={
-                    'name': name,
-                    'type': course_type,
-                    'eligible_teachers': eligible_teachers,
-                    'grade_level': grade_level,
-                    'sections_needed': sections_needed,
-                    'duration': duration
-                }
-            )
-            result['created'] = created
-            result['updated'] = not created
-            
-        except Exception as e:
-            result['error'] = f'Line {line_num}: Error processing course: {str(e)}'
-            
-        return result 
\ No newline at end of file
+        return {
+            'pk': course_id,
+            'defaults': {
+                'name': name,
+                'type': course_type,
+                'eligible_teachers': eligible_teachers,
+                'grade_level': grade_level,
+                'sections_needed': sections_needed,
+                'duration': duration
+            }
+        }
+    
+    @classmethod
+    def after_write(cls, created_pks: List[str], updated_pks: List[str]) -> None:
+        """Parse the imported eligible teachers into structured rows, since bulk writes skip signals"""
+        StructuredDataService.sync_course_eligibility(list(created_pks) + list(updated_pks))
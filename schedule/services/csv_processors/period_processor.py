@@ -3,30 +3,34 @@ Period CSV data processor
 """
 from typing import List, Dict, Any
 from datetime import datetime
-from ...models import Period
+from ...models import Period, Section
+from ..section_services.conflict_index_service import ConflictIndexService
+from ...utils.occupancy_utils import day_mask
 from .base_processor import BaseProcessor
 
 
 class PeriodProcessor(BaseProcessor):
     """Process CSV data for Period records"""
     
+    model = Period
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for period data"""
         return ['period_id', 'period_name', 'days', 'slot', 'start_time', 'end_time']
     
     @classmethod
-    def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
-        """Process a single row of period data from CSV
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse a single row of period data from CSV
         
         Args:
             row: The CSV row as a list of strings
             line_num: The line number in the CSV file (for error reporting)
             
         Returns:
-            Dictionary with processing results and any errors
+            Dictionary with the primary key and field values, or an error
         """
-        result = {'created': False, 'updated': False, 'error': None}
+        result = {'error': None}
         
         # Get field values with validation
         period_id, error = cls.get_field_value(row, 0, required=True)
@@ -65,22 +69,21 @@ class PeriodProcessor(BaseProcessor):
             result['error'] = f'Line {line_num}: Invalid end time format, should be HH:MM'
             return result
         
-        # Create or update period
-        try:
-            period, created = Period.objects.update_or_create(
-                id=period_id,
-                defaults={
-                    'period_name': period_name,
-                    'days': days,
-                    'slot': slot,
-                    'start_time': start_time,
-                    'end_time': end_time
-                }
-            )
-            result['created'] = created
-            result['updated'] = not created
-            
-        except Exception as e:
-            result['error'] = f'Line {line_num}: Error processing period: {str(e)}'
-            
-        return result 
\ No newline at end of file
+        return {
+            'pk': period_id,
+            'defaults': {
+                'period_name': period_name,
+                'days': days,
+                'day_mask': day_mask(days),
+                'slot': slot,
+                'start_time': start_time,
+                'end_time': end_time
+            }
+        }
+    
+    @classmethod
+    def after_write(cls, created_pks: List[str], updated_pks: List[str]) -> None:
+        """Refresh conflicts for sections in updated periods, since bulk writes skip signals"""
+        ConflictIndexService.refresh_sections(
+            list(Section.objects.filter(period_id__in=updated_pks).values_list('id', flat=True))
+        )
@@ -66,4 +66,53 @@ class ProcessorFactory:
             List of expected header strings, or empty list if processor not found
         """
         processor = cls.get_processor(data_type)
-        return processor.get_expected_headers() if processor else [] 
\ No newline at end of file
+        return processor.get_expected_headers() if processor else []
+    
+    @classmethod
+    def get_import_order(cls) -> List[List[str]]:
+        """Group the registered data types into levels that can be imported in order
+        
+        A data type depends on the data types whose models appear in its processor's
+        foreign_keys, so every level only refers to data types in earlier levels.
+        
+        Returns:
+            List of levels, each a list of data types with no dependencies between them
+        """
+        model_types = {processor.model: data_type for data_type, processor in cls._processors.items()}
+        remaining = {
+            data_type: {
+                model_types[model] for model in processor.foreign_keys.values()
+                if model in model_types and model_types[model] != data_type
+            }
+            for data_type, processor in cls._processors.items()
+        }
+        
+        levels, done = [], set()
+        while remaining:
+            level = [data_type for data_type, needs in remaining.items() if needs <= done]
+            if not level:
+                raise ValueError(f'Circular dependency between data types: {", ".join(sorted(remaining))}')
+            levels.append(level)
+            done.update(level)
+            for data_type in level:
+                del remaining[data_type]
+        return levels
+    
+    @classmethod
+    def detect_data_type(cls, headers: List[str], file_name: str = '') -> Optional[str]:
+        """Work out which data type a CSV file holds from its header row
+        
+        Args:
+            headers: The file's header row
+            file_name: Used to break ties between data types whose headers all match
+            
+        Returns:
+            The matching data type, or None if no processor's headers are all present
+        """
+        name = file_name.lower()
+        matches = [
+            (len(processor.get_expected_headers()), data_type in name, data_type)
+            for data_type, processor in cls._processors.items()
+            if not processor.check_headers(headers)
+        ]
+        return max(matches)[2] if matches else None
\ No newline at end of file
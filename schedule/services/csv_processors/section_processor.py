@@ -3,29 +3,40 @@ Section CSV data processor
 """
 from typing import List, Dict, Any
 from ...models import Section, Course, Teacher, Period, Room
+from ..section_services.conflict_index_service import ConflictIndexService
 from .base_processor import BaseProcessor
 
 
 class SectionProcessor(BaseProcessor):
     """Process CSV data for Section records"""
     
+    model = Section
+    
+    # Related objects are checked against lookups loaded once per import
+    foreign_keys = {
+        'course_id': Course,
+        'teacher_id': Teacher,
+        'period_id': Period,
+        'room_id': Room,
+    }
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for section data"""
         return ['course', 'section_number', 'teacher', 'period', 'room', 'max_size', 'when']
     
     @classmethod
-    def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
-        """Process a single row of section data from CSV
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse a single row of section data from CSV
         
         Args:
             row: The CSV row as a list of strings
             line_num: The line number in the CSV file (for error reporting)
             
         Returns:
-            Dictionary with processing results and any errors
+            Dictionary with the primary key and field values, or an error
         """
-        result = {'created': False, 'updated': False, 'error': None}
+        result = {'error': None}
         
         # Get field values with validation
         course_id, error = cls.get_field_value(row, 0, required=True)
@@ -53,58 +64,23 @@ class SectionProcessor(BaseProcessor):
             result['error'] = f'Line {line_num}: Invalid max size, must be a number'
             return result
         
-        # Get related objects
-        try:
-            course = Course.objects.get(id=course_id)
-        except Course.DoesNotExist:
-            result['error'] = f'Line {line_num}: Course with ID {course_id} does not exist'
-            return result
-        
-        teacher = None
-        if teacher_id:
-            try:
-                teacher = Teacher.objects.get(id=teacher_id)
-            except Teacher.DoesNotExist:
-                result['error'] = f'Line {line_num}: Teacher with ID {teacher_id} does not exist'
-                return result
-        
-        period = None
-        if period_id:
-            try:
-                period = Period.objects.get(id=period_id)
-            except Period.DoesNotExist:
-                result['error'] = f'Line {line_num}: Period with ID {period_id} does not exist'
-                return result
-                
-        room = None
-        if room_id:
-            try:
-                room = Room.objects.get(id=room_id)
-            except Room.DoesNotExist:
-                result['error'] = f'Line {line_num}: Room with ID {room_id} does not exist'
-                return result
-        
         # Generate a unique ID for the section
         section_id = f"{course_id}-{section_number}"
         
-        # Create or update section
-        try:
-            section, created = Section.objects.update_or_create(
-                id=section_id,
-                defaults={
-                    'course': course,
-                    'section_number': section_number_int,
-                    'teacher': teacher,
-                    'period': period,
-                    'room': room,
-                    'max_size': max_size,
-                    'when': when
-                }
-            )
-            result['created'] = created
-            result['updated'] = not created
-            
-        except Exception as e:
-            result['error'] = f'Line {line_num}: Error processing section: {str(e)}'
-            
-        return result 
\ No newline at end of file
+        return {
+            'pk': section_id,
+            'defaults': {
+                'course_id': course_id,
+                'section_number': section_number_int,
+                'teacher_id': teacher_id,
+                'period_id': period_id,
+                'room_id': room_id,
+                'max_size': max_size,
+                'when': when
+            }
+        }
+    
+    @classmethod
+    def after_write(cls, created_pks: List[str], updated_pks: List[str]) -> None:
+        """Refresh the conflict index for imported sections, since bulk writes skip signals"""
+        ConflictIndexService.refresh_sections(list(created_pks) + list(updated_pks))
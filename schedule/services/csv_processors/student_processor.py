@@ -9,23 +9,25 @@ from .base_processor import BaseProcessor
 class StudentProcessor(BaseProcessor):
     """Process CSV data for Student records"""
     
+    model = Student
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for student data"""
         return ['student_id', 'first_name', 'nickname', 'last_name', 'grade_level']
     
     @classmethod
-    def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
-        """Process a single row of student data from CSV
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse a single row of student data from CSV
         
         Args:
             row: The CSV row as a list of strings
             line_num: The line number in the CSV file (for error reporting)
             
         Returns:
-            Dictionary with processing results and any errors
+            Dictionary with the primary key and field values, or an error
         """
-        result = {'created': False, 'updated': False, 'error': None}
+        result = {'error': None}
         
         # Get field values with validation
         student_id, error = cls.get_field_value(row, 0, required=True)
@@ -62,19 +64,10 @@ class StudentProcessor(BaseProcessor):
         if nickname:
             name = f"{first_name} '{nickname}' {last_name}"
         
-        # Create or update student
-        try:
-            student, created = Student.objects.update_or_create(
-                id=student_id,
-                defaults={
-                    'name': name,
-                    'grade_level': grade_level
-                }
-            )
-            result['created'] = created
-            result['updated'] = not created
-            
-        except Exception as e:
-            result['error'] = f'Line {line_num}: Error processing student: {str(e)}'
-            
-        return result 
\ No newline at end of file
+        return {
+            'pk': student_id,
+            'defaults': {
+                'name': name,
+                'grade_level': grade_level
+            }
+        } 
\ No newline at end of file
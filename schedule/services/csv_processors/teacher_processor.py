@@ -3,29 +3,33 @@ Teacher CSV data processor
 """
 from typing import List, Dict, Any
 from ...models import Teacher
+from ...utils.availability_utils import validate_availability
+from ..section_services.structured_data_service import StructuredDataService
 from .base_processor import BaseProcessor
 
 
 class TeacherProcessor(BaseProcessor):
     """Process CSV data for Teacher records"""
     
+    model = Teacher
+    
     @classmethod
     def get_expected_headers(cls) -> List[str]:
         """Return the expected CSV headers for teacher data"""
         return ['teacher_id', 'first_name', 'last_name', 'availability', 'subjects']
     
     @classmethod
-    def process_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
-        """Process a single row of teacher data from CSV
+    def parse_row(cls, row: List[str], line_num: int) -> Dict[str, Any]:
+        """Parse a single row of teacher data from CSV
         
         Args:
             row: The CSV row as a list of strings
             line_num: The line number in the CSV file (for error reporting)
             
         Returns:
-            Dictionary with processing results and any errors
+            Dictionary with the primary key and field values, or an error
         """
-        result = {'created': False, 'updated': False, 'error': None}
+        result = {'error': None}
         
         # Get field values with validation
         teacher_id, error = cls.get_field_value(row, 0, required=True)
@@ -44,25 +48,26 @@ class TeacherProcessor(BaseProcessor):
             return result
             
         availability, _ = cls.get_field_value(row, 3, default="")
+        error = validate_availability(availability)
+        if error:
+            result['error'] = f'Line {line_num}: {error}'
+            return result
+            
         subjects, _ = cls.get_field_value(row, 4, default="")
         
         # Construct full name
         name = f"{first_name} {last_name}"
         
-        # Create or update teacher
-        try:
-            teacher, created = Teacher.objects.update_or_create(
-                id=teacher_id,
-                defaults={
-                    'name': name,
-                    'availability': availability,
-                    'subjects': subjects
-                }
-            )
-            result['created'] = created
-            result['updated'] = not created
-            
-        except Exception as e:
-            result['error'] = f'Line {line_num}: Error processing teacher: {str(e)}'
-            
-        return result 
\ No newline at end of file
+        return {
+            'pk': teacher_id,
+            'defaults': {
+                'name': name,
+                'availability': availability,
+                'subjects': subjects
+            }
+        }
+    
+    @classmethod
+    def after_write(cls, created_pks: List[str], updated_pks: List[str]) -> None:
+        """Parse the imported availability into structured rows, since bulk writes skip signals"""
+        StructuredDataService.sync_teacher_availability(list(created_pks) + list(updated_pks))
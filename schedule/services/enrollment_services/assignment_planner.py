@@ -0,0 +1,148 @@
+from collections import defaultdict
+from ...utils.flow_utils import MinCostFlow
+from .schedule_snapshot import ScheduleSnapshot
+
+
+# Cost of filling a section from empty to full. Seat costs rise with the fill
+# ratio, so the cheapest flow spreads students evenly relative to capacity.
+BALANCE_COST_SCALE = 1000
+
+
+class AssignmentPlanner:
+    """
+    Plans student-to-section assignments for a set of courses in memory.
+
+    Works on a ScheduleSnapshot, so all data is loaded up front in a fixed
+    number of queries. Each course is solved as a min-cost flow: students who
+    can use the same sections are merged into one source node, every section
+    seat is an arc whose cost grows with how full the section is, and the
+    maximum flow of least cost gives the largest balanced assignment. Nothing
+    is written until the snapshot is committed.
+    """
+
+    def __init__(self, course_ids, grade_level=None, student_ids=None, rebalance=False, snapshot=None):
+        """
+        Args:
+            course_ids: Courses to assign
+            grade_level: Only assign students in this grade
+            student_ids: Only assign these students
+            rebalance: Drop the students' current sections in these courses and
+                assign them again from scratch
+            snapshot: Existing ScheduleSnapshot to plan on instead of loading one
+        """
+        self.snapshot = snapshot or ScheduleSnapshot.load(course_ids, grade_level=grade_level, student_ids=student_ids)
+
+        if rebalance:
+            snapshot = self.snapshot
+            for student, sections in enumerate(list(snapshot.student_sections)):
+                for section in sections:
+                    if snapshot.section_course[section] is not None:
+                        snapshot.remove(student, section)
+
+    def plan(self):
+        """
+        Assign every course, fewest sections first since those constrain students most.
+
+        Returns:
+            list: Per-course result dicts
+        """
+        return [self.plan_course(course) for course in self._courses_in_order()]
+
+    def _courses_in_order(self):
+        snapshot = self.snapshot
+        return sorted(range(len(snapshot.course_ids)),
+                      key=lambda c: (len(snapshot.course_sections[c]), snapshot.course_ids[c]))
+
+    def plan_course(self, course):
+        """
+        Assign the students of one course (by snapshot index) who do not have a section of it yet.
+
+        Returns:
+            dict: Result with course, success, message, assigned_count,
+            failure_count and errors
+        """
+        snapshot = self.snapshot
+        pending = [s for s in snapshot.course_requests[course] if snapshot.section_for_course(s, course) is None]
+        sections = snapshot.course_sections[course]
+
+        if not pending:
+            return self._course_result(course, 0, [])
+        if not sections:
+            return self._course_result(course, 0, [self._failure(s, course, 'no sections exist') for s in pending])
+
+        # Group students by the sections that fit their schedule
+        groups = defaultdict(list)
+        for student in pending:
+            busy = snapshot.student_busy[student]
+            groups[tuple(section for section in sections if not snapshot.section_mask[section] & busy)].append(student)
+
+        placements = self._solve_flow(groups, sections)
+
+        errors = []
+        assigned = 0
+        for usable, students in groups.items():
+            queue = list(students)
+            for section, count in placements.get(usable, []):
+                for student in queue[:count]:
+                    snapshot.add(student, section)
+                    assigned += 1
+                queue = queue[count:]
+            for student in queue:
+                reason = 'every section is full' if usable else 'every section conflicts with their schedule'
+                errors.append(self._failure(student, course, reason))
+
+        return self._course_result(course, assigned, errors)
+
+    def _solve_flow(self, groups, sections):
+        """
+        Solve a course's min-cost flow.
+
+        Returns:
+            dict: Group key -> list of (section, number of students)
+        """
+        snapshot = self.snapshot
+        group_keys = [key for key in groups if key]
+        section_nodes = {section: 1 + len(group_keys) + i for i, section in enumerate(sections)}
+        source, sink = 0, 1 + len(group_keys) + len(sections)
+        flow = MinCostFlow(sink + 1)
+
+        group_arcs = {}
+        for position, key in enumerate(group_keys, start=1):
+            flow.add_arc(source, position, len(groups[key]), 0)
+            group_arcs[key] = [(section, flow.add_arc(position, section_nodes[section], len(groups[key]), 0))
+                               for section in key]
+
+        for section in sections:
+            capacity = snapshot.section_capacity[section]
+            exact_size = snapshot.section_exact[section]
+            for seat in range(snapshot.section_count[section], capacity):
+                if exact_size and seat < exact_size:
+                    # Fill exact-size sections before anything else
+                    cost = 0
+                else:
+                    cost = 1 + seat * BALANCE_COST_SCALE // capacity
+                flow.add_arc(section_nodes[section], sink, 1, cost)
+
+        flow.solve(source, sink)
+
+        return {
+            key: [(section, flow.flow_on(arc)) for section, arc in arcs if flow.flow_on(arc)]
+            for key, arcs in group_arcs.items()
+        }
+
+    def _failure(self, student, course, reason):
+        snapshot = self.snapshot
+        return f"Could not place {snapshot.student_ids[student]} in {snapshot.course_names[course]}: {reason}"
+
+    def _course_result(self, course, assigned, errors):
+        name = self.snapshot.course_names[course]
+        return {
+            'course': name,
+            'course_id': self.snapshot.course_ids[course],
+            'success': not errors,
+            'message': f"Assigned {assigned} students to sections of {name}"
+                       + (f", {len(errors)} could not be placed" if errors else ""),
+            'assigned_count': assigned,
+            'failure_count': len(errors),
+            'errors': errors,
+        }
@@ -1,8 +1,13 @@
 from ...models import Student, Course, Section, Enrollment, CourseEnrollment
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
-from ..enrollment_services.enrollment_service import EnrollmentService
 from ..enrollment_services.course_enrollment_service import CourseEnrollmentService
+from ..enrollment_services.enrollment_service import EnrollmentService
+from ..enrollment_services.enrollment_unit_of_work import EnrollmentUnitOfWork
+from ..section_services.conflict_index_service import ConflictIndexService
+from ..section_services.enrollment_count_service import EnrollmentCountService
+from ..report_services.data_version_service import DataVersionService
 
 
 class BatchOperationsService:
@@ -10,25 +15,47 @@ class BatchOperationsService:
     
     @staticmethod
     def bulk_enroll_students_in_sections(student_ids, section_id):
-        """Enroll multiple students in a section at once."""
-        section = get_object_or_404(Section, pk=section_id)
-        
+        """
+        Enroll multiple students in a section at once.
+
+        The section is locked, then the students, which of them are already on
+        the roster and the section's remaining capacity (from its enrolled_count)
+        are read up front, and every eligible student is inserted in one bulk
+        write. The number of queries does not grow with the number of students,
+        and concurrent enrollments cannot overfill the section.
+        """
         success_count = 0
         error_count = 0
         errors = []
         
         with transaction.atomic():
-            for student_id in student_ids:
-                try:
-                    result = EnrollmentService.enroll_student_in_section(student_id, section_id)
-                    if result['success']:
-                        success_count += 1
-                    else:
+            EnrollmentService.lock_section(section_id)
+            section = get_object_or_404(Section.objects.select_related('course'), pk=section_id)
+            max_size = section.max_size
+            students = Student.objects.in_bulk(student_ids)
+            enrolled = set(Enrollment.objects.filter(
+                section=section, student_id__in=list(students)
+            ).values_list('student_id', flat=True))
+            remaining = max_size - section.enrolled_count if max_size else None
+            
+            with EnrollmentUnitOfWork() as work:
+                for student_id in student_ids:
+                    student = students.get(student_id)
+                    if student is None:
                         error_count += 1
-                        errors.append(result['message'])
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"Error processing student ID {student_id}: {str(e)}")
+                        errors.append(f"Error processing student ID {student_id}: No Student matches the given query.")
+                    elif student.pk in enrolled:
+                        error_count += 1
+                        errors.append(f"Student {student.name} is already enrolled in this section")
+                    elif remaining is not None and remaining <= 0:
+                        error_count += 1
+                        errors.append(f"Section is at capacity ({max_size} students)")
+                    else:
+                        work.add(student.pk, section.pk)
+                        enrolled.add(student.pk)
+                        if remaining is not None:
+                            remaining -= 1
+                        success_count += 1
         
         return {
             'success': success_count > 0,
@@ -40,22 +67,23 @@ class BatchOperationsService:
     
     @staticmethod
     def clear_all_enrollments_for_students(student_ids):
-        """Clear all section enrollments for multiple students."""
+        """Clear all section enrollments for multiple students with one filtered delete."""
+        students = Student.objects.in_bulk(student_ids)
+        
         success_count = 0
         error_count = 0
         errors = []
         
         for student_id in student_ids:
-            try:
-                result = EnrollmentService.clear_student_enrollments(student_id)
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append(result['message'])
-            except Exception as e:
+            if student_id in students:
+                success_count += 1
+            else:
                 error_count += 1
-                errors.append(f"Error processing student ID {student_id}: {str(e)}")
+                errors.append(f"Error processing student ID {student_id}: No Student matches the given query.")
+        
+        if students:
+            with transaction.atomic(), ConflictIndexService.deferred(), EnrollmentCountService.deferred():
+                Enrollment.objects.filter(student_id__in=list(students)).delete()
         
         return {
             'success': success_count > 0,
@@ -94,28 +122,39 @@ class BatchOperationsService:
     
     @staticmethod
     def enroll_grade_in_course(grade_level, course_id):
-        """Enroll all students in a specific grade level in a course."""
+        """
+        Enroll all students in a specific grade level in a course.
+
+        One query loads the grade with an already-enrolled flag per student and
+        one bulk insert adds the rest, whatever the size of the grade.
+        """
         course = get_object_or_404(Course, pk=course_id)
         
-        # Get all students in this grade level
-        students = Student.objects.filter(grade_level=grade_level)
+        # Get all students in this grade level, flagging the ones already in the course
+        students = Student.objects.filter(grade_level=grade_level).annotate(
+            already_enrolled=Exists(CourseEnrollment.objects.filter(student=OuterRef('pk'), course=course))
+        ).order_by('id')
         
         success_count = 0
         error_count = 0
         errors = []
+        new_enrollments = []
         
-        with transaction.atomic():
-            for student in students:
-                try:
-                    result = CourseEnrollmentService.enroll_student_in_course(student.id, course_id)
-                    if result['success']:
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        errors.append(result['message'])
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"Error enrolling student {student.name}: {str(e)}")
+        for student in students:
+            if student.already_enrolled:
+                error_count += 1
+                errors.append(f"Student {student.name} is already enrolled in {course.name}")
+            else:
+                new_enrollments.append(CourseEnrollment(student=student, course=course))
+        
+        try:
+            with transaction.atomic():
+                CourseEnrollment.objects.bulk_create(new_enrollments, batch_size=500)
+                DataVersionService.bump()
+            success_count = len(new_enrollments)
+        except Exception as e:
+            error_count += len(new_enrollments)
+            errors.append(f"Error enrolling grade {grade_level} students: {str(e)}")
         
         return {
             'success': success_count > 0,
@@ -127,8 +166,8 @@ class BatchOperationsService:
     
     @staticmethod
     def clear_section_enrollments_by_grade(section_id, grade_level):
-        """Clear enrollments for a section, filtered by grade level."""
-        section = get_object_or_404(Section, pk=section_id)
+        """Clear enrollments for a section, filtered by grade level, with one filtered delete."""
+        section = get_object_or_404(Section.objects.select_related('course'), pk=section_id)
         
         # Get enrollments for this section and grade level
         enrollments = Enrollment.objects.filter(
@@ -136,10 +175,9 @@ class BatchOperationsService:
             student__grade_level=grade_level
         )
         
-        count = enrollments.count()
-        
-        # Delete enrollments
-        enrollments.delete()
+        # Delete enrollments, refreshing the index and adjusting the section's count once
+        with transaction.atomic(), ConflictIndexService.deferred(), EnrollmentCountService.deferred():
+            count, _ = enrollments.delete()
         
         return {
             'success': True,
@@ -1,7 +1,11 @@
 from ...models import Student, Course, CourseEnrollment
+from django.core.paginator import Paginator
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Q, Value
+
+# Students shown per page on the enroll-students page
+STUDENTS_PER_PAGE = 50
 
 
 class CourseEnrollmentService:
@@ -150,50 +154,67 @@ class CourseEnrollmentService:
         }
     
     @staticmethod
-    def get_enrolled_students_with_counts(grade_filter=None, course_ids=None):
-        """Get students with their enrollment counts, optionally filtered by grade and/or courses."""
-        # Base queryset for students
-        students = Student.objects.all().order_by('name')
-        
-        # Filter students by grade if specified
+    def get_enrolled_students_with_counts(grade_filter=None, course_ids=None, page=None,
+                                          per_page=STUDENTS_PER_PAGE):
+        """
+        Get one page of students with their enrollment counts, optionally filtered by grade and/or courses.
+
+        The totals are one aggregate query and the page is one annotated query
+        restricted to the page's students, so the cost of a page does not grow
+        with the number of students.
+
+        Args:
+            grade_filter: Optional grade level to filter by
+            course_ids: Optional course IDs; students in ANY of them are flagged as enrolled
+            page: Page number (invalid or out of range numbers give the nearest page)
+            per_page: Students per page
+
+        Returns:
+            dict: 'students' rows for the page, the Django 'page', the 'total_count'
+                  of matching students and how many of them are 'enrolled_count'
+        """
+        students = Student.objects.order_by('name', 'id')
         if grade_filter:
             students = students.filter(grade_level=grade_filter)
-        
-        # Get selected courses if specified
-        selected_courses = []
+
         if course_ids:
-            selected_courses = Course.objects.filter(id__in=course_ids)
-        
-        # Prepare student data with enrollment info
-        student_data = []
-        for student in students:
-            # Count course enrollments
-            enrolled_course_count = CourseEnrollment.objects.filter(student=student).count()
-            
-            # Count section registrations (actual section assignments)
-            registered_section_count = student.sections.count()
-            
-            # Check if student is enrolled in the selected courses
-            enrolled_in_selected_course = False
-            if selected_courses:
-                # Check if enrolled in ANY of the selected courses
-                enrolled_in_selected_course = CourseEnrollment.objects.filter(
-                    student=student,
-                    course__in=selected_courses
-                ).exists()
-            elif grade_filter:
-                # If "All Courses" is selected with a grade filter, 
-                # mark students as "enrolled" if they have any course enrollments
-                enrolled_in_selected_course = enrolled_course_count > 0
-            
-            student_data.append({
-                'student': student,
-                'enrolled_course_count': enrolled_course_count,
-                'registered_section_count': registered_section_count,
-                'enrolled_in_selected_course': enrolled_in_selected_course
-            })
-        
+            # Enrolled in ANY of the selected courses
+            selected = CourseEnrollment.objects.filter(student=OuterRef('pk'), course_id__in=course_ids)
+            students = students.annotate(enrolled_in_selected_course=Exists(selected))
+        elif grade_filter:
+            # If "All Courses" is selected with a grade filter,
+            # mark students as "enrolled" if they have any course enrollments
+            selected = CourseEnrollment.objects.filter(student=OuterRef('pk'))
+            students = students.annotate(enrolled_in_selected_course=Exists(selected))
+        else:
+            students = students.annotate(enrolled_in_selected_course=Value(False))
+
+        totals = students.aggregate(
+            total=Count('id'),
+            enrolled=Count('id', filter=Q(enrolled_in_selected_course=True)),
+        )
+
+        paginator = Paginator(students, per_page)
+        # The aggregate above already counted the students
+        paginator.count = totals['total']
+        page = paginator.get_page(page)
+
+        rows = students.filter(pk__in=page.object_list.values('pk')).annotate(
+            enrolled_course_count=Count('course_enrollments', distinct=True),
+            registered_section_count=Count('enrollment', distinct=True),
+        )
+
         return {
-            'students': student_data,
-            'total_count': len(student_data)
-        } 
\ No newline at end of file
+            'students': [
+                {
+                    'student': student,
+                    'enrolled_course_count': student.enrolled_course_count,
+                    'registered_section_count': student.registered_section_count,
+                    'enrolled_in_selected_course': student.enrolled_in_selected_course,
+                }
+                for student in rows
+            ],
+            'page': page,
+            'total_count': totals['total'],
+            'enrolled_count': totals['enrolled'],
+        }
@@ -1,6 +1,16 @@
+import random
+import time
 from ...models import Student, Section, Enrollment
-from django.db import transaction
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
+from ...utils.occupancy_utils import OccupancyIndex
+from ..section_services.enrollment_count_service import EnrollmentCountService
+
+# Attempts at taking the section lock before giving up, and the first back-off
+# between them in seconds (doubled, with jitter, after each failed attempt)
+MAX_ENROLL_ATTEMPTS = 8
+ENROLL_RETRY_DELAY = 0.02
 
 
 class EnrollmentService:
@@ -35,9 +45,33 @@ class EnrollmentService:
     
     @staticmethod
     def enroll_student_in_section(student_id, section_id):
-        """Enroll a student in a section."""
+        """
+        Enroll a student in a section.
+        
+        The capacity check and the insert run in one transaction that holds a
+        lock on the section, so concurrent enrollments cannot overfill it. If
+        the lock cannot be taken (a lock timeout, deadlock or busy database) the
+        attempt is retried a bounded number of times.
+        """
+        for attempt in range(1, MAX_ENROLL_ATTEMPTS + 1):
+            try:
+                with transaction.atomic():
+                    return EnrollmentService._enroll_locked(student_id, section_id)
+            except OperationalError:
+                if attempt == MAX_ENROLL_ATTEMPTS:
+                    return {
+                        'success': False,
+                        'message': "Section is busy, please try again"
+                    }
+                time.sleep(ENROLL_RETRY_DELAY * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+    
+    @staticmethod
+    def _enroll_locked(student_id, section_id):
+        """Lock the section, then check and enroll inside the caller's transaction."""
+        # Lock before reading, so the capacity read below is current
+        EnrollmentService.lock_section(section_id)
+        section = get_object_or_404(Section.objects.select_related('course'), pk=section_id)
         student = get_object_or_404(Student, pk=student_id)
-        section = get_object_or_404(Section, pk=section_id)
         
         # Check if the student is already enrolled
         if Enrollment.objects.filter(student=student, section=section).exists():
@@ -46,8 +80,8 @@ class EnrollmentService:
                 'message': f"Student {student.name} is already enrolled in this section"
             }
         
-        # Check if the section is at capacity
-        if section.max_size and section.enrollments.count() >= section.max_size:
+        # Check if the section is at capacity; the lock keeps enrolled_count current
+        if section.max_size and section.enrolled_count >= section.max_size:
             return {
                 'success': False,
                 'message': f"Section is at capacity ({section.max_size} students)"
@@ -62,6 +96,24 @@ class EnrollmentService:
             'enrollment': enrollment
         }
     
+    @staticmethod
+    def lock_section(section_id):
+        """
+        Lock a section row until the end of the current transaction.
+        
+        Databases with row locks use SELECT ... FOR UPDATE. SQLite has no row
+        locks, so a no-op UPDATE takes its database write lock instead, which
+        serializes the writers just the same.
+        
+        Returns:
+            bool: Whether the section exists
+        """
+        sections = Section.objects.filter(pk=section_id)
+        if connection.features.has_select_for_update:
+            return bool(list(sections.select_for_update().values_list('pk', flat=True)))
+        
+        return sections.update(max_size=F('max_size')) > 0
+    
     @staticmethod
     def remove_student_from_section(student_id, section_id):
         """Remove a student from a section."""
@@ -92,8 +144,9 @@ class EnrollmentService:
         # Count enrollments before deletion
         enrollment_count = Enrollment.objects.filter(student=student).count()
         
-        # Delete all enrollments
-        Enrollment.objects.filter(student=student).delete()
+        # Delete all enrollments, adjusting each section's count once
+        with EnrollmentCountService.deferred():
+            Enrollment.objects.filter(student=student).delete()
         
         return {
             'success': True,
@@ -107,10 +160,11 @@ class EnrollmentService:
         section = get_object_or_404(Section, pk=section_id)
         
         # Count enrollments before deletion
-        enrollment_count = Enrollment.objects.filter(section=section).count()
+        enrollment_count = section.enrolled_count
         
-        # Delete all enrollments
-        Enrollment.objects.filter(section=section).delete()
+        # Delete all enrollments, adjusting the section's count once
+        with EnrollmentCountService.deferred():
+            Enrollment.objects.filter(section=section).delete()
         
         return {
             'success': True,
@@ -133,13 +187,23 @@ class EnrollmentService:
                 'conflicts': []
             }
         
-        # Check for period conflicts (student enrolled in other sections in the same period)
+        # Check for period conflicts (student enrolled in other sections that meet
+        # in the same period slot on a shared day and term segment)
+        index = OccupancyIndex()
+        section_mask = index.mask_for_section(section)
+        
         student_sections = Enrollment.objects.filter(
             student=student, 
-            section__period=section.period
-        ).exclude(section_id=section_id).select_related('section', 'section__course')
+            section__period__slot=section.period.slot
+        ).alias(
+            shared_days=F('section__period__day_mask').bitand(section.period.day_mask)
+        ).exclude(shared_days=0).exclude(section_id=section_id).select_related(
+            'section', 'section__course', 'section__period'
+        )
         
         for enrollment in student_sections:
+            if not index.mask_for_section(enrollment.section) & section_mask:
+                continue
             conflicts.append({
                 'type': 'period',
                 'message': f"Student already enrolled in {enrollment.section.course.name} section {enrollment.section.section_number} during this period"
@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models import Q
+from ...models import Enrollment
+from ..section_services.conflict_index_service import ConflictIndexService
+from ..section_services.enrollment_count_service import EnrollmentCountService
+from ..report_services.data_version_service import DataVersionService
+
+
+class EnrollmentUnitOfWork:
+    """
+    Stages enrollment adds and removes in memory and writes them in one go.
+
+    Assignment algorithms call add() and remove() as they place and undo
+    students; nothing touches the database until flush(), which runs one bulk
+    insert and one delete inside a single transaction. An add followed by a
+    remove of the same (student, section) cancels out without any write.
+
+    Can be used as a context manager, which flushes on a clean exit:
+
+        with EnrollmentUnitOfWork() as work:
+            work.add(student_id, section_id)
+    """
+
+    def __init__(self, ignore_conflicts=False):
+        """
+        Args:
+            ignore_conflicts: Skip rows that already exist instead of failing.
+                Created objects then do not get primary keys back.
+        """
+        self.ignore_conflicts = ignore_conflicts
+        self._adds = {}
+        self._removes = {}
+        self.created = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, student_id, section_id):
+        """Stage a new enrollment."""
+        key = (student_id, section_id)
+        if key in self._removes:
+            # Re-adding something staged for removal just keeps the existing row
+            del self._removes[key]
+            return
+        self._adds[key] = Enrollment(student_id=student_id, section_id=section_id)
+
+    def remove(self, student_id, section_id, enrollment_id=None):
+        """Stage removal of an enrollment; pass its ID when known to delete by primary key."""
+        key = (student_id, section_id)
+        if key in self._adds:
+            # Undoing a staged add never needs to reach the database
+            del self._adds[key]
+            return
+        self._removes[key] = enrollment_id
+
+    def is_staged(self, student_id, section_id):
+        """Check whether an enrollment is staged to be added."""
+        return (student_id, section_id) in self._adds
+
+    @property
+    def pending(self):
+        """Number of staged writes."""
+        return len(self._adds) + len(self._removes)
+
+    def flush(self):
+        """
+        Write all staged changes in one transaction.
+
+        Returns:
+            dict: Number of enrollments 'created' and 'deleted', and total 'rows_written'.
+            With ignore_conflicts, rows that already existed are not counted as created.
+        """
+        adds, removes = list(self._adds.values()), self._removes
+        self._adds, self._removes = {}, {}
+
+        deleted = created = 0
+        student_ids = {enrollment.student_id for enrollment in adds}
+
+        with transaction.atomic(), ConflictIndexService.deferred(), EnrollmentCountService.deferred():
+            if removes:
+                # The per-row delete signals only queue work here: the deferred blocks refresh
+                # the index and counts once on exit, and the version bumps once on commit
+                deleted, _ = Enrollment.objects.filter(self._removal_filter(removes)).delete()
+            if adds:
+                existing = Enrollment.objects.filter(student_id__in=student_ids)
+                before = existing.count() if self.ignore_conflicts else 0
+                self.created = Enrollment.objects.bulk_create(
+                    adds, batch_size=500, ignore_conflicts=self.ignore_conflicts
+                )
+                # Skipped rows are not reported back, so count the students' rows again
+                created = existing.count() - before if self.ignore_conflicts else len(adds)
+                # bulk_create skips the signals that keep the conflict index and counts current
+                ConflictIndexService.refresh_students(student_ids)
+                if self.ignore_conflicts:
+                    # Skipped rows are not reported back, so count what is really there
+                    EnrollmentCountService.recount({enrollment.section_id for enrollment in adds})
+                else:
+                    EnrollmentCountService.enrollments_added(adds)
+                DataVersionService.bump()
+
+        return {'created': created, 'deleted': deleted, 'rows_written': created + deleted}
+
+    @staticmethod
+    def _removal_filter(removes):
+        """Build one filter matching every staged removal."""
+        ids = [enrollment_id for enrollment_id in removes.values() if enrollment_id is not None]
+        by_student = {}
+        for (student_id, section_id), enrollment_id in removes.items():
+            if enrollment_id is None:
+                by_student.setdefault(student_id, []).append(section_id)
+
+        condition = Q(id__in=ids) if ids else Q(pk__in=[])
+        for student_id, section_ids in by_student.items():
+            condition |= Q(student_id=student_id, section_id__in=section_ids)
+        return condition
@@ -0,0 +1,231 @@
+from ...models import Course, Section, Enrollment, CourseEnrollment, SectionSettings
+from ...utils.occupancy_utils import OccupancyIndex
+from .enrollment_unit_of_work import EnrollmentUnitOfWork
+
+
+DEFAULT_MAX_SECTION_SIZE = 30
+
+
+class ScheduleSnapshot:
+    """
+    In-memory model of sections, course requests and enrollments for the solvers.
+
+    Everything is loaded in a fixed number of queries into integer-indexed
+    lists: sections, courses and students are referred to by their position,
+    so checks such as "does this section fit this student" are a couple of
+    list lookups and one bitwise AND. Solvers mutate the snapshot with add()
+    and remove(), can clone() it cheaply to explore alternatives, and finally
+    commit() the difference from the database through an
+    EnrollmentUnitOfWork.
+    """
+
+    # Per-snapshot state that add() and remove() change; clones share these
+    # lists until one of them writes
+    MUTABLE_FIELDS = ('section_count', 'student_sections', 'student_busy')
+
+    def __init__(self):
+        self.section_ids, self.section_index = [], {}
+        self.section_course, self.section_mask = [], []
+        self.section_capacity, self.section_exact = [], []
+        self.course_ids, self.course_index = [], {}
+        self.course_names, self.course_types, self.course_sections = [], [], []
+        self.course_requests = []
+        self.student_ids, self.student_index = [], {}
+        self.student_requests = []
+        self.section_count, self.student_sections, self.student_busy = [], [], []
+        self._base_sections = []
+        self._enrollment_ids = {}
+        self._owned = set(self.MUTABLE_FIELDS)
+
+    @classmethod
+    def load(cls, course_ids, grade_level=None, student_ids=None):
+        """
+        Load a snapshot for the students requesting the given courses.
+
+        Args:
+            course_ids: Courses whose sections and requests are loaded
+            grade_level: Only include students in this grade
+            student_ids: Only include these students
+
+        Returns:
+            ScheduleSnapshot: The loaded snapshot
+        """
+        snapshot = cls()
+        index = OccupancyIndex()
+        settings = SectionSettings.objects.first()
+        default_max_size = settings.default_max_size if settings else DEFAULT_MAX_SECTION_SIZE
+
+        for course_id, name, course_type in Course.objects.filter(id__in=course_ids).values_list(
+            'id', 'name', 'type'
+        ).order_by('id'):
+            snapshot.course_index[course_id] = len(snapshot.course_ids)
+            snapshot.course_ids.append(course_id)
+            snapshot.course_names.append(name)
+            snapshot.course_types.append(course_type)
+            snapshot.course_sections.append([])
+            snapshot.course_requests.append([])
+
+        def add_section(row):
+            if row['id'] in snapshot.section_index:
+                return
+            snapshot.section_index[row['id']] = len(snapshot.section_ids)
+            snapshot.section_ids.append(row['id'])
+            course = snapshot.course_index.get(row['course_id'])
+            snapshot.section_course.append(course)
+            snapshot.section_mask.append(index.mask_for_row(row))
+            snapshot.section_capacity.append(row['exact_size'] or row['max_size'] or default_max_size)
+            snapshot.section_exact.append(row['exact_size'] or 0)
+            snapshot.section_count.append(row['enrolled_count'])
+            if course is not None:
+                snapshot.course_sections[course].append(snapshot.section_index[row['id']])
+
+        for row in Section.objects.filter(course_id__in=course_ids).values(
+            'id', 'course_id', 'max_size', 'exact_size', 'enrolled_count', 'period__slot', 'period__day_mask', 'when'
+        ).order_by('id'):
+            add_section(row)
+
+        requests = CourseEnrollment.objects.filter(course_id__in=course_ids)
+        if grade_level:
+            requests = requests.filter(student__grade_level=grade_level)
+        if student_ids is not None:
+            requests = requests.filter(student_id__in=student_ids)
+
+        for student_id, course_id in requests.values_list('student_id', 'course_id').order_by('student_id', 'course_id'):
+            student = snapshot._student(student_id)
+            snapshot.student_requests[student].append(snapshot.course_index[course_id])
+            snapshot.course_requests[snapshot.course_index[course_id]].append(student)
+
+        # The students' current enrollments, including sections of other courses
+        enrollments = Enrollment.objects.filter(student_id__in=snapshot.student_ids).values(
+            'id', 'student_id', 'section_id', 'section__course_id', 'section__max_size', 'section__exact_size',
+            'section__enrolled_count', 'section__period__slot', 'section__period__day_mask', 'section__when'
+        )
+        current = [[] for _ in snapshot.student_ids]
+        for row in enrollments:
+            add_section({
+                'id': row['section_id'], 'course_id': row['section__course_id'],
+                'max_size': row['section__max_size'], 'exact_size': row['section__exact_size'],
+                'enrolled_count': row['section__enrolled_count'],
+                'period__slot': row['section__period__slot'], 'period__day_mask': row['section__period__day_mask'],
+                'when': row['section__when'],
+            })
+            student = snapshot.student_index[row['student_id']]
+            section = snapshot.section_index[row['section_id']]
+            current[student].append(section)
+            snapshot._enrollment_ids[(student, section)] = row['id']
+
+        snapshot.student_sections = [frozenset(sections) for sections in current]
+        snapshot.student_busy = [snapshot._mask_of(sections) for sections in current]
+        snapshot._base_sections = list(snapshot.student_sections)
+        return snapshot
+
+    def _student(self, student_id):
+        if student_id not in self.student_index:
+            self.student_index[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+            self.student_requests.append([])
+        return self.student_index[student_id]
+
+    def _mask_of(self, sections):
+        mask = 0
+        for section in sections:
+            mask |= self.section_mask[section]
+        return mask
+
+    def _own(self, field):
+        """Copy a shared mutable list before this snapshot writes to it."""
+        if field not in self._owned:
+            setattr(self, field, list(getattr(self, field)))
+            self._owned.add(field)
+
+    def clone(self):
+        """
+        Get a copy that can be changed without affecting this snapshot.
+
+        The copy shares every list until one side writes to it, so cloning is
+        O(1) and a write costs one list copy.
+        """
+        copy = object.__new__(ScheduleSnapshot)
+        copy.__dict__.update(self.__dict__)
+        copy._owned = set()
+        # This snapshot must also copy before its next write, since the lists are now shared
+        self._owned = set()
+        return copy
+
+    def has_space(self, section):
+        """Check whether a section has an open seat."""
+        return self.section_count[section] < self.section_capacity[section]
+
+    def fits(self, student, section):
+        """Check whether a section has space and does not clash with the student's schedule."""
+        return self.has_space(section) and not self.section_mask[section] & self.student_busy[student]
+
+    def fill_ratio(self, section):
+        """Get how full a section is, from 0 (empty) to 1 (at capacity)."""
+        return self.section_count[section] / self.section_capacity[section]
+
+    def section_for_course(self, student, course):
+        """Get the student's section of a course, or None."""
+        for section in self.student_sections[student]:
+            if self.section_course[section] == course:
+                return section
+        return None
+
+    def add(self, student, section):
+        """Enroll a student in a section."""
+        for field in self.MUTABLE_FIELDS:
+            self._own(field)
+        self.student_sections[student] = self.student_sections[student] | {section}
+        self.student_busy[student] |= self.section_mask[section]
+        self.section_count[section] += 1
+
+    def remove(self, student, section):
+        """Remove a student from a section."""
+        for field in self.MUTABLE_FIELDS:
+            self._own(field)
+        self.student_sections[student] = self.student_sections[student] - {section}
+        self.student_busy[student] = self._mask_of(self.student_sections[student])
+        self.section_count[section] -= 1
+
+    def diff(self):
+        """
+        Compare the snapshot with what was loaded.
+
+        Returns:
+            tuple: (added, removed) lists of (student_id, section_id) pairs
+        """
+        added, removed = [], []
+        for student, sections in enumerate(self.student_sections):
+            base = self._base_sections[student]
+            if sections is base:
+                continue
+            added.extend((self.student_ids[student], self.section_ids[s]) for s in sorted(sections - base))
+            removed.extend((self.student_ids[student], self.section_ids[s]) for s in sorted(base - sections))
+        return added, removed
+
+    def commit(self):
+        """
+        Write the snapshot's changes through an EnrollmentUnitOfWork.
+
+        Returns:
+            dict: Number of enrollments 'created' and 'deleted', and total 'rows_written'
+        """
+        added, removed = self.diff()
+
+        work = EnrollmentUnitOfWork()
+        for student_id, section_id in removed:
+            work.remove(student_id, section_id,
+                        self._enrollment_ids[(self.student_index[student_id], self.section_index[section_id])])
+        for student_id, section_id in added:
+            work.add(student_id, section_id)
+        result = work.flush()
+
+        # The committed state is the new baseline
+        self._enrollment_ids = dict(self._enrollment_ids)
+        for student_id, section_id in removed:
+            del self._enrollment_ids[(self.student_index[student_id], self.section_index[section_id])]
+        for enrollment in work.created:
+            key = (self.student_index[enrollment.student_id], self.section_index[enrollment.section_id])
+            self._enrollment_ids[key] = enrollment.id
+        self._base_sections = list(self.student_sections)
+        return result
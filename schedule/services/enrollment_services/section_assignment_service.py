@@ -1,60 +1,149 @@
 from ...models import Student, Course, Section, Enrollment, CourseEnrollment
-from django.db import transaction
-from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
+from .assignment_planner import AssignmentPlanner
+from .student_schedule_planner import StudentSchedulePlanner
 
 
 class SectionAssignmentService:
     """Service class for assigning students to sections based on course enrollments."""
-    
+
     @staticmethod
     def assign_students_to_sections(grade_level=None):
         """
-        Placeholder for the assign_students_to_sections algorithm.
+        Assign every student who is enrolled in a course but not yet in one of its sections.
         Can be filtered by grade level.
+
+        Returns:
+            dict: Result with success flag, message, totals, errors and per-course results
+        """
+        course_ids = SectionAssignmentService.requested_course_ids(grade_level)
+        grade_str = f" for grade {grade_level}" if grade_level else ""
+        return SectionAssignmentService.assign_courses(course_ids, grade_level=grade_level, label=grade_str)
+
+    @staticmethod
+    def assign_student_schedules(grade_level=None, course_ids=None):
         """
+        Assign each student's requested courses together, one whole student at a time.
+
+        Args:
+            grade_level: Only assign students in this grade
+            course_ids: Only assign these courses (default: every requested course)
+
+        Returns:
+            dict: Result with success flag, message, totals, errors and per-course results
+        """
+        if course_ids is None:
+            course_ids = SectionAssignmentService.requested_course_ids(grade_level)
+
         grade_str = f" for grade {grade_level}" if grade_level else ""
-        
+        return SectionAssignmentService.assign_courses(
+            course_ids, grade_level=grade_level, label=grade_str, planner_class=StudentSchedulePlanner
+        )
+
+    @staticmethod
+    def requested_course_ids(grade_level=None):
+        """Get the IDs of courses that students (optionally of one grade) are enrolled in."""
+        demand = CourseEnrollment.objects.all()
+        if grade_level:
+            demand = demand.filter(student__grade_level=grade_level)
+        return list(demand.values_list('course_id', flat=True).distinct())
+
+    @staticmethod
+    def assign_courses(course_ids, grade_level=None, student_ids=None, rebalance=False, label="",
+                       planner_class=AssignmentPlanner):
+        """
+        Plan and write section assignments for a set of courses in one pass.
+
+        Args:
+            course_ids: Courses to assign
+            grade_level: Only assign students in this grade
+            student_ids: Only assign these students
+            rebalance: Reassign students who already have a section of these courses
+            label: Text appended to the result message
+            planner_class: AssignmentPlanner (course by course min-cost flow) or
+                StudentSchedulePlanner (whole student at a time)
+
+        Returns:
+            dict: Result with success flag, message, totals, errors and per-course results
+        """
+        planner = planner_class(course_ids, grade_level=grade_level, student_ids=student_ids, rebalance=rebalance)
+        course_results = planner.plan()
+        written = planner.snapshot.commit()
+
+        total_assigned = sum(result['assigned_count'] for result in course_results)
+        errors = [error for result in course_results for error in result['errors']]
+
+        message = f"Assigned {total_assigned} students to sections{label}"
+        if errors:
+            message += f"; {len(errors)} could not be placed"
+
         return {
-            'success': False,
-            'message': f"Section assignment temporarily unavailable: algorithm is being reimplemented{grade_str}",
-            'total_assigned': 0,
-            'total_failures': 0,
-            'errors': ["Section assignment algorithm is currently unavailable"],
-            'course_results': []
+            'success': not errors,
+            'message': message,
+            'total_assigned': total_assigned,
+            'total_failures': len(errors),
+            'errors': errors,
+            'rows_written': written['rows_written'],
+            'course_results': course_results
         }
-    
+
     @staticmethod
     def assign_course_sections(course, grade_level=None):
-        """Placeholder for the assign_course_sections algorithm."""
-        course_name = course.name if hasattr(course, 'name') else str(course)
-        grade_str = f" for grade {grade_level}" if grade_level else ""
-        
+        """
+        Assign the students enrolled in one course to its sections.
+
+        Returns:
+            dict: Result with course, success flag, message, counts and errors
+        """
+        course_id = course.id if hasattr(course, 'id') else course
+        result = SectionAssignmentService.assign_courses([course_id], grade_level=grade_level)
+
+        if result['course_results']:
+            return result['course_results'][0]
+
         return {
-            'course': course_name,
+            'course': str(course),
             'success': False,
-            'message': f"Section assignment temporarily unavailable: algorithm is being reimplemented for {course_name}{grade_str}",
+            'message': f"Course {course} not found",
             'assigned_count': 0,
             'failure_count': 0,
-            'errors': [f"Section assignment for {course_name} is currently unavailable"]
+            'errors': [f"Course {course} not found"]
         }
-    
+
     @staticmethod
     def assign_student_to_course_section(student_id, course_id):
-        """Placeholder for the assign_student_to_course_section algorithm."""
+        """Assign a student to the best available section of a course they are enrolled in."""
         try:
             student = Student.objects.get(pk=student_id)
-            student_name = student.name
-        except (Student.DoesNotExist, ValueError):
-            student_name = str(student_id)
-            
-        try:
             course = Course.objects.get(pk=course_id)
-            course_name = course.name
-        except (Course.DoesNotExist, ValueError):
-            course_name = str(course_id)
-            
+        except (Student.DoesNotExist, Course.DoesNotExist, ValueError):
+            return {
+                'success': False,
+                'message': f"Cannot assign {student_id} to {course_id}: student or course not found"
+            }
+
+        if not CourseEnrollment.objects.filter(student=student, course=course).exists():
+            return {
+                'success': False,
+                'message': f"{student.name} is not enrolled in {course.name}"
+            }
+
+        existing = Enrollment.objects.filter(student=student, section__course=course).select_related('section').first()
+        if existing:
+            return {
+                'success': False,
+                'message': f"{student.name} is already in section {existing.section.section_number} of {course.name}"
+            }
+
+        result = SectionAssignmentService.assign_courses([course.id], student_ids=[student.id])
+        if not result['total_assigned']:
+            return {
+                'success': False,
+                'message': f"Cannot assign {student.name} to {course.name}: no section fits their schedule"
+            }
+
+        section = Section.objects.get(enrollment__student=student, course=course)
         return {
-            'success': False,
-            'message': f"Section assignment temporarily unavailable: cannot assign {student_name} to {course_name}"
-        } 
\ No newline at end of file
+            'success': True,
+            'message': f"Assigned {student.name} to section {section.section_number} of {course.name}",
+            'section': section
+        }
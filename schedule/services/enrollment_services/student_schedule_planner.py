@@ -0,0 +1,117 @@
+from collections import defaultdict
+from .assignment_planner import AssignmentPlanner
+
+
+class StudentSchedulePlanner(AssignmentPlanner):
+    """
+    Plans assignments one whole student at a time.
+
+    Instead of filling course by course, each student's requested courses are
+    solved together: a bounded branch-and-bound search looks for the
+    combination of sections that places the most courses without a time
+    clash, breaking ties by how full the chosen sections already are. The
+    most constrained students go first so they are not boxed in by others.
+    """
+
+    def __init__(self, course_ids, grade_level=None, student_ids=None, rebalance=False, snapshot=None,
+                 max_nodes=2000):
+        """
+        Args:
+            max_nodes: Search budget per student; the best combination found
+                within the budget is used
+        """
+        super().__init__(course_ids, grade_level=grade_level, student_ids=student_ids,
+                         rebalance=rebalance, snapshot=snapshot)
+        self.max_nodes = max_nodes
+        self.stats = {'students': 0, 'nodes': 0, 'complete': 0, 'partial': 0}
+
+    def plan(self):
+        """
+        Assign every student's pending courses.
+
+        Returns:
+            list: Per-course result dicts
+        """
+        snapshot = self.snapshot
+        requests = {
+            student: [course for course in courses if snapshot.section_for_course(student, course) is None]
+            for student, courses in enumerate(snapshot.student_requests)
+        }
+        requests = {student: courses for student, courses in requests.items() if courses}
+
+        assigned = defaultdict(int)
+        errors = defaultdict(list)
+
+        order = sorted(requests, key=lambda s: (self._flexibility(s, requests[s]), snapshot.student_ids[s]))
+        for student in order:
+            courses = requests[student]
+            choice = self._best_combination(student, courses)
+
+            self.stats['students'] += 1
+            self.stats['complete' if len(choice) == len(courses) else 'partial'] += 1
+
+            for course in courses:
+                if course in choice:
+                    snapshot.add(student, choice[course])
+                    assigned[course] += 1
+                elif not snapshot.course_sections[course]:
+                    errors[course].append(self._failure(student, course, 'no sections exist'))
+                else:
+                    errors[course].append(self._failure(student, course, 'no open section fits with their other courses'))
+
+        return [self._course_result(course, assigned[course], errors[course]) for course in self._courses_in_order()]
+
+    def _open_sections(self, student, course):
+        """Get the sections of a course with space that fit the student's current schedule."""
+        return [section for section in self.snapshot.course_sections[course] if self.snapshot.fits(student, section)]
+
+    def _flexibility(self, student, courses):
+        """Rank students: fewest options for their tightest course first, then fewest options overall."""
+        counts = [len(self._open_sections(student, course)) for course in courses]
+        return min(counts), sum(counts)
+
+    def _best_combination(self, student, courses):
+        """
+        Search the student's section combinations.
+
+        Returns:
+            dict: Course index -> section index for the courses that could be placed
+        """
+        snapshot = self.snapshot
+        # Courses with the fewest open sections are decided first
+        options = sorted(
+            ((course, sorted(self._open_sections(student, course), key=snapshot.fill_ratio)) for course in courses),
+            key=lambda option: (len(option[1]), option[0])
+        )
+        best = {'placed': -1, 'cost': 0.0, 'choice': {}}
+        choice = {}
+        nodes = 0
+
+        def search(position, mask, placed, cost):
+            nonlocal nodes
+            nodes += 1
+            # Even placing every remaining course cannot beat the best found
+            possible = placed + len(options) - position
+            if possible < best['placed'] or (possible == best['placed'] and cost >= best['cost']):
+                return
+            if position == len(options):
+                best.update(placed=placed, cost=cost, choice=dict(choice))
+                return
+            if nodes > self.max_nodes:
+                return
+
+            course, sections = options[position]
+            for section in sections:
+                section_mask = snapshot.section_mask[section]
+                if section_mask & mask:
+                    continue
+                choice[course] = section
+                search(position + 1, mask | section_mask, placed + 1, cost + snapshot.fill_ratio(section))
+                del choice[course]
+
+            # Leave this course unplaced if nothing else works
+            search(position + 1, mask, placed, cost)
+
+        search(0, snapshot.student_busy[student], 0, 0.0)
+        self.stats['nodes'] += nodes
+        return best['choice']
@@ -0,0 +1 @@
+# Import services package for background and whole-dataset CSV imports 
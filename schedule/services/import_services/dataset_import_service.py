@@ -0,0 +1,154 @@
+import csv
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import TextIOWrapper
+from django.db import transaction
+from ..csv_processors.processor_factory import ProcessorFactory
+
+# Most files parsed at the same time
+MAX_PARSE_WORKERS = 6
+
+
+class DatasetImportService:
+    """
+    Service class for importing a whole dataset (a directory or zip of CSV files) at once.
+
+    Each file's data type is detected from its header row. Files are parsed in
+    parallel worker threads, since parsing does not touch the database, and the
+    parsed rows are then written in dependency order (see
+    ProcessorFactory.get_import_order) inside a single transaction.
+    """
+
+    @staticmethod
+    def import_dataset(path, allow_errors=False, max_workers=MAX_PARSE_WORKERS):
+        """
+        Import every CSV file in a directory or zip archive.
+
+        Args:
+            path: Path to a directory or .zip file
+            allow_errors: Commit the valid rows even if some rows have errors.
+                          By default any row error rolls back the whole dataset.
+            max_workers: Most files parsed at the same time
+
+        Returns:
+            dict: Result with success flag, message, per-file counts and errors,
+                  skipped files and parse/write timings
+        """
+        try:
+            sources = DatasetImportService.list_sources(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            return {'success': False, 'message': f'Could not read dataset: {str(e)}', 'files': [], 'skipped': []}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as pool:
+            parsed = list(pool.map(lambda source: DatasetImportService.parse_source(path, source), sources))
+        parse_time = time.perf_counter() - start
+
+        skipped = [{'name': item['name'], 'reason': item['skipped']} for item in parsed if item.get('skipped')]
+        by_type = {}
+        for item in parsed:
+            if not item.get('skipped'):
+                by_type.setdefault(item['data_type'], []).append(item)
+
+        files = []
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for level in ProcessorFactory.get_import_order():
+                    for data_type in level:
+                        processor = ProcessorFactory.get_processor(data_type)
+                        for item in by_type.get(data_type, []):
+                            counts = processor.import_records(item['records'], item['errors'])
+                            counts.update({'name': item['name'], 'data_type': data_type, 'rows': item['rows']})
+                            files.append(counts)
+
+                error_count = sum(len(item['errors']) for item in files)
+                if error_count and not allow_errors:
+                    transaction.set_rollback(True)
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error importing dataset, nothing was saved: {str(e)}',
+                'files': files,
+                'skipped': skipped,
+                'parse_time': parse_time,
+                'write_time': time.perf_counter() - start,
+            }
+
+        if error_count and not allow_errors:
+            message = f'{error_count} rows had errors, nothing was saved.'
+        else:
+            totals = {key: sum(item[key] for item in files) for key in ('created', 'updated', 'unchanged')}
+            message = (f'Imported {len(files)} files: {totals["created"]} created, '
+                       f'{totals["updated"]} updated, {totals["unchanged"]} unchanged.')
+
+        return {
+            'success': not error_count or allow_errors,
+            'message': message,
+            'files': files,
+            'skipped': skipped,
+            'parse_time': parse_time,
+            'write_time': time.perf_counter() - start,
+        }
+
+    @staticmethod
+    def list_sources(path):
+        """
+        List the CSV files in a directory or zip archive, in name order.
+
+        Returns:
+            list: File paths for a directory, or member names for a zip archive
+        """
+        if os.path.isdir(path):
+            return sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith('.csv') and os.path.isfile(os.path.join(path, name))
+            )
+
+        with zipfile.ZipFile(path) as archive:
+            return sorted(
+                name for name in archive.namelist()
+                if name.lower().endswith('.csv') and not name.startswith('__MACOSX/')
+            )
+
+    @staticmethod
+    def parse_source(path, source):
+        """
+        Detect the data type of one file and parse all of its rows without touching the database.
+
+        Args:
+            path: The dataset directory or zip archive
+            source: File path or zip member name from list_sources
+
+        Returns:
+            dict: 'name', 'data_type', 'rows', parsed 'records' and (line, message) 'errors',
+                  or 'name' and a 'skipped' reason
+        """
+        name = os.path.basename(source)
+        try:
+            if os.path.isdir(path):
+                with open(source, 'rb') as raw:
+                    return DatasetImportService._parse_file(name, raw)
+            # Each thread opens its own handle on the archive
+            with zipfile.ZipFile(path) as archive, archive.open(source) as raw:
+                return DatasetImportService._parse_file(name, raw)
+        except Exception as e:
+            return {'name': name, 'skipped': f'Could not read file: {str(e)}'}
+
+    @staticmethod
+    def _parse_file(name, raw):
+        """Parse an open binary CSV file."""
+        reader = csv.reader(TextIOWrapper(raw, encoding='utf-8', newline=''))
+        headers = next(reader, None)
+        if not headers:
+            return {'name': name, 'skipped': 'File is empty'}
+
+        data_type = ProcessorFactory.detect_data_type(headers, name)
+        if data_type is None:
+            return {'name': name, 'skipped': 'Headers do not match any data type'}
+
+        rows = list(reader)
+        errors, records = ProcessorFactory.get_processor(data_type).parse_rows(rows)
+        return {'name': name, 'data_type': data_type, 'rows': len(rows), 'records': records, 'errors': errors}
@@ -0,0 +1,282 @@
+import csv
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import TextIOWrapper
+from django.conf import settings
+from datetime import timedelta
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from ...models import ImportJob
+from ..csv_processors.processor_factory import ProcessorFactory
+
+# Error messages stored on a job; error_count keeps counting past this
+MAX_STORED_ERRORS = 1000
+
+# Directory holding the temporary copies of uploaded files
+UPLOAD_DIR = os.path.join(tempfile.gettempdir(), 'schedule-imports')
+
+# Copies older than this that no job refers to were left by a rolled back request
+ORPHANED_UPLOAD_AGE = 60 * 60
+
+# A running job that has not reported progress for this long has lost its worker
+STALE_JOB_AGE = 10 * 60
+
+INTERRUPTED_MESSAGE = 'Import interrupted: the worker stopped before the job finished. Upload the file again to retry.'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Get the process-wide worker that runs one import at a time.
+
+    The first time it is created, it clears up after workers that were
+    stopped by a restart before running anything else.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='import-job')
+            _executor.submit(ImportJobService._run_in_thread, ImportJobService.recover_interrupted_jobs)
+    return _executor
+
+
+def _worker_name():
+    """Identify the current process, so a job shows which worker is running it."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class ImportJobService:
+    """
+    Service class for CSV imports that run outside the request.
+
+    An upload is copied to a temporary file and recorded as a pending ImportJob.
+    The job is then run by a local worker thread, or by the run_import_jobs
+    management command when IMPORT_JOBS_USE_THREAD is False. The worker feeds the
+    file to the same ProcessorFactory processor the upload page uses and records
+    progress on the job after every batch.
+
+    A running job records its worker and a heartbeat after every batch, so a
+    job whose worker was stopped can be told apart from one that is still
+    running in another process (see recover_interrupted_jobs).
+    """
+
+    @staticmethod
+    def create_job(data_type, uploaded_file):
+        """
+        Copy an uploaded CSV file to a temporary file and record a pending job.
+
+        Args:
+            data_type: Type of data in the file ('students', 'teachers', etc.)
+            uploaded_file: Django UploadedFile
+
+        Returns:
+            ImportJob: The pending job
+        """
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='import-', suffix='.csv', dir=UPLOAD_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as destination:
+                uploaded_file.seek(0)
+                for chunk in uploaded_file.chunks():
+                    destination.write(chunk)
+
+            return ImportJob.objects.create(
+                data_type=data_type,
+                file_name=uploaded_file.name,
+                source_path=path,
+                file_size=os.path.getsize(path)
+            )
+        except BaseException:
+            os.remove(path)
+            raise
+
+    @staticmethod
+    def start_job(job):
+        """
+        Hand a pending job to the local worker thread once the current transaction commits.
+        Does nothing when jobs are left for the run_import_jobs command.
+        """
+        if not getattr(settings, 'IMPORT_JOBS_USE_THREAD', True):
+            return
+        transaction.on_commit(
+            lambda: _get_executor().submit(ImportJobService._run_in_thread, ImportJobService.run_job, job.id)
+        )
+
+    @staticmethod
+    def _run_in_thread(func, *args):
+        """Call a function on the worker thread with its own database connection."""
+        close_old_connections()
+        try:
+            func(*args)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def recover_interrupted_jobs():
+        """
+        Clear up after workers that stopped part way through.
+
+        Running jobs whose heartbeat is older than STALE_JOB_AGE were
+        interrupted, e.g. by a restart, and would otherwise stay running
+        forever, so they are marked failed and their files removed. Jobs other
+        workers are still running keep reporting progress and are left alone.
+        Uploaded copies that no pending or running job refers to were left by
+        requests rolled back before the job was saved, and are removed once
+        they are old enough not to belong to a request still in progress.
+
+        Returns:
+            tuple: (number of jobs marked failed, number of orphaned files removed)
+        """
+        stale = ImportJob.objects.filter(status='running').filter(
+            Q(heartbeat_at__lt=timezone.now() - timedelta(seconds=STALE_JOB_AGE)) | Q(heartbeat_at__isnull=True)
+        )
+        failed = 0
+        for job_id, path in stale.values_list('id', 'source_path'):
+            # Filter on the heartbeat again, so a job that reported progress meanwhile is kept
+            if stale.filter(pk=job_id).update(status='failed', message=INTERRUPTED_MESSAGE, finished_at=timezone.now()):
+                failed += 1
+                if os.path.exists(path):
+                    os.remove(path)
+
+        if not os.path.isdir(UPLOAD_DIR):
+            return failed, 0
+
+        in_use = set(ImportJob.objects.filter(status__in=['pending', 'running']).values_list('source_path', flat=True))
+        cutoff = time.time() - ORPHANED_UPLOAD_AGE
+        removed = 0
+        for name in os.listdir(UPLOAD_DIR):
+            path = os.path.join(UPLOAD_DIR, name)
+            if path not in in_use and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return failed, removed
+
+    @staticmethod
+    def run_job(job_id):
+        """
+        Run a pending job in the current thread.
+
+        Each batch of rows is committed as it is processed, so a failure part way
+        through keeps the batches already imported and marks the job failed.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            ImportJob: The job after it has run, or unchanged if it was not pending
+        """
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(pk=job_id, status='pending').update(
+            status='running', started_at=now, heartbeat_at=now, worker=_worker_name()
+        )
+        job = ImportJob.objects.get(pk=job_id)
+        if not claimed:
+            return job
+
+        processor = ProcessorFactory.get_processor(job.data_type)
+        latest = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': [], 'rows': 0}
+
+        try:
+            if processor is None:
+                raise ValueError(f'Unknown data type: {job.data_type}')
+
+            with open(job.source_path, 'rb') as raw:
+                reader = csv.reader(TextIOWrapper(raw, encoding='utf-8', newline=''))
+                next(reader, None)  # Headers were checked when the file was uploaded
+
+                def report_progress(totals):
+                    latest.update(totals)
+                    ImportJob.objects.filter(pk=job_id).update(
+                        bytes_processed=raw.tell(),
+                        rows_processed=totals['rows'],
+                        created_count=totals['created'],
+                        updated_count=totals['updated'],
+                        unchanged_count=totals['unchanged'],
+                        error_count=len(totals['errors']),
+                        heartbeat_at=timezone.now()
+                    )
+
+                processor.process_csv_stream(reader, progress=report_progress)
+
+            job.status = 'completed'
+            job.bytes_processed = job.file_size
+            job.message = (f'Successfully processed {job.data_type} data: '
+                           f'{latest["created"]} created, {latest["updated"]} updated, '
+                           f'{latest["unchanged"]} unchanged.')
+        except Exception as e:
+            job.status = 'failed'
+            job.message = f'Error processing CSV: {str(e)}'
+        finally:
+            if os.path.exists(job.source_path):
+                os.remove(job.source_path)
+
+        job.rows_processed = latest['rows']
+        job.created_count = latest['created']
+        job.updated_count = latest['updated']
+        job.unchanged_count = latest['unchanged']
+        job.error_count = len(latest['errors'])
+        job.errors = '\n'.join(latest['errors'][:MAX_STORED_ERRORS])
+        job.finished_at = timezone.now()
+        job.save(update_fields=[
+            'status', 'message', 'bytes_processed', 'rows_processed', 'created_count',
+            'updated_count', 'unchanged_count', 'error_count', 'errors', 'finished_at'
+        ])
+        return job
+
+    @staticmethod
+    def run_pending_jobs():
+        """
+        Run every pending job in the current thread, oldest first.
+
+        Returns:
+            list: The jobs that were run
+        """
+        return [
+            ImportJobService.run_job(job_id)
+            for job_id in ImportJob.objects.filter(status='pending').order_by('created_at').values_list('id', flat=True)
+        ]
+
+    @staticmethod
+    def get_progress(job):
+        """
+        Get a job's progress as a JSON-serializable dictionary.
+
+        Args:
+            job: ImportJob
+
+        Returns:
+            dict: Status, counts, percent complete, elapsed seconds and the first errors
+        """
+        end = job.finished_at or timezone.now()
+        elapsed = (end - job.started_at).total_seconds() if job.started_at else 0
+
+        if job.status == 'completed':
+            percent = 100
+        elif job.file_size:
+            percent = min(99, int(job.bytes_processed * 100 / job.file_size))
+        else:
+            percent = 0
+
+        return {
+            'id': job.id,
+            'data_type': job.data_type,
+            'file_name': job.file_name,
+            'status': job.status,
+            'finished': job.is_finished,
+            'percent': percent,
+            'rows_processed': job.rows_processed,
+            'created': job.created_count,
+            'updated': job.updated_count,
+            'unchanged': job.unchanged_count,
+            'error_count': job.error_count,
+            'errors': job.get_errors_list()[:10],
+            'message': job.message,
+            'elapsed_seconds': round(elapsed, 2),
+        }
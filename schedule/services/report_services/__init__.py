@@ -0,0 +1 @@
+# Report services package for building and caching the admin reports
@@ -0,0 +1,174 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from ...models import Student, Teacher, Room, Course, Period, Section, SectionSettings
+from ...utils.section_utils import get_section_size_summary, get_sections_below_min_size, get_sections_stats
+from ..section_services.conflict_index_service import ConflictIndexService
+from .data_version_service import DataVersionService
+
+# Cache key of the assembled admin report and the data version it was built at
+ADMIN_REPORT_KEY = 'schedule:admin_report'
+
+# Upper bound on how long a snapshot is kept, in case a write path misses a version bump
+ADMIN_REPORT_TIMEOUT = 60 * 60
+
+
+class AdminReportService:
+    """
+    Service class for the admin reports dashboard.
+
+    The report is built from grouped aggregates, one query per histogram, and
+    cached as a snapshot tagged with the data version. A repeat load while the
+    version has not moved costs one query for the version and a cache read.
+    """
+
+    @staticmethod
+    def get_report():
+        """
+        Get the admin report, from the cached snapshot when it is current.
+
+        Returns:
+            dict: The report, in the shape of the admin_reports template context
+        """
+        if DataVersionService.has_pending_bump():
+            # The snapshot cannot include this transaction's own uncommitted writes
+            return AdminReportService.build_report()
+
+        version = DataVersionService.current()
+        snapshot = cache.get(ADMIN_REPORT_KEY)
+        if snapshot is not None and snapshot['version'] == version:
+            return snapshot['report']
+
+        report = AdminReportService.build_report()
+
+        # Only keep snapshots of committed data: one built inside a transaction
+        # that is rolled back must never be served
+        transaction.on_commit(lambda: cache.set(
+            ADMIN_REPORT_KEY, {'version': version, 'report': report}, ADMIN_REPORT_TIMEOUT
+        ))
+        return report
+
+    @staticmethod
+    def build_report():
+        """
+        Build the admin report from the database.
+
+        Returns:
+            dict: Totals, histograms, teacher and course tables, conflicts and section size statistics
+        """
+        settings = SectionSettings.objects.first()
+
+        enrollment_by_grade = AdminReportService.students_by_grade()
+        course_enrollment, courses_by_type = AdminReportService.course_enrollment()
+        section_sizes = get_section_size_summary(settings)
+        sections_by_course_type = section_sizes['sections_by_course_type']
+        teacher_load = AdminReportService.teacher_load()
+        room_utilization, total_rooms = AdminReportService.room_utilization()
+        conflicts = ConflictIndexService.get_conflicts()
+
+        return {
+            'total_students': sum(enrollment_by_grade.values()),
+            'total_teachers': len(teacher_load),
+            'total_rooms': total_rooms,
+            'total_courses': len(course_enrollment),
+            'total_sections': sum(sections_by_course_type.values()),
+            'enrollment_by_grade': enrollment_by_grade,
+            'courses_by_type': courses_by_type,
+            'sections_by_course_type': sections_by_course_type,
+            'course_enrollment': course_enrollment,
+            'teacher_load': teacher_load,
+            'room_utilization': room_utilization,
+            'period_utilization': AdminReportService.period_utilization(),
+            'conflicts': conflicts,
+            'conflict_count': len(conflicts),
+            'section_stats': get_sections_stats(section_sizes),
+            'sections_below_min': get_sections_below_min_size(section_sizes),
+            'settings': settings,
+        }
+
+    @staticmethod
+    def students_by_grade():
+        """Count students per grade level, with students without a grade under 'Unknown'."""
+        counts = dict(Student.objects.values_list('grade_level').annotate(count=Count('id')).order_by())
+        by_grade = {grade: counts[grade] for grade in sorted(grade for grade in counts if grade is not None)}
+        if None in counts:
+            by_grade['Unknown'] = counts[None]
+        return by_grade
+
+    @staticmethod
+    def course_enrollment():
+        """
+        Get each course's sections and enrolled students.
+
+        Returns:
+            tuple: ({course_id: {'course', 'total_sections', 'total_students', 'avg_class_size'}},
+                    {course type: number of courses})
+        """
+        courses = Course.objects.values('id', 'name', 'grade_level', 'type').annotate(
+            total_sections=Count('sections'),
+            total_students=Coalesce(Sum('sections__enrolled_count'), 0),
+        ).order_by('grade_level', 'name')
+
+        course_enrollment = {}
+        courses_by_type = {}
+        for row in courses:
+            course_type = row['type'] or 'Unknown'
+            courses_by_type[course_type] = courses_by_type.get(course_type, 0) + 1
+            course_enrollment[row['id']] = {
+                'course': {key: row[key] for key in ('id', 'name', 'grade_level', 'type')},
+                'total_sections': row['total_sections'],
+                'total_students': row['total_students'],
+                'avg_class_size': round(row['total_students'] / row['total_sections'], 1)
+                if row['total_sections'] else 0,
+            }
+        return course_enrollment, courses_by_type
+
+    @staticmethod
+    def teacher_load():
+        """
+        Get each teacher's sections, students and the courses they teach.
+
+        Returns:
+            dict: {teacher_id: {'teacher', 'total_sections', 'total_students', 'courses'}}
+        """
+        teachers = Teacher.objects.values('id', 'name').annotate(
+            total_sections=Count('section'),
+            total_students=Coalesce(Sum('section__enrolled_count'), 0),
+        ).order_by('name')
+
+        teacher_load = {
+            row['id']: {
+                'teacher': {'id': row['id'], 'name': row['name']},
+                'total_sections': row['total_sections'],
+                'total_students': row['total_students'],
+                'courses': [],
+            }
+            for row in teachers
+        }
+
+        taught = Section.objects.filter(teacher__isnull=False).values_list('teacher_id', 'course__name') \
+            .distinct().order_by('teacher_id', 'course__name')
+        for teacher_id, course_name in taught:
+            teacher_load[teacher_id]['courses'].append(course_name)
+
+        return teacher_load
+
+    @staticmethod
+    def room_utilization():
+        """
+        Count sections per room.
+
+        Returns:
+            tuple: ({room number: number of sections}, number of rooms)
+        """
+        rooms = list(Room.objects.values_list('id', 'number').annotate(count=Count('section')).order_by('number'))
+        return {number: count for _, number, count in rooms}, len(rooms)
+
+    @staticmethod
+    def period_utilization():
+        """Count sections per period, keyed by the period's display name."""
+        return {
+            str(period): period.section_count
+            for period in Period.objects.annotate(section_count=Count('section'))
+        }
@@ -0,0 +1,50 @@
+from django.db import connection, transaction
+from django.db.models import F
+from ...models import DataVersion
+
+# Primary key of the one DataVersion row
+DATA_VERSION_ID = 1
+
+
+class DataVersionService:
+    """
+    Service class for the scheduling data version.
+
+    The version is a counter row in the database that is bumped after every
+    committed write to the data the reports are built from. Snapshots cached
+    with the version they were built at are current exactly while the version
+    has not moved, so nothing has to find and delete them when data changes.
+
+    Inside a transaction the bump waits for the commit and happens once
+    however many rows were written, so bulk writes that send a signal per row
+    cost one UPDATE, writers never hold the counter row's lock while they work,
+    and a rolled back write never moves the version.
+    """
+
+    @staticmethod
+    def current():
+        """Get the current data version."""
+        version = DataVersion.objects.filter(pk=DATA_VERSION_ID).values_list('version', flat=True).first()
+        return version or 0
+
+    @staticmethod
+    def bump():
+        """Mark the scheduling data as changed, once the current transaction commits."""
+        if DataVersionService.has_pending_bump():
+            return
+        # The data is already committed when this runs, so a failed bump (e.g. a busy
+        # database) is logged rather than raised; the snapshot timeout bounds the staleness
+        transaction.on_commit(DataVersionService._increment, robust=True)
+
+    @staticmethod
+    def has_pending_bump():
+        """Check whether the current transaction has written data that will bump the version on commit."""
+        return connection.in_atomic_block and any(
+            func is DataVersionService._increment for _, func, _ in connection.run_on_commit
+        )
+
+    @staticmethod
+    def _increment():
+        updated = DataVersion.objects.filter(pk=DATA_VERSION_ID).update(version=F('version') + 1)
+        if not updated:
+            DataVersion.objects.get_or_create(pk=DATA_VERSION_ID, defaults={'version': 1})
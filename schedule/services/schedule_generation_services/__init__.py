@@ -0,0 +1 @@
+# Schedule generation services package for placing sections into the master schedule 
@@ -0,0 +1,234 @@
+"""
+Constraint solver for placing sections into periods with a teacher and a room.
+
+Each section to create is a variable whose domain is the list of placements
+(period, term segment, teacher) that already satisfy its unary constraints.
+Rooms are not part of the domain: most rooms are interchangeable, and branching
+over them multiplies the search space without changing feasibility. Instead,
+every variable carries its candidate rooms (best fit first) and the solver
+books the first free one when it places a section; a placement with no free
+room is rejected like any other dead end.
+
+The solver runs a depth-first search with:
+
+- most-constrained-variable ordering (smallest remaining domain first),
+- forward checking: placing a section removes every clashing placement
+  (same teacher with an overlapping occupancy mask) from the domains of the
+  sections not placed yet, and a wiped-out domain backtracks at once,
+- value ordering that spreads a course's sections across periods and balances
+  teacher loads and period usage.
+
+Domains are bucketed by period slot, because placements in different slots can
+never clash, so forward checking only scans one bucket per variable.
+"""
+import time
+from collections import defaultdict, namedtuple
+
+# One candidate placement for a section
+Placement = namedtuple('Placement', 'period_id slot when teacher_id mask')
+
+
+class PlacementVariable:
+    """A section that needs a placement."""
+
+    def __init__(self, course_id, section_number, placements, rooms=None, priority=0):
+        self.course_id = course_id
+        self.section_number = section_number
+        self.placements = placements
+        # Candidate room IDs in order of preference; [None] places the section without a room
+        self.rooms = rooms or [None]
+        # Lower priority values are tried first when domain sizes tie
+        self.priority = priority
+
+
+class PlacementSolver:
+    """Backtracking search with forward checking over section placements."""
+
+    def __init__(self, variables, max_nodes=200000, booked_rooms=None):
+        self.variables = variables
+        self.max_nodes = max_nodes
+        # Room ID -> occupancy mask already taken by sections outside the search
+        self.booked_rooms = booked_rooms or {}
+        self.stats = {'nodes': 0, 'backtracks': 0, 'pruned': 0, 'solve_time': 0.0}
+
+    def solve(self):
+        """
+        Search for a clash-free placement of every variable.
+
+        Returns:
+            dict: Variable index -> (Placement, room_id), or None if no solution
+            was found within the node limit
+        """
+        started = time.perf_counter()
+        try:
+            return self._search()
+        finally:
+            self.stats['solve_time'] = time.perf_counter() - started
+
+    def _search(self):
+        variables = self.variables
+
+        # domains[v][slot] is the set of placement indices still allowed for variable v
+        self.domains = []
+        self.sizes = []
+        for variable in variables:
+            buckets = defaultdict(set)
+            for position, placement in enumerate(variable.placements):
+                buckets[placement.slot].add(position)
+            self.domains.append(buckets)
+            self.sizes.append(len(variable.placements))
+
+        self.unassigned = set(range(len(variables)))
+        self.assignment = {}
+        self.trail = []
+        self.course_slot_counts = defaultdict(int)
+        self.teacher_loads = defaultdict(int)
+        self.slot_loads = defaultdict(int)
+        # Occupancy mask of everything booked into each room
+        self.room_busy = defaultdict(int, self.booked_rooms)
+
+        if any(size == 0 for size in self.sizes):
+            return None
+
+        # Each frame: [variable, ordered candidates, next position, trail length, current placement]
+        stack = []
+        while self.unassigned:
+            variable = self._select_variable()
+            stack.append([variable, self._order_values(variable), 0, len(self.trail), None])
+            outcome = self._advance(stack)
+            if outcome != 'placed':
+                return None
+
+        return dict(self.assignment)
+
+    def _advance(self, stack):
+        """Try the next candidate of the top frame, backtracking through the stack as needed."""
+        while stack:
+            frame = stack[-1]
+            variable, candidates = frame[0], frame[1]
+
+            # Undo the placement this frame made last time round
+            if frame[4] is not None:
+                self._unassign(variable, frame[4])
+                self._restore(frame[3])
+                frame[4] = None
+
+            if frame[2] >= len(candidates):
+                stack.pop()
+                self.stats['backtracks'] += 1
+                continue
+
+            position = candidates[frame[2]]
+            frame[2] += 1
+
+            self.stats['nodes'] += 1
+            if self.stats['nodes'] > self.max_nodes:
+                return 'limit'
+
+            room_id = self._free_room(variable, position)
+            if room_id is False:
+                continue
+
+            frame[4] = position
+            self._assign(variable, position, room_id)
+            if self._forward_check(variable, position):
+                return 'placed'
+
+        return 'exhausted'
+
+    def _select_variable(self):
+        """Pick the unplaced variable with the fewest remaining placements."""
+        return min(self.unassigned, key=lambda v: (self.sizes[v], self.variables[v].priority, v))
+
+    def _order_values(self, variable):
+        """Order a variable's remaining placements from most to least promising."""
+        placements = self.variables[variable].placements
+        course_id = self.variables[variable].course_id
+        candidates = [position for bucket in self.domains[variable].values() for position in bucket]
+
+        def preference(position):
+            placement = placements[position]
+            return (
+                self.course_slot_counts[(course_id, placement.slot, placement.when)],
+                self.course_slot_counts[(course_id, placement.slot, None)],
+                self.teacher_loads[placement.teacher_id],
+                self.slot_loads[placement.slot],
+                position,
+            )
+
+        return sorted(candidates, key=preference)
+
+    def _free_room(self, variable, position):
+        """Get the first candidate room free for a placement, or False if they are all booked."""
+        mask = self.variables[variable].placements[position].mask
+        for room_id in self.variables[variable].rooms:
+            if room_id is None or not self.room_busy[room_id] & mask:
+                return room_id
+        return False
+
+    def _assign(self, variable, position, room_id):
+        placement = self.variables[variable].placements[position]
+        course_id = self.variables[variable].course_id
+        self.assignment[variable] = (placement, room_id)
+        self.unassigned.discard(variable)
+        self.course_slot_counts[(course_id, placement.slot, placement.when)] += 1
+        self.course_slot_counts[(course_id, placement.slot, None)] += 1
+        self.teacher_loads[placement.teacher_id] += 1
+        self.slot_loads[placement.slot] += 1
+        if room_id is not None:
+            self.room_busy[room_id] |= placement.mask
+
+    def _unassign(self, variable, position):
+        placement = self.variables[variable].placements[position]
+        course_id = self.variables[variable].course_id
+        _, room_id = self.assignment.pop(variable)
+        self.unassigned.add(variable)
+        self.course_slot_counts[(course_id, placement.slot, placement.when)] -= 1
+        self.course_slot_counts[(course_id, placement.slot, None)] -= 1
+        self.teacher_loads[placement.teacher_id] -= 1
+        self.slot_loads[placement.slot] -= 1
+        if room_id is not None:
+            self.room_busy[room_id] &= ~placement.mask
+
+    def _forward_check(self, variable, position):
+        """
+        Remove placements that clash with the new one from every unplaced variable.
+
+        Returns:
+            bool: False if some variable has no placements left
+        """
+        placed = self.variables[variable].placements[position]
+        teacher_id, mask = placed.teacher_id, placed.mask
+        if teacher_id is None:
+            return True
+
+        for other in self.unassigned:
+            bucket = self.domains[other].get(placed.slot)
+            if not bucket:
+                continue
+
+            placements = self.variables[other].placements
+            removed = [
+                candidate for candidate in bucket
+                if placements[candidate].teacher_id == teacher_id and placements[candidate].mask & mask
+            ]
+            if not removed:
+                continue
+
+            for candidate in removed:
+                bucket.discard(candidate)
+                self.trail.append((other, placed.slot, candidate))
+            self.sizes[other] -= len(removed)
+            self.stats['pruned'] += len(removed)
+
+            if self.sizes[other] == 0:
+                return False
+
+        return True
+
+    def _restore(self, trail_length):
+        """Put back every placement pruned since the trail had the given length."""
+        while len(self.trail) > trail_length:
+            other, slot, candidate = self.trail.pop()
+            self.domains[other][slot].add(candidate)
+            self.sizes[other] += 1
@@ -0,0 +1,260 @@
+import re
+from collections import defaultdict
+from django.db import transaction
+from ...models import Course, Room, Period, Section, SectionSettings, CourseGroup, TrimesterCourseGroup
+from ...utils.availability_utils import is_available
+from ..section_services.structured_data_service import StructuredDataService
+from ...utils.occupancy_utils import OccupancyIndex
+from ..section_services.conflict_index_service import ConflictIndexService
+from ..report_services.data_version_service import DataVersionService
+from .placement_solver import Placement, PlacementVariable, PlacementSolver
+
+
+# Term segments a course's sections can be placed in, by course duration
+DURATION_SEGMENTS = {
+    'year': ['year'],
+    'trimester': ['t1', 't2', 't3'],
+    'quarter': ['q1', 'q2', 'q3', 'q4'],
+}
+
+# Room types preferred for courses whose name contains one of the keywords
+ROOM_TYPE_KEYWORDS = [
+    (('science', 'biology', 'chemistry', 'physics', 'lab'), 'lab'),
+    (('physical education', 'p.e.', 'pe', 'gym', 'health'), 'gym'),
+    (('art', 'visual arts', 'drawing', 'painting', 'ceramics'), 'art'),
+    (('music', 'band', 'choir', 'orchestra'), 'music'),
+]
+
+DEFAULT_MAX_SECTION_SIZE = 30
+
+LUNCH_SLOT = 'L'
+
+
+class SectionPlacementService:
+    """
+    Service class for generating the master schedule.
+
+    Creates each course's sections_needed sections and places them into periods
+    with an eligible, available teacher and a room that fits, so that no teacher
+    or room is double-booked.
+    """
+
+    @staticmethod
+    def generate_sections(max_nodes=200000):
+        """
+        Place sections for every course that does not have any yet.
+
+        Existing sections are kept and their teachers and rooms are treated as
+        already booked.
+
+        Args:
+            max_nodes: Maximum number of search nodes before giving up
+
+        Returns:
+            dict: Result with success flag, message, sections_created,
+            unplaceable courses and the solver statistics
+        """
+        data = SectionPlacementService.load_data()
+        variables, unplaceable = SectionPlacementService.build_variables(data)
+
+        solver = PlacementSolver(variables, max_nodes=max_nodes, booked_rooms=data['booked_rooms'])
+        assignment = solver.solve() if variables else {}
+        stats = dict(solver.stats, variables=len(variables))
+
+        if assignment is None:
+            reason = 'node limit reached' if stats['nodes'] > max_nodes else 'no valid placement exists'
+            return {
+                'success': False,
+                'message': f"Could not place {len(variables)} sections ({reason})",
+                'sections_created': 0,
+                'unplaceable': unplaceable,
+                'stats': stats,
+            }
+
+        sections = SectionPlacementService.create_sections(variables, assignment, data)
+
+        message = f"Placed {len(sections)} sections in {stats['solve_time']:.2f}s"
+        if unplaceable:
+            message += f"; {len(unplaceable)} courses could not be placed"
+
+        return {
+            'success': True,
+            'message': message,
+            'sections_created': len(sections),
+            'unplaceable': unplaceable,
+            'stats': stats,
+        }
+
+    @staticmethod
+    def load_data():
+        """
+        Load everything the solver needs in a fixed number of queries.
+
+        Returns:
+            dict: Courses, teacher availability, rooms, teaching periods,
+            preferred periods, existing bookings and the default section size
+        """
+        index = OccupancyIndex()
+
+        periods = [
+            {'id': period_id, 'slot': slot, 'day_mask': days}
+            for period_id, slot, days in Period.objects.exclude(slot__iexact=LUNCH_SLOT)
+            .values_list('id', 'slot', 'day_mask').order_by('slot', 'id')
+        ]
+
+        preferred_periods = {}
+        for group_model in (CourseGroup, TrimesterCourseGroup):
+            pairs = group_model.objects.exclude(preferred_period=None).values_list('courses__id', 'preferred_period_id')
+            for course_id, period_id in pairs:
+                if course_id:
+                    preferred_periods.setdefault(course_id, period_id)
+
+        # Occupancy of the teachers and rooms used by sections that already exist
+        booked_teachers = defaultdict(int)
+        booked_rooms = defaultdict(int)
+        existing_courses = set()
+        for row in Section.objects.values('course_id', 'teacher_id', 'room_id', 'period__slot', 'period__day_mask', 'when'):
+            existing_courses.add(row['course_id'])
+            mask = index.mask_for_row(row)
+            if row['teacher_id']:
+                booked_teachers[row['teacher_id']] |= mask
+            if row['room_id']:
+                booked_rooms[row['room_id']] |= mask
+
+        settings = SectionSettings.objects.first()
+
+        return {
+            'index': index,
+            'courses': list(Course.objects.exclude(id__in=existing_courses).order_by('id')),
+            'teachers': StructuredDataService.get_teacher_availability(),
+            'eligible_teachers': StructuredDataService.get_eligible_teachers(),
+            'rooms': list(Room.objects.values_list('id', 'capacity', 'type').order_by('capacity', 'id')),
+            'periods': periods,
+            'preferred_periods': preferred_periods,
+            'booked_teachers': booked_teachers,
+            'booked_rooms': dict(booked_rooms),
+            'default_max_size': settings.default_max_size if settings else DEFAULT_MAX_SECTION_SIZE,
+        }
+
+    @staticmethod
+    def preferred_room_type(course):
+        """Guess the room type a course needs from its name, or None for an ordinary classroom."""
+        name = course.name.lower()
+        for keywords, room_type in ROOM_TYPE_KEYWORDS:
+            if any(re.search(rf'(?<!\w){re.escape(keyword)}(?!\w)', name) for keyword in keywords):
+                return room_type
+        return None
+
+    @staticmethod
+    def candidate_rooms(course, size, rooms):
+        """
+        Get the IDs of the rooms a course's sections may use, best fit first.
+
+        Rooms must hold the section. Rooms of the preferred type come first,
+        smallest first, followed by any other room that fits. Returns [None]
+        when there are no rooms at all, so sections can still be placed
+        without one.
+        """
+        if not rooms:
+            return [None]
+
+        room_type = SectionPlacementService.preferred_room_type(course) or 'classroom'
+        fitting = [room for room in rooms if room[1] >= size]
+        preferred = [room_id for room_id, _, type_ in fitting if type_ == room_type]
+        others = [room_id for room_id, _, type_ in fitting if type_ != room_type]
+
+        return preferred + others
+
+    @staticmethod
+    def build_variables(data):
+        """
+        Build one solver variable per section to create.
+
+        Returns:
+            tuple: (variables, unplaceable) where unplaceable lists
+            {'course_id', 'reason'} for courses with no valid placement
+        """
+        index = data['index']
+        variables = []
+        unplaceable = []
+
+        for course in data['courses']:
+            if course.sections_needed <= 0:
+                continue
+
+            size = course.max_students or data['default_max_size']
+            segments = DURATION_SEGMENTS.get((course.duration or 'year').lower(), ['year'])
+
+            eligible = data['eligible_teachers'].get(course.id)
+            if eligible:
+                teachers = [teacher_id for teacher_id in eligible if teacher_id in data['teachers']]
+                if not teachers:
+                    unplaceable.append({'course_id': course.id, 'reason': 'none of its eligible teachers exist'})
+                    continue
+            else:
+                teachers = [None]
+
+            rooms = SectionPlacementService.candidate_rooms(course, size, data['rooms'])
+            if not rooms:
+                unplaceable.append({'course_id': course.id, 'reason': f'no room holds {size} students'})
+                continue
+
+            periods = data['periods']
+            preferred = data['preferred_periods'].get(course.id)
+            if preferred:
+                periods = [period for period in periods if period['id'] == preferred] or periods
+
+            placements = []
+            for period in periods:
+                for when in segments:
+                    mask = index.section_mask(period['slot'], period['day_mask'], when)
+                    for teacher_id in teachers:
+                        if teacher_id is not None and (
+                            data['booked_teachers'][teacher_id] & mask or
+                            not is_available(data['teachers'][teacher_id], period['day_mask'], period['slot'])
+                        ):
+                            continue
+                        placements.append(Placement(period['id'], period['slot'], when, teacher_id, mask))
+
+            if not placements:
+                unplaceable.append({'course_id': course.id, 'reason': 'no period has an available teacher'})
+                continue
+
+            for section_number in range(1, course.sections_needed + 1):
+                variables.append(PlacementVariable(
+                    course.id, section_number, placements, rooms=rooms, priority=len(teachers)
+                ))
+
+        return variables, unplaceable
+
+    @staticmethod
+    def create_sections(variables, assignment, data):
+        """
+        Write the placed sections in one bulk insert and refresh the conflict index.
+
+        Returns:
+            list: The created Section objects
+        """
+        max_sizes = {course.id: course.max_students or data['default_max_size'] for course in data['courses']}
+
+        sections = []
+        for position, (placement, room_id) in sorted(assignment.items()):
+            variable = variables[position]
+            sections.append(Section(
+                id=f"{variable.course_id}-{variable.section_number}",
+                course_id=variable.course_id,
+                section_number=variable.section_number,
+                teacher_id=placement.teacher_id,
+                period_id=placement.period_id,
+                room_id=room_id,
+                max_size=max_sizes[variable.course_id],
+                when=placement.when,
+            ))
+
+        with transaction.atomic():
+            Section.objects.bulk_create(sections, batch_size=500)
+            # bulk_create skips the signals that keep the conflict index and data version current
+            ConflictIndexService.refresh_sections([section.id for section in sections])
+            DataVersionService.bump()
+
+        return sections
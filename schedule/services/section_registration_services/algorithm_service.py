@@ -1,18 +1,22 @@
 """
 Service class for handling scheduling algorithms.
-These are placeholder implementations that don't actually perform scheduling.
+Covers section balancing and the joint language and core course registration.
 """
 from django.db import transaction
 from ...models import Student, Course, Section, Enrollment, CourseEnrollment
+from ..enrollment_services.section_assignment_service import SectionAssignmentService
 
 
 class AlgorithmService:
-    """Service class for scheduling algorithms (placeholder implementations)."""
+    """Service class for scheduling algorithms."""
     
     @staticmethod
     def balance_section_assignments(course_id=None):
         """
-        Placeholder for the balance_section_assignments algorithm.
+        Reassign students to sections so every section is evenly filled.
+        
+        Each course is solved as a min-cost flow over the whole roster, then the
+        result is written with one delete and one bulk insert.
         
         Args:
             course_id: Optional course ID to filter by
@@ -20,26 +24,33 @@ class AlgorithmService:
         Returns:
             dict: Result with success flag, message, and stats
         """
-        course_name = "all courses"
         if course_id:
-            try:
-                course = Course.objects.get(id=course_id)
-                course_name = course.name
-            except Course.DoesNotExist:
-                course_name = course_id
-                
+            if not Course.objects.filter(id=course_id).exists():
+                return {
+                    'success': False,
+                    'message': f"Course {course_id} not found",
+                    'success_count': 0,
+                    'failure_count': 0,
+                    'course_results': []
+                }
+            course_ids = [course_id]
+        else:
+            course_ids = list(CourseEnrollment.objects.values_list('course_id', flat=True).distinct())
+        
+        result = SectionAssignmentService.assign_courses(course_ids, rebalance=True)
+        
         return {
-            'success': False,
-            'message': f"Section assignment temporarily unavailable: algorithm is being reimplemented for {course_name}",
-            'success_count': 0,
-            'failure_count': 0,
-            'course_results': []
+            'success': result['success'],
+            'message': result['message'],
+            'success_count': result['total_assigned'],
+            'failure_count': result['total_failures'],
+            'course_results': result['course_results']
         }
     
     @staticmethod
     def _balance_course_sections(course_id, enrollments):
         """
-        Placeholder for the _balance_course_sections algorithm.
+        Rebalance the sections of one course for the given course enrollments.
         
         Args:
             course_id: Course ID
@@ -48,56 +59,55 @@ class AlgorithmService:
         Returns:
             dict: Result with success flag, message, and stats
         """
-        course_name = "Unknown course"
-        try:
-            course = Course.objects.get(id=course_id)
-            course_name = course.name
-        except Course.DoesNotExist:
-            course_name = str(course_id)
-            
+        student_ids = [enrollment.student_id for enrollment in enrollments]
+        result = SectionAssignmentService.assign_courses([course_id], student_ids=student_ids, rebalance=True)
+        course_result = result['course_results'][0] if result['course_results'] else {
+            'course': str(course_id), 'success': False, 'message': f"Course {course_id} not found",
+            'assigned_count': 0, 'failure_count': len(student_ids)
+        }
+        
         return {
-            'course': course_name,
-            'success': False,
-            'message': f"Section assignment temporarily unavailable: algorithm is being reimplemented for {course_name}",
-            'success_count': 0,
-            'failure_count': len(enrollments) if enrollments else 0
+            'course': course_result['course'],
+            'success': course_result['success'],
+            'message': course_result['message'],
+            'success_count': course_result['assigned_count'],
+            'failure_count': course_result['failure_count']
         }
     
     @staticmethod
-    def register_language_and_core_courses(grade_level=6, undo_depth=3):
+    def register_language_and_core_courses(grade_level=6):
         """
-        Placeholder for the register_language_and_core_courses algorithm.
+        Register students into their language and core course sections.
+        
+        Each student's language and core courses are solved together, so a
+        student is never boxed in by an earlier course choice and no undo pass
+        is needed.
         
         Args:
             grade_level: Grade level to process (default: 6)
-            undo_depth: How many assignments to undo when conflicts occur
             
         Returns:
             dict: Result with success flag, message, and stats
         """
-        return {
-            'success': False,
-            'message': f"Language and core course registration temporarily unavailable: algorithm is being reimplemented for grade {grade_level}",
-            'language_success': 0,
-            'language_failure': 0,
-            'core_success': 0,
-            'core_failure': 0
-        }
-    
-    @staticmethod
-    def _register_course_type(students, courses, undo_depth):
-        """
-        Placeholder for the _register_course_type algorithm.
+        course_types = dict(Course.objects.filter(
+            grade_level=grade_level, type__in=['language', 'core']
+        ).values_list('id', 'type'))
+        
+        result = SectionAssignmentService.assign_student_schedules(
+            grade_level=grade_level, course_ids=list(course_types)
+        )
+        
+        counts = {'language': [0, 0], 'core': [0, 0]}
+        for course_result in result['course_results']:
+            course_counts = counts[course_types[course_result['course_id']]]
+            course_counts[0] += course_result['assigned_count']
+            course_counts[1] += course_result['failure_count']
         
-        Args:
-            students: QuerySet of Student objects
-            courses: QuerySet of Course objects
-            undo_depth: How many assignments to undo when conflicts occur
-            
-        Returns:
-            dict: Result with success_count and failure_count
-        """
         return {
-            'success_count': 0,
-            'failure_count': 0
-        } 
\ No newline at end of file
+            'success': result['success'],
+            'message': result['message'],
+            'language_success': counts['language'][0],
+            'language_failure': counts['language'][1],
+            'core_success': counts['core'][0],
+            'core_failure': counts['core'][1]
+        }
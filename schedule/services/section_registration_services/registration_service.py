@@ -4,6 +4,7 @@ Service class for handling section registration operations.
 from django.db.models import Count, Q, F
 from django.db import transaction
 from ...models import Student, Course, Section, CourseEnrollment, Enrollment
+from ..section_services.enrollment_count_service import EnrollmentCountService
 
 
 class RegistrationService:
@@ -23,7 +24,7 @@ class RegistrationService:
         section_stats = []
         
         for section in sections:
-            enrolled_count = section.students.count()
+            enrolled_count = section.enrolled_count
             has_max_size = section.max_size is not None
             has_exact_size = section.exact_size is not None
             
@@ -116,8 +117,9 @@ class RegistrationService:
             # Count enrollments before deletion for reporting
             enrollment_count = Enrollment.objects.filter(query).count()
             
-            # Delete the enrollments
-            Enrollment.objects.filter(query).delete()
+            # Delete the enrollments, adjusting each section's count once
+            with EnrollmentCountService.deferred():
+                Enrollment.objects.filter(query).delete()
             
             return {
                 'success': True,
@@ -0,0 +1,242 @@
+import threading
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models import Q
+from ...models import Section, Enrollment, Student, ScheduleConflict
+from .conflict_service import ConflictService, CONFLICT_KEYS
+from ..report_services.data_version_service import DataVersionService
+
+
+# Order conflicts are listed in, matching ConflictService.find_all_conflicts
+CONFLICT_TYPE_ORDER = {'teacher': 0, 'room': 1, 'student': 2}
+
+_state = threading.local()
+
+
+class ConflictIndexService:
+    """
+    Service class for the persistent conflict index (ScheduleConflict rows).
+
+    The index stores the current conflicts keyed by (conflict type, resource ID).
+    Signal handlers refresh only the teachers, rooms and students touched by a
+    write, so reading the conflict set costs O(conflicts) instead of a full scan.
+    """
+
+    @staticmethod
+    def get_conflicts():
+        """
+        Get the current conflicts from the index.
+
+        Returns:
+            list: Conflict dictionaries in the same shape as ConflictService.find_all_conflicts
+        """
+        entries = list(ScheduleConflict.objects.order_by('id'))
+        if not entries:
+            return []
+
+        section_ids = set()
+        student_ids = set()
+        for entry in entries:
+            section_ids.update((entry.section_id, entry.other_section_id))
+            if entry.conflict_type == 'student':
+                student_ids.add(entry.resource_id)
+
+        sections = ConflictService.load_section_rows(Section.objects.filter(id__in=section_ids))
+        students = dict(Student.objects.filter(id__in=student_ids).values_list('id', 'name'))
+
+        conflicts = []
+        for entry in sorted(entries, key=lambda e: CONFLICT_TYPE_ORDER[e.conflict_type]):
+            first = sections.get(entry.section_id)
+            section = sections.get(entry.other_section_id)
+            if first is None or section is None:
+                continue
+            if entry.conflict_type == 'student':
+                section = dict(section, student_id=entry.resource_id)
+            conflicts.append(ConflictService.build_conflict(
+                entry.conflict_type, first, section, students.get(entry.resource_id)
+            ))
+
+        return conflicts
+
+    @staticmethod
+    def rebuild():
+        """
+        Rebuild the whole index from a full scan of the schedule.
+
+        Returns:
+            int: Number of conflicts stored
+        """
+        sections = ConflictService.load_section_rows()
+        enrollments = Enrollment.objects.values_list(
+            'student_id', 'student__name', 'section_id'
+        ).order_by('student_id', 'section_id')
+        student_rows, _ = ConflictService.student_section_rows(sections, enrollments)
+
+        entries = []
+        entries.extend(ConflictIndexService._build_entries('teacher', sections.values()))
+        entries.extend(ConflictIndexService._build_entries('room', sections.values()))
+        entries.extend(ConflictIndexService._build_entries('student', student_rows))
+
+        with transaction.atomic():
+            ScheduleConflict.objects.all().delete()
+            ScheduleConflict.objects.bulk_create(entries, batch_size=1000)
+            DataVersionService.bump()
+
+        return len(entries)
+
+    @staticmethod
+    def check_consistency():
+        """
+        Compare the index against a full conflict scan.
+
+        Returns:
+            dict: 'consistent' flag plus the 'missing' conflicts (found by the scan
+            but not indexed) and 'stale' conflicts (indexed but no longer real)
+        """
+        def conflict_key(conflict):
+            resource = conflict['student']['id'] if conflict['type'] == 'student' else None
+            return (conflict['type'], resource, conflict['sections'][0]['id'], conflict['sections'][1]['id'])
+
+        scanned = {conflict_key(c) for c in ConflictService.find_all_conflicts()}
+        indexed = {conflict_key(c) for c in ConflictIndexService.get_conflicts()}
+
+        return {
+            'consistent': scanned == indexed,
+            'missing': sorted(scanned - indexed, key=str),
+            'stale': sorted(indexed - scanned, key=str),
+        }
+
+    @staticmethod
+    def refresh_teachers(teacher_ids):
+        """Recompute the indexed conflicts for the given teachers."""
+        ConflictIndexService._refresh('teacher', teacher_ids)
+
+    @staticmethod
+    def refresh_rooms(room_ids):
+        """Recompute the indexed conflicts for the given rooms."""
+        ConflictIndexService._refresh('room', room_ids)
+
+    @staticmethod
+    def refresh_students(student_ids):
+        """Recompute the indexed conflicts for the given students."""
+        ConflictIndexService._refresh('student', student_ids)
+
+    @staticmethod
+    def refresh_sections(section_ids):
+        """Recompute the indexed conflicts for everyone who uses the given sections."""
+        ConflictIndexService.refresh_resources(ConflictIndexService.resources_for_sections(section_ids))
+
+    @staticmethod
+    def resources_for_sections(section_ids):
+        """
+        Get the resources whose conflicts depend on the given sections.
+
+        This covers the sections' current teachers, rooms and students, plus any
+        resource already indexed against them (e.g. a teacher the section was
+        moved away from).
+
+        Returns:
+            set: (conflict_type, resource_id) pairs
+        """
+        section_ids = [section_id for section_id in section_ids if section_id is not None]
+        if not section_ids:
+            return set()
+
+        resources = set(ScheduleConflict.objects.filter(
+            Q(section_id__in=section_ids) | Q(other_section_id__in=section_ids)
+        ).values_list('conflict_type', 'resource_id'))
+
+        for teacher_id, room_id in Section.objects.filter(id__in=section_ids).values_list('teacher_id', 'room_id'):
+            resources.add(('teacher', teacher_id))
+            resources.add(('room', room_id))
+
+        for student_id in Enrollment.objects.filter(section_id__in=section_ids).values_list('student_id', flat=True):
+            resources.add(('student', student_id))
+
+        return resources
+
+    @staticmethod
+    def refresh_resources(resources):
+        """Recompute the indexed conflicts for (conflict_type, resource_id) pairs."""
+        for conflict_type in CONFLICT_KEYS:
+            ConflictIndexService._refresh(
+                conflict_type,
+                [resource_id for resource_type, resource_id in resources if resource_type == conflict_type]
+            )
+
+    @staticmethod
+    def remove_resource(conflict_type, resource_id):
+        """Drop every indexed conflict for a deleted teacher, room or student."""
+        ScheduleConflict.objects.filter(conflict_type=conflict_type, resource_id=resource_id).delete()
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """
+        Batch index refreshes until the end of the block.
+
+        Bulk write paths wrap their work in this so that many enrollment or
+        section writes trigger one refresh per resource instead of one per row.
+        """
+        pending = getattr(_state, 'pending', None)
+        if pending is not None:
+            # Already deferring: the outermost block flushes
+            yield
+            return
+
+        _state.pending = {conflict_type: set() for conflict_type in CONFLICT_KEYS}
+        try:
+            yield
+        finally:
+            pending, _state.pending = _state.pending, None
+
+        for conflict_type, resource_ids in pending.items():
+            ConflictIndexService._refresh(conflict_type, resource_ids)
+
+    @staticmethod
+    def _refresh(conflict_type, resource_ids):
+        """Replace the indexed conflicts of one type for the given resources."""
+        resource_ids = {resource_id for resource_id in resource_ids if resource_id is not None}
+        if not resource_ids:
+            return
+
+        pending = getattr(_state, 'pending', None)
+        if pending is not None:
+            pending[conflict_type].update(resource_ids)
+            return
+
+        if conflict_type == 'student':
+            enrollments = list(Enrollment.objects.filter(student_id__in=resource_ids).values_list(
+                'student_id', 'student__name', 'section_id'
+            ).order_by('student_id', 'section_id'))
+            sections = ConflictService.load_section_rows(
+                Section.objects.filter(id__in={section_id for _, _, section_id in enrollments})
+            )
+            rows, _ = ConflictService.student_section_rows(sections, enrollments)
+        else:
+            lookup = {f"{CONFLICT_KEYS[conflict_type]}__in": resource_ids}
+            rows = ConflictService.load_section_rows(Section.objects.filter(**lookup)).values()
+
+        entries = ConflictIndexService._build_entries(conflict_type, rows)
+
+        with transaction.atomic():
+            ScheduleConflict.objects.filter(
+                conflict_type=conflict_type,
+                resource_id__in=resource_ids
+            ).delete()
+            ScheduleConflict.objects.bulk_create(entries)
+
+    @staticmethod
+    def _build_entries(conflict_type, rows):
+        """Build unsaved ScheduleConflict rows for the clashing pairs among the rows."""
+        key = CONFLICT_KEYS[conflict_type]
+        return [
+            ScheduleConflict(
+                conflict_type=conflict_type,
+                resource_id=section[key],
+                period_slot=section['period__slot'],
+                section_id=first['id'],
+                other_section_id=section['id'],
+            )
+            for first, section in ConflictService.find_overlapping_pairs(rows, key)
+        ]
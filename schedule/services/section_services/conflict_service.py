@@ -1,5 +1,21 @@
-from django.db.models import Q
-from ...models import Section, Teacher, Room, Student
+from django.db.models import F
+from ...models import Section, Enrollment
+from ...utils.occupancy_utils import OccupancyIndex
+from .structured_data_service import StructuredDataService
+
+
+# Fields loaded for every section row used in conflict detection
+SECTION_ROW_FIELDS = (
+    'id', 'period_id', 'period__period_name', 'period__slot', 'period__day_mask', 'when',
+    'course__name', 'teacher_id', 'teacher__name', 'room_id', 'room__number'
+)
+
+# Row key holding the clashing resource for each conflict type
+CONFLICT_KEYS = {
+    'teacher': 'teacher_id',
+    'room': 'room_id',
+    'student': 'student_id',
+}
 
 
 class ConflictService:
@@ -7,11 +23,19 @@ class ConflictService:
     
     @staticmethod
     def find_all_conflicts():
-        """Find all schedule conflicts in the current schedule."""
+        """
+        Find all schedule conflicts in the current schedule.
+        
+        Sections and enrollments are each loaded once as flat rows and the
+        clashes are found by grouping on (resource, period slot), so the number
+        of queries stays fixed regardless of how many teachers, rooms or students
+        there are. Within a group, sections only clash when their occupancy
+        masks overlap, so a t1 and a t2 section in the same period do not.
+        """
         conflicts = []
         
-        # Get all sections with a period assigned
-        sections = Section.objects.exclude(period__isnull=True).select_related('period', 'course', 'teacher', 'room')
+        # Get all sections with a period assigned, keyed by section ID
+        sections = ConflictService.load_section_rows()
         
         # Add teacher conflicts
         conflicts.extend(ConflictService._find_teacher_conflicts(sections))
@@ -25,178 +49,242 @@ class ConflictService:
         return conflicts
     
     @staticmethod
-    def _find_teacher_conflicts(sections):
-        """Find conflicts where the same teacher is assigned to multiple sections in the same period."""
-        conflicts = []
+    def load_section_rows(sections=None):
+        """
+        Load scheduled sections as flat rows in a single query, each with its occupancy mask.
         
-        # Check for teacher conflicts (same teacher, same period)
-        teachers = Teacher.objects.all()
-        for teacher in teachers:
-            teacher_sections = sections.filter(teacher=teacher)
-            periods_with_sections = {}
+        Args:
+            sections: Optional Section queryset to restrict the rows to
             
-            for section in teacher_sections:
-                if not section.period:
-                    continue
-                    
-                period_id = section.period.id
-                if period_id in periods_with_sections:
-                    # Conflict: Teacher assigned to multiple sections in the same period
-                    conflict = {
-                        'type': 'teacher',
-                        'description': f"Teacher {teacher.name} assigned to multiple sections in period {section.period.period_name}",
-                        'sections': [
-                            {
-                                'id': periods_with_sections[period_id].id,
-                                'course': periods_with_sections[period_id].course.name if periods_with_sections[period_id].course else "Unassigned",
-                                'period': periods_with_sections[period_id].period.period_name,
-                                'room': periods_with_sections[period_id].room.number if periods_with_sections[period_id].room else "Unassigned"
-                            },
-                            {
-                                'id': section.id,
-                                'course': section.course.name if section.course else "Unassigned",
-                                'period': section.period.period_name,
-                                'room': section.room.number if section.room else "Unassigned"
-                            }
-                        ]
-                    }
-                    conflicts.append(conflict)
-                else:
-                    periods_with_sections[period_id] = section
+        Returns:
+            dict: Section ID -> row dictionary
+        """
+        if sections is None:
+            sections = Section.objects.all()
         
-        return conflicts
+        rows = sections.exclude(period__isnull=True).values(*SECTION_ROW_FIELDS).order_by('id')
+        
+        index = OccupancyIndex()
+        section_rows = {}
+        for row in rows:
+            row['mask'] = index.mask_for_row(row)
+            section_rows[row['id']] = row
+        
+        return section_rows
     
     @staticmethod
-    def _find_room_conflicts(sections):
-        """Find conflicts where the same room is assigned to multiple sections in the same period."""
-        conflicts = []
+    def student_section_rows(sections, enrollments):
+        """
+        Attach each student to their section rows.
         
-        # Check for room conflicts (same room, same period)
-        rooms = Room.objects.all()
-        for room in rooms:
-            room_sections = sections.filter(room=room)
-            periods_with_sections = {}
+        Args:
+            sections: Section ID -> row dictionary from load_section_rows
+            enrollments: Iterable of (student_id, student_name, section_id) ordered by student and section
             
-            for section in room_sections:
-                if not section.period:
-                    continue
-                    
-                period_id = section.period.id
-                if period_id in periods_with_sections:
-                    # Conflict: Room assigned to multiple sections in the same period
-                    conflict = {
-                        'type': 'room',
-                        'description': f"Room {room.number} assigned to multiple sections in period {section.period.period_name}",
-                        'sections': [
-                            {
-                                'id': periods_with_sections[period_id].id,
-                                'course': periods_with_sections[period_id].course.name if periods_with_sections[period_id].course else "Unassigned",
-                                'period': periods_with_sections[period_id].period.period_name,
-                                'teacher': periods_with_sections[period_id].teacher.name if periods_with_sections[period_id].teacher else "Unassigned"
-                            },
-                            {
-                                'id': section.id,
-                                'course': section.course.name if section.course else "Unassigned",
-                                'period': section.period.period_name,
-                                'teacher': section.teacher.name if section.teacher else "Unassigned"
-                            }
-                        ]
-                    }
-                    conflicts.append(conflict)
-                else:
-                    periods_with_sections[period_id] = section
+        Returns:
+            tuple: (list of section rows carrying a student_id, dict of student ID -> name)
+        """
+        rows = []
+        students = {}
+        for student_id, student_name, section_id in enrollments:
+            section = sections.get(section_id)
+            if section is None:
+                continue
+            students[student_id] = student_name
+            rows.append(dict(section, student_id=student_id))
         
-        return conflicts
+        return rows, students
     
     @staticmethod
-    def _find_student_conflicts(sections):
-        """Find conflicts where students are assigned to multiple sections in the same period."""
-        conflicts = []
+    def find_overlapping_pairs(rows, key):
+        """
+        Find pairs of section rows that share a value for the key (e.g. the same
+        teacher) and whose occupancy masks overlap.
+        
+        Rows are grouped by (key, period slot) first, so masks are only compared
+        within a group. Each clashing section is paired with the first earlier
+        section it overlaps. Rows with no value for the key are skipped.
+        """
+        groups = {}
+        for row in rows:
+            owner = row[key]
+            if owner is None:
+                continue
+            groups.setdefault((owner, row['period__slot']), []).append(row)
         
-        # Check for student conflicts (same student, same period)
-        # Get all students
-        students = Student.objects.prefetch_related('sections')
+        pairs = []
+        for group in groups.values():
+            for position, section in enumerate(group[1:], start=1):
+                for earlier in group[:position]:
+                    if earlier['mask'] & section['mask']:
+                        pairs.append((earlier, section))
+                        break
+        
+        return pairs
+    
+    @staticmethod
+    def build_conflict(conflict_type, first, section, student_name=None):
+        """
+        Build a conflict dictionary for two clashing section rows.
         
-        for student in students:
-            student_sections = student.sections.all()
-            periods_with_sections = {}
+        Args:
+            conflict_type: 'teacher', 'room' or 'student'
+            first: Row of the section that was scheduled first
+            section: Row of the section that clashes with it
+            student_name: Name of the student for student conflicts
             
-            for section in student_sections:
-                if not section.period:
-                    continue
-                    
-                period_id = section.period.id
-                if period_id in periods_with_sections:
-                    # Conflict: Student assigned to multiple sections in the same period
-                    conflict = {
-                        'type': 'student',
-                        'description': f"Student {student.name} assigned to multiple sections in period {section.period.period_name}",
-                        'sections': [
-                            {
-                                'id': periods_with_sections[period_id].id,
-                                'course': periods_with_sections[period_id].course.name if periods_with_sections[period_id].course else "Unassigned",
-                                'period': periods_with_sections[period_id].period.period_name,
-                            },
-                            {
-                                'id': section.id,
-                                'course': section.course.name if section.course else "Unassigned",
-                                'period': section.period.period_name,
-                            }
-                        ],
-                        'student': {
-                            'id': student.id,
-                            'name': student.name
-                        }
-                    }
-                    conflicts.append(conflict)
-                else:
-                    periods_with_sections[period_id] = section
+        Returns:
+            dict: Conflict entry as returned by find_all_conflicts
+        """
+        period_name = section['period__period_name']
         
-        return conflicts
+        if conflict_type == 'teacher':
+            # Conflict: Teacher assigned to multiple sections in the same period
+            return {
+                'type': 'teacher',
+                'description': f"Teacher {section['teacher__name']} assigned to multiple sections in period {period_name}",
+                'sections': [
+                    ConflictService._section_summary(first, 'room'),
+                    ConflictService._section_summary(section, 'room'),
+                ]
+            }
+        
+        if conflict_type == 'room':
+            # Conflict: Room assigned to multiple sections in the same period
+            return {
+                'type': 'room',
+                'description': f"Room {section['room__number']} assigned to multiple sections in period {period_name}",
+                'sections': [
+                    ConflictService._section_summary(first, 'teacher'),
+                    ConflictService._section_summary(section, 'teacher'),
+                ]
+            }
+        
+        # Conflict: Student assigned to multiple sections in the same period
+        return {
+            'type': 'student',
+            'description': f"Student {student_name} assigned to multiple sections in period {period_name}",
+            'sections': [
+                ConflictService._section_summary(first),
+                ConflictService._section_summary(section),
+            ],
+            'student': {
+                'id': section['student_id'],
+                'name': student_name
+            }
+        }
+    
+    @staticmethod
+    def _section_summary(row, extra_field=None):
+        """Build the section dictionary used in conflict entries."""
+        summary = {
+            'id': row['id'],
+            'course': row['course__name'] or "Unassigned",
+            'period': row['period__period_name'],
+        }
+        if extra_field == 'room':
+            summary['room'] = row['room__number'] or "Unassigned"
+        elif extra_field == 'teacher':
+            summary['teacher'] = row['teacher__name'] or "Unassigned"
+        return summary
+    
+    @staticmethod
+    def _find_teacher_conflicts(sections):
+        """Find conflicts where the same teacher is assigned to multiple sections in the same period."""
+        return [
+            ConflictService.build_conflict('teacher', first, section)
+            for first, section in ConflictService.find_overlapping_pairs(sections.values(), 'teacher_id')
+        ]
+    
+    @staticmethod
+    def _find_room_conflicts(sections):
+        """Find conflicts where the same room is assigned to multiple sections in the same period."""
+        return [
+            ConflictService.build_conflict('room', first, section)
+            for first, section in ConflictService.find_overlapping_pairs(sections.values(), 'room_id')
+        ]
+    
+    @staticmethod
+    def _find_student_conflicts(sections):
+        """Find conflicts where students are assigned to multiple sections in the same period."""
+        # Load the whole enrollment table once as (student, section) rows
+        enrollments = Enrollment.objects.values_list(
+            'student_id', 'student__name', 'section_id'
+        ).order_by('student_id', 'section_id')
+        
+        rows, students = ConflictService.student_section_rows(sections, enrollments)
+        
+        return [
+            ConflictService.build_conflict('student', first, section, students[section['student_id']])
+            for first, section in ConflictService.find_overlapping_pairs(rows, 'student_id')
+        ]
     
     @staticmethod
     def check_section_conflicts(section):
         """Check for conflicts for a specific section."""
         conflicts = []
         
+        index = OccupancyIndex()
+        section_mask = index.mask_for_section(section)
+        
+        # Sections that share the period slot and a day are the only candidates for a clash
+        same_slot = Section.objects.none()
+        if section.period:
+            same_slot = Section.objects.filter(
+                period__slot=section.period.slot
+            ).alias(
+                shared_days=F('period__day_mask').bitand(section.period.day_mask)
+            ).exclude(shared_days=0).exclude(id=section.id).select_related('course', 'period')
+        
+        def overlapping(candidates):
+            return [other for other in candidates if index.mask_for_section(other) & section_mask]
+        
         # Check for teacher conflicts
         if section.teacher and section.period:
-            teacher_conflicts = Section.objects.filter(
-                teacher=section.teacher,
-                period=section.period
-            ).exclude(id=section.id)
-            
-            if teacher_conflicts.exists():
-                for conflict in teacher_conflicts:
-                    conflicts.append({
-                        'type': 'teacher',
-                        'message': f"Teacher {section.teacher.name} is already assigned to {conflict.course.name} section {conflict.section_number} during this period"
-                    })
+            for conflict in overlapping(same_slot.filter(teacher=section.teacher)):
+                conflicts.append({
+                    'type': 'teacher',
+                    'message': f"Teacher {section.teacher.name} is already assigned to {conflict.course.name} section {conflict.section_number} during this period"
+                })
+        
+        # Check that the teacher is free on every day the period meets
+        if section.teacher and section.period and not StructuredDataService.available_teachers(
+            section.period
+        ).filter(id=section.teacher_id).exists():
+            conflicts.append({
+                'type': 'availability',
+                'message': f"Teacher {section.teacher.name} is not available during {section.period.period_name}"
+            })
         
         # Check for room conflicts
         if section.room and section.period:
-            room_conflicts = Section.objects.filter(
-                room=section.room,
-                period=section.period
-            ).exclude(id=section.id)
-            
-            if room_conflicts.exists():
-                for conflict in room_conflicts:
-                    conflicts.append({
-                        'type': 'room',
-                        'message': f"Room {section.room.number} is already assigned to {conflict.course.name} section {conflict.section_number} during this period"
-                    })
-        
-        # Check for student conflicts
+            for conflict in overlapping(same_slot.filter(room=section.room)):
+                conflicts.append({
+                    'type': 'room',
+                    'message': f"Room {section.room.number} is already assigned to {conflict.course.name} section {conflict.section_number} during this period"
+                })
+        
+        # Check for student conflicts with one query over this section's students
         student_conflicts = []
         if section.period:
-            for student in section.students.all():
-                other_sections = student.sections.filter(period=section.period).exclude(id=section.id)
-                if other_sections.exists():
-                    student_conflicts.append({
-                        'student': student.name,
-                        'conflicts': [f"{s.course.name} section {s.section_number}" for s in other_sections]
-                    })
+            other_enrollments = Enrollment.objects.filter(
+                student__in=section.students.all(),
+                section__in=same_slot
+            ).select_related('student', 'section', 'section__course', 'section__period').order_by('student__name')
+            
+            conflicts_by_student = {}
+            for enrollment in other_enrollments:
+                other = enrollment.section
+                if index.mask_for_section(other) & section_mask:
+                    conflicts_by_student.setdefault(enrollment.student.name, []).append(
+                        f"{other.course.name} section {other.section_number}"
+                    )
+            
+            for student_name, student_sections in conflicts_by_student.items():
+                student_conflicts.append({
+                    'student': student_name,
+                    'conflicts': student_sections
+                })
         
         if student_conflicts:
             conflicts.append({
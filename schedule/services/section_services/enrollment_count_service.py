@@ -0,0 +1,132 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from ...models import Section, Enrollment
+from ..report_services.data_version_service import DataVersionService
+
+_state = threading.local()
+
+
+class EnrollmentCountService:
+    """
+    Service class for the denormalized Section.enrolled_count column.
+
+    Signal handlers adjust the count when a single enrollment is created or
+    deleted. Bulk operations that bypass model signals (bulk_create) must adjust
+    or recount the affected sections themselves. Every change is an F()
+    expression, so concurrent writers never overwrite each other's counts.
+    """
+
+    @staticmethod
+    def adjust(deltas):
+        """
+        Add to the enrolled counts of sections.
+
+        Sections that change by the same amount are updated together, so a bulk
+        write costs one UPDATE per distinct delta rather than one per section.
+
+        Args:
+            deltas: Mapping of section ID to the change in its enrollment count
+        """
+        pending = getattr(_state, 'pending', None)
+        if pending is not None:
+            pending.update(deltas)
+            return
+
+        by_delta = {}
+        for section_id, delta in deltas.items():
+            if section_id is not None and delta:
+                by_delta.setdefault(delta, []).append(section_id)
+
+        for delta, section_ids in by_delta.items():
+            Section.objects.filter(id__in=section_ids).update(enrolled_count=F('enrolled_count') + delta)
+
+    @staticmethod
+    def enrollments_added(enrollments):
+        """Count bulk-created enrollments against their sections."""
+        EnrollmentCountService.adjust(Counter(enrollment.section_id for enrollment in enrollments))
+
+    @staticmethod
+    def recount(section_ids=None):
+        """
+        Recompute enrolled counts from the Enrollment table in one UPDATE.
+
+        Used where the number of rows written is not known, e.g. after a
+        bulk_create that ignores conflicts.
+
+        Args:
+            section_ids: Sections to recount; all sections when None
+
+        Returns:
+            int: Number of sections updated
+        """
+        sections = Section.objects.all()
+        pending = getattr(_state, 'pending', None)
+        if section_ids is not None:
+            section_ids = list(section_ids)
+            sections = sections.filter(id__in=section_ids)
+            if pending is not None:
+                # The recount already includes any deferred adjustments to these sections
+                for section_id in section_ids:
+                    pending.pop(section_id, None)
+        elif pending is not None:
+            pending.clear()
+
+        counts = Enrollment.objects.filter(section=OuterRef('pk')).order_by().values('section') \
+            .annotate(total=Count('id')).values('total')
+        updated = sections.update(enrolled_count=Coalesce(Subquery(counts), 0))
+        DataVersionService.bump()
+        return updated
+
+    @staticmethod
+    def find_drift():
+        """
+        Compare every stored count with the number of Enrollment rows.
+
+        Returns:
+            list: One dict per mismatched section with its 'id', 'stored' and 'actual' counts
+        """
+        sections = Section.objects.annotate(actual=Count('enrollment')) \
+            .exclude(enrolled_count=F('actual')).order_by('id')
+        return [
+            {'id': section_id, 'stored': stored, 'actual': actual}
+            for section_id, stored, actual in sections.values_list('id', 'enrolled_count', 'actual')
+        ]
+
+    @staticmethod
+    def reconcile():
+        """
+        Repair every section whose stored count has drifted.
+
+        Returns:
+            list: The drift that was found and repaired, as returned by find_drift
+        """
+        drift = EnrollmentCountService.find_drift()
+        if drift:
+            EnrollmentCountService.recount([row['id'] for row in drift])
+        return drift
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """
+        Batch count adjustments until the end of the block.
+
+        Bulk delete paths wrap their work in this so that removing many
+        enrollments, which sends one signal per row, costs one UPDATE per
+        distinct delta instead of one per row.
+        """
+        if getattr(_state, 'pending', None) is not None:
+            # Already deferring: the outermost block flushes
+            yield
+            return
+
+        _state.pending = Counter()
+        try:
+            yield
+        finally:
+            pending, _state.pending = _state.pending, None
+
+        EnrollmentCountService.adjust(pending)
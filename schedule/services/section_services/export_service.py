@@ -1,103 +1,188 @@
 import csv
-from django.http import HttpResponse
-from ...models import Section, Period
+import io
+from django.http import StreamingHttpResponse
+from ...models import Section, Student, Enrollment
+
+# Rows are buffered into chunks of roughly this many characters before being sent
+CHUNK_SIZE = 64 * 1024
+
+# Rows fetched from the database cursor at a time
+FETCH_SIZE = 2000
+
+MASTER_HEADER = ['Period', 'Course', 'Teacher', 'Room', 'Students']
+STUDENT_HEADER = ['Student', 'Grade', 'Period', 'Course', 'Teacher', 'Room']
+ROSTER_HEADER = ['Student ID', 'Name', 'Grade', 'Period', 'Course', 'Teacher', 'Room']
+
+
+def stream_csv(header, rows, chunk_size=CHUNK_SIZE):
+    """
+    Turn rows into CSV text chunks.
+    The header is sent on its own so the first byte goes out before any row query runs.
+
+    Args:
+        header: List of column names
+        rows: Iterable of row lists
+        chunk_size: Approximate number of characters per chunk
+
+    Returns:
+        generator: CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def csv_response(filename, header, rows):
+    """Build a streaming CSV attachment response."""
+    response = StreamingHttpResponse(stream_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _or_unassigned(value):
+    return value if value is not None else "Unassigned"
 
 
 class ExportService:
     """Service class for exporting section and schedule data."""
-    
+
+    @staticmethod
+    def master_schedule_rows():
+        """
+        Generate master schedule rows in two queries.
+        Sections and their enrollments are both read in (period start, period, section) order
+        and merged as they stream, so only one section's student names are held at a time.
+        Sections without a period are left out.
+
+        Returns:
+            generator: CSV rows, with a blank row between periods
+        """
+        order = ('period__start_time', 'period_id', 'id')
+        sections = Section.objects.exclude(period__isnull=True).order_by(*order).values_list(
+            'id', 'period_id', 'period__period_name', 'course__name', 'teacher__name', 'room__number'
+        ).iterator(chunk_size=FETCH_SIZE)
+        enrollments = Enrollment.objects.exclude(section__period__isnull=True).order_by(
+            *[f'section__{field}' for field in order], 'student__name'
+        ).values_list('section_id', 'student__name').iterator(chunk_size=FETCH_SIZE)
+
+        pending = next(enrollments, None)
+        current_period = None
+
+        for section_id, period_id, period_name, course_name, teacher_name, room_number in sections:
+            if current_period is not None and period_id != current_period:
+                # Add a blank row between periods for readability
+                yield []
+            current_period = period_id
+
+            names = []
+            while pending is not None and pending[0] == section_id:
+                names.append(pending[1])
+                pending = next(enrollments, None)
+
+            yield [
+                _or_unassigned(period_name),
+                _or_unassigned(course_name),
+                _or_unassigned(teacher_name),
+                _or_unassigned(room_number),
+                ", ".join(names)
+            ]
+
+        if current_period is not None:
+            yield []
+
+    @staticmethod
+    def student_schedule_rows(students=None, order_by='id', roster=False, separate=True, placeholders=True):
+        """
+        Generate one row per student section in two queries.
+        Students and their enrollments are read in the same order and merged as they stream.
+
+        Args:
+            students: Optional Student queryset to export, defaults to all students
+            order_by: Student field the export is ordered by
+            roster: Use the roster columns (id, name, grade, period id) instead of the
+                    schedule columns (name, grade, period name)
+            separate: Add a blank row after each student with sections
+            placeholders: Add a row for each student with no sections
+
+        Returns:
+            generator: CSV rows
+        """
+        if students is None:
+            students = Student.objects.all()
+
+        student_rows = students.order_by(order_by, 'id').values_list(
+            'id', 'name', 'grade_level'
+        ).iterator(chunk_size=FETCH_SIZE)
+        enrollments = Enrollment.objects.filter(student__in=students).order_by(
+            f'student__{order_by}', 'student_id', 'section__period__start_time', 'section_id'
+        ).values_list(
+            'student_id', 'section__period_id', 'section__period__period_name',
+            'section__course__name', 'section__teacher__name', 'section__room__number'
+        ).iterator(chunk_size=FETCH_SIZE)
+
+        pending = next(enrollments, None)
+
+        for student_id, name, grade_level in student_rows:
+            has_sections = False
+            while pending is not None and pending[0] == student_id:
+                _, period_id, period_name, course_name, teacher_name, room_number = pending
+                has_sections = True
+                if roster:
+                    yield [student_id, name, grade_level, period_id, course_name or '',
+                           teacher_name or '', room_number or '']
+                else:
+                    yield [name, grade_level, _or_unassigned(period_name), _or_unassigned(course_name),
+                           _or_unassigned(teacher_name), _or_unassigned(room_number)]
+                pending = next(enrollments, None)
+
+            if not has_sections:
+                if not placeholders:
+                    continue
+                # Add a row for students with no sections
+                if roster:
+                    yield [student_id, name, grade_level, '', '', '', '']
+                else:
+                    yield [name, grade_level, "No sections assigned", "", "", ""]
+            elif separate:
+                # Add a blank row between students for readability
+                yield []
+
     @staticmethod
     def export_master_schedule():
-        """Export the master schedule to a CSV file."""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="master_schedule.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Period', 'Course', 'Teacher', 'Room', 'Students'])
-        
-        sections = Section.objects.all().select_related('period', 'course', 'teacher', 'room')
-        
-        # Group by period for better organization
-        periods = Period.objects.all().order_by('start_time')
-        
-        for period in periods:
-            period_sections = sections.filter(period=period)
-            
-            if not period_sections.exists():
-                # Skip periods with no sections
-                continue
-            
-            for section in period_sections:
-                students_list = ", ".join([student.name for student in section.students.all()])
-                writer.writerow([
-                    period.period_name if period else "Unassigned",
-                    section.course.name if section.course else "Unassigned",
-                    section.teacher.name if section.teacher else "Unassigned",
-                    section.room.number if section.room else "Unassigned",
-                    students_list
-                ])
-            
-            # Add a blank row between periods for readability
-            writer.writerow([])
-        
-        return response
-    
+        """Export the master schedule as a streamed CSV file."""
+        return csv_response('master_schedule.csv', MASTER_HEADER, ExportService.master_schedule_rows())
+
     @staticmethod
     def export_student_schedules(student=None):
         """
-        Export student schedules to a CSV file.
+        Export student schedules as a streamed CSV file.
         If student is provided, export only that student's schedule.
         Otherwise, export all student schedules.
         """
-        response = HttpResponse(content_type='text/csv')
-        
         if student:
-            # Export a single student's schedule
-            response['Content-Disposition'] = f'attachment; filename="{student.name}_schedule.csv"'
-            writer = csv.writer(response)
-            writer.writerow(['Student', 'Grade', 'Period', 'Course', 'Teacher', 'Room'])
-            
-            sections = student.sections.all().select_related('period', 'course', 'teacher', 'room')
-            
-            for section in sections:
-                writer.writerow([
-                    student.name,
-                    student.grade_level,
-                    section.period.period_name if section.period else "Unassigned",
-                    section.course.name if section.course else "Unassigned",
-                    section.teacher.name if section.teacher else "Unassigned",
-                    section.room.number if section.room else "Unassigned"
-                ])
-        else:
-            # Export all student schedules
-            response['Content-Disposition'] = 'attachment; filename="all_student_schedules.csv"'
-            writer = csv.writer(response)
-            writer.writerow(['Student', 'Grade', 'Period', 'Course', 'Teacher', 'Room'])
-            
-            from ...models import Student
-            students = Student.objects.all().prefetch_related(
-                'sections__period', 'sections__course', 'sections__teacher', 'sections__room'
+            rows = ExportService.student_schedule_rows(
+                Student.objects.filter(pk=student.pk), separate=False, placeholders=False
             )
-            
-            for student in students:
-                sections = student.sections.all()
-                
-                if not sections.exists():
-                    # Add a row for students with no sections
-                    writer.writerow([student.name, student.grade_level, "No sections assigned", "", "", ""])
-                    continue
-                
-                for section in sections:
-                    writer.writerow([
-                        student.name,
-                        student.grade_level,
-                        section.period.period_name if section.period else "Unassigned",
-                        section.course.name if section.course else "Unassigned",
-                        section.teacher.name if section.teacher else "Unassigned",
-                        section.room.number if section.room else "Unassigned"
-                    ])
-                
-                # Add a blank row between students for readability
-                writer.writerow([])
-        
-        return response 
\ No newline at end of file
+            return csv_response(f'{student.name}_schedule.csv', STUDENT_HEADER, rows)
+
+        return csv_response('all_student_schedules.csv', STUDENT_HEADER, ExportService.student_schedule_rows())
+
+    @staticmethod
+    def export_student_roster():
+        """Export every student's sections by name, with period ids, as a streamed CSV file."""
+        rows = ExportService.student_schedule_rows(order_by='name', roster=True, separate=False)
+        return csv_response('student_schedules.csv', ROSTER_HEADER, rows)
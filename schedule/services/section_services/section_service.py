@@ -1,4 +1,4 @@
-from django.db.models import Count, Q
+from django.db.models import Q
 from ...models import Section, Course, Teacher, Room, Period, Student
 
 
@@ -9,9 +9,7 @@ class SectionService:
     def get_all_sections_by_course():
         """Get all sections organized by course."""
         # Get all sections with related data
-        sections = Section.objects.select_related('course', 'teacher', 'period', 'room').annotate(
-            students_count=Count('students')
-        )
+        sections = Section.objects.select_related('course', 'teacher', 'period', 'room')
         
         # Organize sections by course
         sections_by_course = {}
@@ -36,7 +34,7 @@ class SectionService:
                 'period': section.period,
                 'room': section.room,
                 'when': section.get_when_display(),
-                'students_count': section.students_count,
+                'students_count': section.enrolled_count,
                 'max_size': max_size,
                 'exact_size': section.exact_size
             })
@@ -173,5 +171,5 @@ class SectionService:
         return {
             'section': section,
             'students': students,
-            'student_count': students.count()
+            'student_count': section.enrolled_count
         } 
\ No newline at end of file
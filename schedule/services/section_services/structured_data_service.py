@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Trim
+from ...models import Teacher, Course, TeacherAvailability, CourseEligibleTeacher
+from ...utils.availability_utils import parse_availability
+from ...utils.occupancy_utils import DAY_CODES
+
+
+class StructuredDataService:
+    """
+    Service class for the structured copies of free-text scheduling fields.
+
+    Teacher.availability is stored as TeacherAvailability rows, Course.eligible_teachers
+    as CourseEligibleTeacher rows and Period.days as Period.day_mask. The text fields
+    stay the source of truth; these copies are refreshed when the text is saved or
+    imported, so schedulers and filters can query them instead of re-parsing strings.
+    """
+
+    @staticmethod
+    def sync_teacher_availability(teacher_ids):
+        """
+        Replace the availability rows of the given teachers from their availability text.
+
+        Args:
+            teacher_ids: IDs of the teachers to refresh
+
+        Returns:
+            int: Number of availability rows written
+        """
+        teacher_ids = list(teacher_ids)
+        if not teacher_ids:
+            return 0
+
+        rows = []
+        for teacher_id, availability in Teacher.objects.filter(id__in=teacher_ids).values_list('id', 'availability'):
+            # Blank text means no restrictions and unreadable text means never available;
+            # both write no rows, and get_teacher_availability tells them apart by the text
+            slots = parse_availability(availability) or set()
+            rows.extend(
+                TeacherAvailability(teacher_id=teacher_id, day=day, slot=slot)
+                for day, slot in sorted(slots)
+            )
+
+        with transaction.atomic():
+            TeacherAvailability.objects.filter(teacher_id__in=teacher_ids).delete()
+            TeacherAvailability.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+    @staticmethod
+    def sync_course_eligibility(course_ids):
+        """
+        Replace the eligible teacher rows of the given courses from their eligible_teachers text.
+
+        Args:
+            course_ids: IDs of the courses to refresh
+
+        Returns:
+            int: Number of eligibility rows written
+        """
+        course_ids = list(course_ids)
+        if not course_ids:
+            return 0
+
+        rows = []
+        for course_id, eligible in Course.objects.filter(id__in=course_ids).values_list('id', 'eligible_teachers'):
+            teacher_ids = [teacher_id.strip() for teacher_id in (eligible or '').split('|') if teacher_id.strip()]
+            rows.extend(
+                CourseEligibleTeacher(course_id=course_id, teacher_id=teacher_id, position=position)
+                for position, teacher_id in enumerate(dict.fromkeys(teacher_ids))
+            )
+
+        with transaction.atomic():
+            CourseEligibleTeacher.objects.filter(course_id__in=course_ids).delete()
+            CourseEligibleTeacher.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+    @staticmethod
+    def rebuild():
+        """
+        Rebuild every structured copy from the text fields.
+
+        Returns:
+            dict: Number of availability and eligibility rows written
+        """
+        return {
+            'availability_rows': StructuredDataService.sync_teacher_availability(
+                Teacher.objects.values_list('id', flat=True)
+            ),
+            'eligibility_rows': StructuredDataService.sync_course_eligibility(
+                Course.objects.values_list('id', flat=True)
+            ),
+        }
+
+    @staticmethod
+    def get_teacher_availability():
+        """
+        Get every teacher's availability in the form parse_availability returns.
+
+        Only a blank availability text means no restrictions. A teacher whose
+        text has no rows (e.g. one left unreadable by an old import) gets an
+        empty set, so schedulers never place them rather than placing them anywhere.
+
+        Returns:
+            dict: Teacher ID to a set of (day, slot) pairs, or None for teachers with no restrictions
+        """
+        availability = {
+            teacher_id: None if not text.strip() else set()
+            for teacher_id, text in Teacher.objects.values_list('id', 'availability')
+        }
+        for teacher_id, day, slot in TeacherAvailability.objects.values_list('teacher_id', 'day', 'slot'):
+            if availability.get(teacher_id) is not None:
+                availability[teacher_id].add((day, slot))
+        return availability
+
+    @staticmethod
+    def get_eligible_teachers():
+        """
+        Get every course's eligible teacher IDs, in the order they are listed.
+
+        Returns:
+            dict: Course ID to a list of teacher IDs, for courses that list any
+        """
+        eligible = {}
+        for course_id, teacher_id in CourseEligibleTeacher.objects.values_list('course_id', 'teacher_id'):
+            eligible.setdefault(course_id, []).append(teacher_id)
+        return eligible
+
+    @staticmethod
+    def available_teachers(period):
+        """
+        Get the teachers free on every day a period meets, in one query.
+
+        Args:
+            period: Period
+
+        Returns:
+            QuerySet: Teachers with a blank availability or with a row for each of the period's days
+        """
+        days = [day for bit, day in enumerate(DAY_CODES) if period.day_mask & (1 << bit)]
+        return Teacher.objects.annotate(
+            availability_text=Trim('availability'),
+            free_days=Count('availability_slots', filter=Q(
+                availability_slots__slot=str(period.slot), availability_slots__day__in=days
+            ))
+        ).filter(Q(availability_text='') | Q(free_days=len(days)))
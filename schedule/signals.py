@@ -0,0 +1,107 @@
+"""
+Signal handlers that keep the conflict index (ScheduleConflict), the
+section enrollment counts and the data version up to date.
+
+Each handler refreshes only the teachers, rooms and students affected by the
+write. Bulk operations that bypass model signals (bulk_create, queryset
+update) must refresh the index themselves through ConflictIndexService, the
+counts through EnrollmentCountService and the version through DataVersionService.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Enrollment, Section, Period, Teacher, Room, Student, Course, CourseEnrollment, SectionSettings
+from .services.section_services.conflict_index_service import ConflictIndexService
+from .services.section_services.enrollment_count_service import EnrollmentCountService
+from .services.section_services.structured_data_service import StructuredDataService
+from .services.report_services.data_version_service import DataVersionService
+
+# Models the admin reports are built from; writing any of them bumps the data version
+REPORTED_MODELS = (Student, Teacher, Room, Course, Period, Section, Enrollment, CourseEnrollment, SectionSettings)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed(sender, instance, **kwargs):
+    """Recompute the student's conflicts when they join or leave a section."""
+    ConflictIndexService.refresh_students([instance.student_id])
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, created, **kwargs):
+    """Count a new enrollment against its section."""
+    if created:
+        EnrollmentCountService.adjust({instance.section_id: 1})
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    """Stop counting a removed enrollment against its section."""
+    EnrollmentCountService.adjust({instance.section_id: -1})
+
+
+@receiver(post_save, sender=Section)
+def section_saved(sender, instance, **kwargs):
+    """Recompute conflicts for everyone using a section whose period, teacher or room may have changed."""
+    ConflictIndexService.refresh_sections([instance.id])
+
+
+@receiver(post_delete, sender=Section)
+def section_deleted(sender, instance, **kwargs):
+    """
+    Recompute conflicts for the deleted section's teacher and room.
+
+    Its students are refreshed by the cascaded enrollment deletes, so this runs
+    no queries of its own inside ConflictIndexService.deferred().
+    """
+    ConflictIndexService.refresh_teachers([instance.teacher_id])
+    ConflictIndexService.refresh_rooms([instance.room_id])
+
+
+@receiver(post_save, sender=Period)
+def period_saved(sender, instance, created, **kwargs):
+    """Recompute conflicts for every section in a period whose slot or days may have changed."""
+    if created:
+        return
+    ConflictIndexService.refresh_sections(
+        list(Section.objects.filter(period=instance).values_list('id', flat=True))
+    )
+
+
+@receiver(post_delete, sender=Teacher)
+def teacher_deleted(sender, instance, **kwargs):
+    """Drop conflicts for a deleted teacher (their sections are unassigned without signals)."""
+    ConflictIndexService.remove_resource('teacher', instance.id)
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(sender, instance, **kwargs):
+    """Drop conflicts for a deleted room (its sections are unassigned without signals)."""
+    ConflictIndexService.remove_resource('room', instance.id)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    """Drop conflicts for a deleted student."""
+    ConflictIndexService.remove_resource('student', instance.id)
+
+
+@receiver(post_save, sender=Teacher)
+def teacher_saved(sender, instance, **kwargs):
+    """Re-parse a teacher's availability into availability rows."""
+    StructuredDataService.sync_teacher_availability([instance.id])
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, **kwargs):
+    """Re-parse a course's eligible teachers into eligibility rows."""
+    StructuredDataService.sync_course_eligibility([instance.id])
+
+
+def data_changed(sender, **kwargs):
+    """Bump the data version so cached report snapshots are rebuilt; once per transaction, on commit."""
+    DataVersionService.bump()
+
+
+for model in REPORTED_MODELS:
+    post_save.connect(data_changed, sender=model, dispatch_uid=f'data_changed_save_{model.__name__}')
+    post_delete.connect(data_changed, sender=model, dispatch_uid=f'data_changed_delete_{model.__name__}')
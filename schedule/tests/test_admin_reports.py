@@ -1,6 +1,12 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse
-from schedule.models import Student, Section, Course, Period, Teacher, Enrollment
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from schedule.models import Student, Section, Course, Period, Teacher, Enrollment, SectionSettings
+from schedule.services.enrollment_services.enrollment_unit_of_work import EnrollmentUnitOfWork
+from schedule.services.report_services.admin_report_service import AdminReportService
+from schedule.services.report_services.data_version_service import DataVersionService
 import datetime
 
 
@@ -8,6 +14,7 @@ class AdminReportsTest(TestCase):
     def setUp(self):
         """Set up test data for admin reports tests"""
         self.client = Client()
+        cache.clear()
         
         # Create test students in different grades
         self.student1 = Student.objects.create(
@@ -178,4 +185,95 @@ class AdminReportsTest(TestCase):
         
         # Check that the chart data values are included
         self.assertContains(response, '2,')  # 2 students in grade 9
-        self.assertContains(response, '1,')  # 1 student in grade 10 
\ No newline at end of file
+        self.assertContains(response, '1,')  # 1 student in grade 10 
+
+
+# Writes really commit here, so the data version moves as it does for a request
+class AdminReportSnapshotTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M", slot="1",
+            start_time=datetime.time(8, 0), end_time=datetime.time(9, 0)
+        )
+        self.course = Course.objects.create(
+            id="MATH101", name="Algebra I", type="core", grade_level=9, max_students=30
+        )
+        self.teacher = Teacher.objects.create(id="T001", name="Mr. Smith", availability="", subjects="Math")
+        self.section = Section.objects.create(
+            id="MATH101-1", course=self.course, section_number=1, teacher=self.teacher, period=self.period
+        )
+        self.students = [
+            Student.objects.create(id=f"S{n:03d}", name=f"Student {n}", grade_level=9, preferences="")
+            for n in range(1, 4)
+        ]
+        SectionSettings.objects.create(name="Default", core_min_size=2, enforce_min_sizes=True)
+
+    def load(self):
+        return AdminReportService.get_report()
+
+    def test_cold_load_uses_grouped_queries(self):
+        """A cold report costs a fixed handful of queries however much data there is."""
+        with self.assertNumQueries(11):
+            report = self.load()
+
+        self.assertEqual(report['enrollment_by_grade'], {9: 3})
+        self.assertEqual(report['course_enrollment']['MATH101']['total_sections'], 1)
+        self.assertEqual(report['teacher_load']['T001']['courses'], ["Algebra I"])
+        self.assertEqual(report['section_stats']['sections_below_min'], 1)
+        self.assertEqual([row[1:] for row in report['sections_below_min']], [(0, 2)])
+
+    def test_repeat_load_reads_snapshot(self):
+        """A repeat load with no writes in between only reads the version before using the cached snapshot."""
+        first = self.load()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.load(), first)
+
+    def test_writes_invalidate_snapshot(self):
+        """Single and bulk writes both bump the data version, so the next load is rebuilt."""
+        self.load()
+        Enrollment.objects.create(student=self.students[0], section=self.section)
+        self.assertEqual(self.load()['course_enrollment']['MATH101']['total_students'], 1)
+
+        with EnrollmentUnitOfWork() as work:
+            work.add("S002", "MATH101-1")
+            work.add("S003", "MATH101-1")
+        report = self.load()
+        self.assertEqual(report['teacher_load']['T001']['total_students'], 3)
+        self.assertEqual(report['sections_below_min'], [])
+
+    def test_rolled_back_snapshot_is_not_cached(self):
+        """A report built from writes that are rolled back is never stored."""
+        self.load()
+        with transaction.atomic():
+            Enrollment.objects.create(student=self.students[0], section=self.section)
+            self.assertEqual(AdminReportService.get_report()['course_enrollment']['MATH101']['total_students'], 1)
+            transaction.set_rollback(True)
+
+        self.assertEqual(self.load()['course_enrollment']['MATH101']['total_students'], 0)
+
+    def test_write_from_another_process_invalidates_snapshot(self):
+        """A write made where this process's cache is not visible still invalidates its snapshot."""
+        self.load()
+
+        # A separate local-memory cache stands in for another web process or the import worker
+        other_process = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                     'LOCATION': 'other-process'}}
+        with override_settings(CACHES=other_process):
+            Enrollment.objects.create(student=self.students[0], section=self.section)
+
+        self.assertEqual(self.load()['course_enrollment']['MATH101']['total_students'], 1)
+
+    def test_bulk_delete_bumps_version_once(self):
+        """Deleting many rows, which sends a signal per row, moves the version once when the delete commits."""
+        for student in self.students:
+            Enrollment.objects.create(student=student, section=self.section)
+        version = DataVersionService.current()
+
+        with CaptureQueriesContext(connection) as queries:
+            Enrollment.objects.filter(section=self.section).delete()
+
+        bumps = [query for query in queries if query['sql'].startswith('UPDATE "schedule_dataversion"')]
+        self.assertEqual(len(bumps), 1)
+        self.assertEqual(DataVersionService.current(), version + 1)
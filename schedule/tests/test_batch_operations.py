@@ -0,0 +1,111 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Course, CourseEnrollment, Enrollment, Period, Section, Student
+from ..services.enrollment_services.batch_operations_service import BatchOperationsService
+from ..services.section_services.conflict_index_service import ConflictIndexService
+
+
+class BatchOperationsTest(TestCase):
+    def setUp(self):
+        self.period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        self.course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.section = Section.objects.create(
+            id="MATH6-1", course=self.course, section_number=1, period=self.period, max_size=3
+        )
+        Student.objects.bulk_create([
+            Student(id=f"S{n:03d}", name=f"Student {n}", grade_level=6, preferences="") for n in range(1, 51)
+        ])
+
+    def count_queries(self, func, *args):
+        with CaptureQueriesContext(connection) as queries:
+            result = func(*args)
+        return result, len(queries)
+
+    def test_bulk_enroll_report(self):
+        """Already enrolled, unknown and over-capacity students are reported per student."""
+        Enrollment.objects.create(student_id="S001", section=self.section)
+
+        result = BatchOperationsService.bulk_enroll_students_in_sections(
+            ["S001", "S002", "NOPE", "S003", "S004"], "MATH6-1"
+        )
+
+        self.assertEqual((result['success_count'], result['error_count']), (2, 3))
+        self.assertEqual(result['errors'], [
+            "Student Student 1 is already enrolled in this section",
+            "Error processing student ID NOPE: No Student matches the given query.",
+            "Section is at capacity (3 students)",
+        ])
+        self.assertEqual(result['message'], "Enrolled 2 students in Math 6 section 1")
+        self.assertEqual(self.section.students.count(), 3)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_bulk_enroll_constant_queries(self):
+        """Enrolling many students costs the same number of queries as enrolling a few."""
+        Section.objects.filter(pk="MATH6-1").update(max_size=None)
+
+        _, few = self.count_queries(BatchOperationsService.bulk_enroll_students_in_sections, ["S001", "S002"], "MATH6-1")
+        Enrollment.objects.all().delete()
+        result, many = self.count_queries(
+            BatchOperationsService.bulk_enroll_students_in_sections,
+            [f"S{n:03d}" for n in range(1, 51)], "MATH6-1"
+        )
+
+        self.assertEqual(result['success_count'], 50)
+        self.assertEqual(few, many)
+
+    def test_enroll_grade_in_course(self):
+        """A grade is enrolled with one insert, skipping students already in the course."""
+        CourseEnrollment.objects.create(student_id="S010", course=self.course)
+        Student.objects.create(id="S999", name="Other Grade", grade_level=7, preferences="")
+
+        result, queries = self.count_queries(BatchOperationsService.enroll_grade_in_course, 6, "MATH6")
+
+        self.assertEqual((result['success_count'], result['error_count']), (49, 1))
+        self.assertEqual(result['errors'], ["Student Student 10 is already enrolled in Math 6"])
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 50)
+        self.assertFalse(CourseEnrollment.objects.filter(student_id="S999").exists())
+        self.assertLessEqual(queries, 5)
+
+    def test_clear_enrollments(self):
+        """Enrollments are cleared with one filtered delete and unknown students reported."""
+        Section.objects.filter(pk="MATH6-1").update(max_size=None)
+        BatchOperationsService.bulk_enroll_students_in_sections([f"S{n:03d}" for n in range(1, 21)], "MATH6-1")
+
+        result = BatchOperationsService.clear_all_enrollments_for_students(["S001", "S002", "NOPE"])
+
+        self.assertEqual((result['success_count'], result['error_count']), (2, 1))
+        self.assertEqual(Enrollment.objects.count(), 18)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_clear_enrollments_constant_queries(self):
+        """Clearing many enrollments costs the same number of queries as clearing a few."""
+        Section.objects.filter(pk="MATH6-1").update(max_size=None)
+        BatchOperationsService.bulk_enroll_students_in_sections([f"S{n:03d}" for n in range(1, 51)], "MATH6-1")
+
+        _, few = self.count_queries(BatchOperationsService.clear_all_enrollments_for_students, ["S001", "S002"])
+        _, many = self.count_queries(
+            BatchOperationsService.clear_all_enrollments_for_students, [f"S{n:03d}" for n in range(3, 51)]
+        )
+
+        self.assertEqual(few, many)
+        self.assertFalse(Enrollment.objects.exists())
+        self.assertEqual(Section.objects.get(pk="MATH6-1").enrolled_count, 0)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_clear_by_grade_constant_queries(self):
+        """Clearing a grade from a section costs the same number of queries however many students it has."""
+        Section.objects.filter(pk="MATH6-1").update(max_size=None)
+        Student.objects.filter(id__in=["S001", "S002"]).update(grade_level=7)
+        BatchOperationsService.bulk_enroll_students_in_sections([f"S{n:03d}" for n in range(1, 51)], "MATH6-1")
+
+        result, few = self.count_queries(BatchOperationsService.clear_section_enrollments_by_grade, "MATH6-1", 7)
+        self.assertEqual(result['count'], 2)
+        result, many = self.count_queries(BatchOperationsService.clear_section_enrollments_by_grade, "MATH6-1", 6)
+        self.assertEqual(result['count'], 48)
+
+        self.assertEqual(few, many)
+        self.assertEqual(Section.objects.get(pk="MATH6-1").enrolled_count, 0)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
@@ -0,0 +1,54 @@
+"""
+Benchmark tests. The suite itself only runs when RUN_BENCHMARKS is set, e.g.
+
+    RUN_BENCHMARKS=1 BENCHMARK_BASELINE=baseline.json python manage.py test schedule.tests.test_benchmarks
+"""
+import os
+import unittest
+from django.test import TestCase
+from ..models import Section, Student
+from ..services.benchmark_services.benchmark_suite_service import BENCHMARKS, BenchmarkSuiteService
+
+
+def results_for(**measurements):
+    return {'sizes': {'small': {'dataset': {}, 'results': {
+        name: {'seconds': seconds, 'queries': queries, 'peak_kb': peak_kb}
+        for name, (seconds, queries, peak_kb) in measurements.items()
+    }}}}
+
+
+class BenchmarkCompareTest(TestCase):
+    def test_compare_flags_regressions(self):
+        """Extra queries, real slowdowns and memory growth are flagged; noise is not."""
+        baseline = results_for(a=(1.0, 10, 100), b=(0.01, 5, 100), c=(1.0, 3, 100))
+        results = results_for(a=(1.1, 11, 100), b=(0.03, 5, 100), c=(2.0, 3, 200), d=(9.0, 99, 999))
+
+        regressions = BenchmarkSuiteService.compare(results, baseline, tolerance=0.25)
+
+        self.assertEqual(
+            [(r['name'], r['metric']) for r in regressions],
+            [('a', 'queries'), ('c', 'seconds'), ('c', 'peak_kb')]
+        )
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run the benchmark suite")
+class BenchmarkSuiteTest(TestCase):
+    def test_small_suite(self):
+        """Every benchmark runs on the small dataset and the data is rolled back."""
+        results = BenchmarkSuiteService.run(sizes=['small'])
+        measured = results['sizes']['small']['results']
+
+        for name, _, _ in BENCHMARKS:
+            self.assertIn(name, measured)
+        self.assertIn('import.sections', measured)
+        self.assertFalse(Student.objects.exists() or Section.objects.exists())
+
+        # Paths that should not scale their query count with the data
+        self.assertLessEqual(measured['conflicts.find_all_conflicts']['queries'], 2)
+        self.assertLessEqual(measured['export.master_schedule']['queries'], 2)
+        self.assertLessEqual(measured['export.student_schedules']['queries'], 2)
+
+        baseline_path = os.environ.get('BENCHMARK_BASELINE')
+        if baseline_path:
+            regressions = BenchmarkSuiteService.compare(results, BenchmarkSuiteService.load(baseline_path))
+            self.assertEqual(regressions, [])
@@ -0,0 +1,72 @@
+import threading
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from ..models import Course, Enrollment, Period, Section, Student
+from ..services.enrollment_services.enrollment_service import EnrollmentService
+
+THREADS = 24
+CAPACITY = 10
+
+
+class EnrollmentCapacityTest(TestCase):
+    def setUp(self):
+        period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.section = Section.objects.create(id="MATH6-1", course=course, section_number=1, period=period, max_size=1)
+        for n in (1, 2):
+            Student.objects.create(id=f"S{n}", name=f"Student {n}", grade_level=6, preferences="")
+
+    def test_capacity_and_duplicates(self):
+        """A full section and a repeat enrollment are both refused."""
+        self.assertTrue(EnrollmentService.enroll_student_in_section("S1", "MATH6-1")['success'])
+
+        again = EnrollmentService.enroll_student_in_section("S1", "MATH6-1")
+        full = EnrollmentService.enroll_student_in_section("S2", "MATH6-1")
+
+        self.assertEqual(again['message'], "Student Student 1 is already enrolled in this section")
+        self.assertEqual(full['message'], "Section is at capacity (1 students)")
+        self.assertEqual(self.section.students.count(), 1)
+
+
+class ConcurrentEnrollmentTest(TransactionTestCase):
+    def setUp(self):
+        period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.section = Section.objects.create(
+            id="MATH6-1", course=course, section_number=1, period=period, max_size=CAPACITY
+        )
+        Student.objects.bulk_create([
+            Student(id=f"S{n:03d}", name=f"Student {n}", grade_level=6, preferences="") for n in range(THREADS)
+        ])
+
+    def test_many_threads_one_section(self):
+        """Students enrolling from many threads at once never push a section past capacity."""
+        results = []
+        barrier = threading.Barrier(THREADS)
+
+        def enroll(student_id):
+            try:
+                barrier.wait()
+                results.append(EnrollmentService.enroll_student_in_section(student_id, "MATH6-1"))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=enroll, args=(f"S{n:03d}",)) for n in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        successes = [result for result in results if result['success']]
+        refusals = {result['message'] for result in results if not result['success']}
+        enrolled = Enrollment.objects.filter(section=self.section).count()
+
+        self.assertEqual(len(results), THREADS)
+        self.assertLessEqual(enrolled, CAPACITY)
+        self.assertEqual(len(successes), enrolled)
+        self.assertGreater(enrolled, 0)
+        self.assertLessEqual(refusals, {f"Section is at capacity ({CAPACITY} students)", "Section is busy, please try again"})
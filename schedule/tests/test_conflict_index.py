@@ -0,0 +1,158 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Course, Teacher, Room, Period, Section, Student, Enrollment, ScheduleConflict
+from ..services.section_services.conflict_index_service import ConflictIndexService
+from ..services.section_services.enrollment_count_service import EnrollmentCountService
+
+
+class ConflictIndexTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            id="MATH101", name="Mathematics 101", type="core", grade_level=9, sections_needed=2
+        )
+        self.teacher = Teacher.objects.create(id="T1", name="John Smith", availability="", subjects="Math")
+        self.room = Room.objects.create(id="R101", number="101", capacity=30, type="classroom")
+        self.period1 = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1",
+            start_time="08:00", end_time="09:00"
+        )
+        self.period2 = Period.objects.create(
+            id="P2", period_name="Period 2", days="M|T|W|TH|F", slot="2",
+            start_time="09:05", end_time="10:00"
+        )
+        self.student = Student.objects.create(id="S001", name="Jane Doe", grade_level=9, preferences="")
+
+        self.first = Section.objects.create(
+            id="MATH101-1", course=self.course, section_number=1,
+            teacher=self.teacher, room=self.room, period=self.period1
+        )
+        self.second = Section.objects.create(
+            id="MATH101-2", course=self.course, section_number=2, period=self.period2
+        )
+
+    def assert_index_consistent(self):
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_enrollment_changes_update_index(self):
+        """Student conflicts appear and disappear as enrollments change."""
+        Enrollment.objects.create(student=self.student, section=self.first)
+        Enrollment.objects.create(student=self.student, section=self.second)
+        self.assertEqual(ScheduleConflict.objects.count(), 0)
+
+        self.second.period = self.period1
+        self.second.save()
+        self.assertEqual(
+            sorted(ScheduleConflict.objects.values_list('conflict_type', flat=True)), ['student']
+        )
+        self.assert_index_consistent()
+
+        Enrollment.objects.filter(student=self.student, section=self.second).delete()
+        self.assertEqual(ScheduleConflict.objects.count(), 0)
+        self.assert_index_consistent()
+
+    def test_section_changes_update_index(self):
+        """Moving or deleting sections refreshes teacher and room conflicts."""
+        third = Section.objects.create(
+            id="MATH101-3", course=self.course, section_number=3,
+            teacher=self.teacher, room=self.room, period=self.period1
+        )
+        self.assertEqual(
+            sorted(ScheduleConflict.objects.values_list('conflict_type', flat=True)), ['room', 'teacher']
+        )
+
+        # A fourth clashing section stays hidden behind the first until that one is deleted
+        fourth = Section.objects.create(
+            id="MATH101-4", course=self.course, section_number=4,
+            teacher=self.teacher, period=self.period1
+        )
+        self.assertEqual(ScheduleConflict.objects.count(), 3)
+        self.first.delete()
+        self.assertEqual(
+            list(ScheduleConflict.objects.values_list('conflict_type', 'section_id', 'other_section_id')),
+            [('teacher', third.id, fourth.id)]
+        )
+        self.assert_index_consistent()
+
+        third.teacher = None
+        third.save()
+        self.assertEqual(ScheduleConflict.objects.count(), 0)
+        self.assert_index_consistent()
+
+    def test_period_edit_updates_index(self):
+        """Changing a period's slot re-evaluates the sections in it."""
+        Section.objects.create(
+            id="MATH101-3", course=self.course, section_number=3,
+            teacher=self.teacher, period=self.period2
+        )
+        self.assertEqual(ScheduleConflict.objects.count(), 0)
+
+        self.period2.slot = "1"
+        self.period2.save()
+        self.assertEqual(list(ScheduleConflict.objects.values_list('conflict_type', flat=True)), ['teacher'])
+        self.assert_index_consistent()
+
+    def test_get_conflicts_matches_full_scan_shape(self):
+        """The index returns conflicts in the same shape as the full scan."""
+        Section.objects.create(
+            id="MATH101-3", course=self.course, section_number=3,
+            teacher=self.teacher, period=self.period1
+        )
+        conflicts = ConflictIndexService.get_conflicts()
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0]['type'], 'teacher')
+        self.assertEqual([s['id'] for s in conflicts[0]['sections']], ["MATH101-1", "MATH101-3"])
+
+    def test_deferred_batches_refreshes(self):
+        """Writes inside deferred() are indexed once the block ends."""
+        with ConflictIndexService.deferred():
+            Section.objects.create(
+                id="MATH101-3", course=self.course, section_number=3,
+                teacher=self.teacher, period=self.period1
+            )
+            self.assertEqual(ScheduleConflict.objects.count(), 0)
+        self.assertEqual(ScheduleConflict.objects.count(), 1)
+
+    def test_deferred_section_deletes_cost_constant_queries(self):
+        """Deleting many clashing sections inside the deferred blocks costs the same as deleting a few."""
+        Enrollment.objects.create(student=self.student, section=self.first)
+        with ConflictIndexService.deferred():
+            for number in range(3, 43):
+                section = Section.objects.create(
+                    id=f"MATH101-{number}", course=self.course, section_number=number,
+                    teacher=self.teacher, room=self.room, period=self.period1
+                )
+                Enrollment.objects.create(student=self.student, section=section)
+        self.assertTrue(ScheduleConflict.objects.filter(conflict_type='student').exists())
+
+        def delete_sections(numbers):
+            with CaptureQueriesContext(connection) as queries:
+                with ConflictIndexService.deferred(), EnrollmentCountService.deferred():
+                    Section.objects.filter(id__in=[f"MATH101-{number}" for number in numbers]).delete()
+            return len(queries)
+
+        few = delete_sections(range(3, 6))
+        self.assert_index_consistent()
+        many = delete_sections(range(6, 40))
+
+        self.assertEqual(few, many)
+        self.assertEqual(Section.objects.filter(period=self.period1).count(), 4)
+        self.assert_index_consistent()
+
+    def test_rebuild_command(self):
+        """The management command detects drift and rebuilds the index."""
+        Section.objects.filter(id=self.second.id).update(teacher=self.teacher, period=self.period1)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_conflict_index', '--check', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_conflict_index', stdout=out)
+        self.assertIn("1 conflicts", out.getvalue())
+
+        out = StringIO()
+        call_command('rebuild_conflict_index', '--check', stdout=out)
+        self.assertIn("consistent", out.getvalue())
@@ -0,0 +1,190 @@
+from django.test import TestCase
+from ..models import Course, Teacher, Room, Period, Section, Student, Enrollment
+from ..services.section_services.conflict_service import ConflictService
+from ..utils.occupancy_utils import OccupancyIndex, day_mask, masks_overlap
+
+
+class ConflictServiceTest(TestCase):
+    def setUp(self):
+        # Create shared test data
+        self.course = Course.objects.create(
+            id="MATH101",
+            name="Mathematics 101",
+            type="core",
+            grade_level=9,
+            sections_needed=2
+        )
+
+        self.teacher = Teacher.objects.create(
+            id="T1",
+            name="John Smith",
+            availability="",
+            subjects="Math"
+        )
+
+        self.room = Room.objects.create(
+            id="R101",
+            number="101",
+            capacity=30,
+            type="classroom"
+        )
+
+        self.period1 = Period.objects.create(
+            id="P1",
+            period_name="Period 1",
+            days="M|T|W|TH|F",
+            slot="1",
+            start_time="08:00",
+            end_time="09:00"
+        )
+
+        self.period2 = Period.objects.create(
+            id="P2",
+            period_name="Period 2",
+            days="M|T|W|TH|F",
+            slot="2",
+            start_time="09:05",
+            end_time="10:00"
+        )
+
+        self.student = Student.objects.create(
+            id="S001",
+            name="Jane Doe",
+            grade_level=9,
+            preferences=""
+        )
+
+    def create_section(self, section_id, period, teacher=None, room=None):
+        return Section.objects.create(
+            id=section_id,
+            course=self.course,
+            section_number=int(section_id.split('-')[-1]),
+            teacher=teacher,
+            room=room,
+            period=period
+        )
+
+    def test_no_conflicts(self):
+        """Sections in different periods do not conflict."""
+        first = self.create_section("MATH101-1", self.period1, self.teacher, self.room)
+        second = self.create_section("MATH101-2", self.period2, self.teacher, self.room)
+        Enrollment.objects.create(student=self.student, section=first)
+        Enrollment.objects.create(student=self.student, section=second)
+
+        self.assertEqual(ConflictService.find_all_conflicts(), [])
+
+    def test_teacher_room_and_student_conflicts(self):
+        """Teacher, room and student clashes are all reported in order."""
+        first = self.create_section("MATH101-1", self.period1, self.teacher, self.room)
+        second = self.create_section("MATH101-2", self.period1, self.teacher, self.room)
+        Enrollment.objects.create(student=self.student, section=first)
+        Enrollment.objects.create(student=self.student, section=second)
+
+        conflicts = ConflictService.find_all_conflicts()
+
+        self.assertEqual([c['type'] for c in conflicts], ['teacher', 'room', 'student'])
+        self.assertEqual([s['id'] for s in conflicts[0]['sections']], ["MATH101-1", "MATH101-2"])
+        self.assertEqual(conflicts[0]['sections'][0]['room'], "101")
+        self.assertEqual(conflicts[1]['sections'][0]['teacher'], "John Smith")
+        self.assertEqual(conflicts[2]['student'], {'id': "S001", 'name': "Jane Doe"})
+
+    def test_query_count_is_fixed(self):
+        """The number of queries does not grow with the amount of data."""
+        for number in range(1, 6):
+            section = self.create_section(f"MATH101-{number}", self.period1, self.teacher, self.room)
+            student = Student.objects.create(
+                id=f"S1{number:02d}",
+                name=f"Student {number}",
+                grade_level=9,
+                preferences=""
+            )
+            Enrollment.objects.create(student=student, section=section)
+            Enrollment.objects.create(student=self.student, section=section)
+
+        with self.assertNumQueries(2):
+            conflicts = ConflictService.find_all_conflicts()
+
+        self.assertEqual(len(conflicts), 12)
+
+    def test_different_trimesters_do_not_conflict(self):
+        """Sections in the same period but different trimesters share a teacher and student safely."""
+        first = self.create_section("MATH101-1", self.period1, self.teacher, self.room)
+        second = self.create_section("MATH101-2", self.period1, self.teacher, self.room)
+        Section.objects.filter(id=first.id).update(when='t1')
+        Section.objects.filter(id=second.id).update(when='t2')
+        Enrollment.objects.create(student=self.student, section=first)
+        Enrollment.objects.create(student=self.student, section=second)
+
+        self.assertEqual(ConflictService.find_all_conflicts(), [])
+
+        first.refresh_from_db()
+        self.assertFalse(ConflictService.check_section_conflicts(first)['has_conflicts'])
+
+    def test_year_section_conflicts_with_trimester_section(self):
+        """A full-year section overlaps every trimester in the same period."""
+        first = self.create_section("MATH101-1", self.period1, self.teacher)
+        second = self.create_section("MATH101-2", self.period1, self.teacher)
+        Section.objects.filter(id=second.id).update(when='t3')
+
+        conflicts = ConflictService.find_all_conflicts()
+        self.assertEqual([c['type'] for c in conflicts], ['teacher'])
+
+        result = ConflictService.check_section_conflicts(first)
+        self.assertEqual([c['type'] for c in result['conflicts']], ['teacher'])
+
+    def test_same_slot_on_different_days_do_not_conflict(self):
+        """Periods sharing a slot only clash on the days they have in common."""
+        monday = Period.objects.create(
+            id="P1M", period_name="Period 1 (Mon)", days="M|W", slot="1",
+            start_time="08:00", end_time="09:00"
+        )
+        tuesday = Period.objects.create(
+            id="P1T", period_name="Period 1 (Tue)", days="T|TH", slot="1",
+            start_time="08:00", end_time="09:00"
+        )
+        self.create_section("MATH101-1", monday, self.teacher)
+        self.create_section("MATH101-2", tuesday, self.teacher)
+        self.create_section("MATH101-3", self.period1, self.teacher)
+
+        # The Monday and Tuesday sections never meet together; the every-day
+        # section clashes and is paired with the first section it overlaps
+        conflicts = ConflictService.find_all_conflicts()
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual([s['id'] for s in conflicts[0]['sections']], ["MATH101-1", "MATH101-3"])
+
+    def test_unavailable_teacher_is_flagged(self):
+        """A section whose teacher is not free on every day of its period reports an availability conflict."""
+        self.teacher.availability = "M1-M6"
+        self.teacher.save()
+        monday = Period.objects.create(
+            id="P1M", period_name="Period 1 (Mon)", days="M", slot="1",
+            start_time="08:00", end_time="09:00"
+        )
+
+        self.assertFalse(ConflictService.check_section_conflicts(
+            self.create_section("MATH101-1", monday, self.teacher)
+        )['has_conflicts'])
+        result = ConflictService.check_section_conflicts(self.create_section("MATH101-2", self.period2, self.teacher))
+        self.assertEqual([c['type'] for c in result['conflicts']], ['availability'])
+        self.assertIn("not available during Period 2", result['conflicts'][0]['message'])
+
+
+class OccupancyIndexTest(TestCase):
+    def test_masks(self):
+        """Masks overlap only on shared slot, day and segment."""
+        index = OccupancyIndex()
+        year = index.section_mask("1", day_mask("M|T|W|TH|F"), "year")
+        t1 = index.section_mask("1", day_mask("M|T|W|TH|F"), "t1")
+        t2 = index.section_mask("1", day_mask("M|T|W|TH|F"), "t2")
+        s1 = index.section_mask("1", day_mask("M|T|W|TH|F"), "s1")
+        other_slot = index.section_mask("2", day_mask("M|T|W|TH|F"), "year")
+
+        self.assertTrue(masks_overlap(year, t1))
+        self.assertFalse(masks_overlap(t1, t2))
+        self.assertTrue(masks_overlap(s1, t2))
+        self.assertFalse(masks_overlap(year, other_slot))
+        self.assertFalse(masks_overlap(
+            index.section_mask("1", day_mask("M"), "year"),
+            index.section_mask("1", day_mask("T"), "year")
+        ))
+        self.assertEqual(index.section_mask(None, day_mask("M"), "year"), 0)
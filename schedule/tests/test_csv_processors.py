@@ -0,0 +1,193 @@
+import csv
+import io
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ..models import Course, Period, Room, Section, Student, Teacher, Enrollment
+from ..services.csv_processors.student_processor import StudentProcessor
+from ..services.csv_processors.section_processor import SectionProcessor
+from ..services.section_services.conflict_index_service import ConflictIndexService
+
+
+def reader_for(lines):
+    return csv.reader(io.StringIO("\n".join(lines)))
+
+
+class BulkImportTest(TestCase):
+    def test_large_roster_in_few_queries(self):
+        """Thousands of students are written in batches rather than a query pair per row."""
+        Student.objects.create(id="S00000", name="Old Name", grade_level=5, preferences="")
+        lines = [f"S{n:05d},First{n},,Last{n},{6 + n % 3}" for n in range(5000)]
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = StudentProcessor.process_csv(reader_for(lines))
+
+        self.assertEqual(counts, {'created': 4999, 'updated': 1, 'unchanged': 0, 'errors': []})
+        self.assertLess(len(queries), 100)
+        self.assertEqual(Student.objects.count(), 5000)
+        self.assertEqual(Student.objects.get(id="S00000").name, "First0 Last0")
+
+    def test_errors_keep_line_numbers(self):
+        """Parse errors, missing related objects and duplicate rows are reported as before."""
+        Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        Period.objects.create(id="P1", period_name="Period 1", days="M", slot="1",
+                              start_time="08:00", end_time="08:50")
+        lines = [
+            "MATH6,1,,P1,,25,year",
+            "MATH6,x,,P1,,25,year",
+            "SCI6,1,,P1,,25,year",
+            "MATH6,2,T9,P1,,25,year",
+            "",
+            "MATH6,1,,P1,,20,year",
+        ]
+
+        counts = SectionProcessor.process_csv(reader_for(lines))
+
+        self.assertEqual(counts, {'created': 1, 'updated': 1, 'unchanged': 0, 'errors': [
+            'Line 3: Invalid section number, must be a number',
+            'Line 4: Course with ID SCI6 does not exist',
+            'Line 5: Teacher with ID T9 does not exist',
+        ]})
+        self.assertEqual(Section.objects.get(id="MATH6-1").max_size, 20)
+
+    def test_failed_batch_falls_back_to_rows(self):
+        """A database error in a batch is reported against the offending line only."""
+        Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        Period.objects.create(id="P1", period_name="Period 1", days="M", slot="1",
+                              start_time="08:00", end_time="08:50")
+
+        counts = SectionProcessor.process_csv(reader_for(["MATH6,1,,P1,,25,year", "MATH6,2,,,,25,year"]))
+
+        self.assertEqual(counts['created'], 1)
+        self.assertEqual(len(counts['errors']), 1)
+        self.assertTrue(counts['errors'][0].startswith('Line 3: Error processing section:'))
+        self.assertEqual(list(Section.objects.values_list('id', flat=True)), ["MATH6-1"])
+
+    def test_sections_refresh_conflict_index(self):
+        """Bulk section updates keep the conflict index current even though signals are skipped."""
+        teacher = Teacher.objects.create(id="T1", name="Ms. Lee", availability="", subjects="Math")
+        Room.objects.create(id="R1", number="101", capacity=30, type="classroom")
+        math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        Course.objects.create(id="SCI6", name="Science 6", type="core", grade_level=6)
+        period1 = Period.objects.create(id="P1", period_name="Period 1", days="M", slot="1",
+                                        start_time="08:00", end_time="08:50")
+        Period.objects.create(id="P2", period_name="Period 2", days="M", slot="2",
+                              start_time="09:00", end_time="09:50")
+        Section.objects.create(id="MATH6-1", course=math, period=period1, teacher=teacher)
+        student = Student.objects.create(id="S1", name="Ann", grade_level=6, preferences="")
+        Enrollment.objects.create(student=student, section_id="MATH6-1")
+
+        SectionProcessor.process_csv(reader_for(["SCI6,1,T1,P1,R1,25,year"]))
+        Enrollment.objects.create(student=student, section_id="SCI6-1")
+        self.assertEqual(len(ConflictIndexService.get_conflicts()), 2)
+
+        SectionProcessor.process_csv(reader_for(["SCI6,1,T1,P2,R1,25,year"]))
+
+        self.assertEqual(ConflictIndexService.get_conflicts(), [])
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_unchanged_rows_are_not_written(self):
+        """Re-importing the same file writes nothing and reports the rows as unchanged."""
+        lines = [f"S{n},First{n},,Last{n},6" for n in range(300)]
+        StudentProcessor.process_csv(reader_for(lines))
+        lines[7] = "S7,First7,,Changed,6"
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = StudentProcessor.process_csv(reader_for(lines))
+
+        self.assertEqual(counts, {'created': 0, 'updated': 1, 'unchanged': 299, 'errors': []})
+        writes = [query['sql'] for query in queries if query['sql'].startswith(('UPDATE', 'INSERT'))
+                  and 'schedule_dataversion' not in query['sql']]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(Student.objects.get(id="S7").name, "First7 Changed")
+
+    def test_row_by_row_matches_bulk(self):
+        """The row by row path is still available and gives the same counts."""
+        lines = ["S1,Ann,,Lee,6", "S2,Bob,,Ray,x", "S1,Ann,Annie,Lee,6"]
+
+        counts = StudentProcessor.process_csv(reader_for(lines), bulk=False)
+
+        self.assertEqual(counts, {'created': 1, 'updated': 1, 'errors': [
+            'Line 3: Invalid grade level, must be a number'
+        ]})
+        self.assertEqual(Student.objects.get(id="S1").name, "Ann 'Annie' Lee")
+
+    def test_stream_commits_in_batches(self):
+        """Streamed rows are processed batch by batch with line numbers running across batches."""
+        lines = [f"S{n},First{n},,Last{n},6" for n in range(7)]
+        lines[5] = "S5,First5,,,6"
+        progress = []
+
+        counts = StudentProcessor.process_csv_stream(reader_for(lines), batch_rows=3, progress=progress.append)
+
+        self.assertEqual(counts, {'created': 6, 'updated': 0, 'unchanged': 0, 'rows': 7, 'batches': 3, 'errors': [
+            'Line 7: Missing required field: last_name'
+        ]})
+        self.assertEqual([totals['rows'] for totals in progress], [3, 6, 7])
+        self.assertEqual(progress[0]['created'], 3)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_upload_streamed_from_temporary_file(self):
+        """Uploads spooled to disk are decoded as they are read."""
+        content = "student_id,first_name,nickname,last_name,grade_level\n" + "\n".join(
+            f"S{n},Zoë{n},,Last{n},6" for n in range(2500)
+        )
+        upload = SimpleUploadedFile("students.csv", content.encode('utf-8'), content_type='text/csv')
+
+        with self.assertLogs('schedule.views.import_export_views', level='INFO') as logs:
+            response = self.client.post(reverse('csv_upload'), {'data_type': 'students', 'csv_file': upload}, follow=True)
+
+        self.assertContains(response, 'Successfully processed students data: 2500 created, 0 updated, 0 unchanged '
+                                      '(2500 rows in 2 batches).')
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(Student.objects.get(id="S2499").name, "Zoë2499 Last2499")
+
+
+class ValidateOnlyTest(TestCase):
+    def setUp(self):
+        Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        Period.objects.create(id="P1", period_name="Period 1", days="M", slot="1",
+                              start_time="08:00", end_time="08:50")
+        SectionProcessor.process_csv(reader_for(["MATH6,1,,P1,,25,year", "MATH6,2,,P1,,25,year"]))
+
+    def test_report_without_writes(self):
+        """Validation reports errors and the create/update/unchanged diff in a fixed number of queries."""
+        lines = [
+            "MATH6,1,,P1,,25,year",
+            "MATH6,2,,P1,,30,year",
+            "MATH6,3,,P1,,25,year",
+            "MATH6,3,,P1,,20,year",
+            "SCI6,1,,P1,,25,year",
+            "MATH6,4,,P9,,25,year",
+            "MATH6,5,,,,25,year",
+            "MATH6,6,,P1,,big,year",
+        ]
+
+        with self.assertNumQueries(5):
+            report = SectionProcessor.validate_csv(reader_for(lines))
+
+        self.assertEqual(report, {
+            'valid': False, 'rows': 8, 'create': 1, 'update': 2, 'unchanged': 1, 'errors': [
+                'Line 6: Course with ID SCI6 does not exist',
+                'Line 7: Period with ID P9 does not exist',
+                'Line 8: Missing value for period',
+                'Line 9: Invalid max size, must be a number',
+            ]
+        })
+        self.assertEqual(Section.objects.count(), 2)
+        self.assertEqual(Section.objects.get(id="MATH6-2").max_size, 25)
+
+    def test_validate_upload(self):
+        """The upload page can validate a file without importing it."""
+        content = "student_id,first_name,nickname,last_name,grade_level\nS1,Ann,,Lee,6\nS2,Bob,,Ray,x\n"
+        upload = SimpleUploadedFile("students.csv", content.encode('utf-8'), content_type='text/csv')
+
+        response = self.client.post(
+            reverse('csv_upload'), {'data_type': 'students', 'csv_file': upload, 'validate_only': 'on'}
+        )
+
+        self.assertContains(response, 'students.csv has 1 errors. 2 rows checked: 1 to create')
+        self.assertContains(response, 'Line 3: Invalid grade level, must be a number')
+        self.assertFalse(Student.objects.exists())
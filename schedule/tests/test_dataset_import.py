@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from ..models import Course, Period, Room, Section, Student, Teacher
+from ..services.csv_processors.processor_factory import ProcessorFactory
+from ..services.import_services.dataset_import_service import DatasetImportService
+
+# Named so that name order is not dependency order
+DATASET = {
+    'a_sections.csv': "course,section_number,teacher,period,room,max_size,when\n"
+                      "MATH6,1,T1,P1,R1,25,year\nMATH6,2,T1,P2,R1,25,year\n",
+    'b_courses.csv': "course_id,name,course_type,eligible_teachers,grade_level,sections_needed,duration\n"
+                     "MATH6,Math 6,core,T1,6,2,year\n",
+    'c_teachers.csv': "teacher_id,first_name,last_name,availability,subjects\nT1,Pat,Lee,,Math\n",
+    'd_periods.csv': "period_id,period_name,days,slot,start_time,end_time\n"
+                     "P1,Period 1,M|T|W|TH|F,1,08:00,08:50\nP2,Period 2,M|T|W|TH|F,2,09:00,09:50\n",
+    'e_rooms.csv': "room_id,number,capacity,type\nR1,101,30,classroom\n",
+    'f_roster.csv': "student_id,first_name,nickname,last_name,grade_level\nS1,Ann,,Lee,6\n",
+    'notes.csv': "something,else\n1,2\n",
+}
+
+
+class DatasetImportTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, content in DATASET.items():
+            with open(os.path.join(self.directory, name), 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_import_order(self):
+        """Sections come after every data type they refer to."""
+        levels = ProcessorFactory.get_import_order()
+
+        self.assertEqual(levels[-1], ['sections'])
+        self.assertEqual(set(levels[0]), {'students', 'teachers', 'rooms', 'courses', 'periods'})
+
+    def test_directory_import(self):
+        """Files are detected by their headers and imported in dependency order."""
+        result = DatasetImportService.import_dataset(self.directory)
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual([item['data_type'] for item in result['files']][-1], 'sections')
+        self.assertEqual(result['skipped'], [{'name': 'notes.csv', 'reason': 'Headers do not match any data type'}])
+        self.assertEqual(Section.objects.count(), 2)
+        self.assertEqual(Section.objects.get(id="MATH6-2").period_id, "P2")
+        self.assertEqual(Student.objects.get().name, "Ann Lee")
+
+    def test_zip_import(self):
+        """A zip archive of the same files imports the same way."""
+        archive_path = os.path.join(self.directory, 'dataset.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            for name, content in DATASET.items():
+                archive.writestr(f'dataset/{name}', content)
+
+        result = DatasetImportService.import_dataset(archive_path)
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(len(result['files']), 6)
+        self.assertEqual(Section.objects.count(), 2)
+
+    def test_errors_roll_back_everything(self):
+        """A bad row in any file leaves the database untouched unless errors are allowed."""
+        with open(os.path.join(self.directory, 'e_rooms.csv'), 'a') as f:
+            f.write("R2,102,lots,classroom\n")
+
+        result = DatasetImportService.import_dataset(self.directory)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], '1 rows had errors, nothing was saved.')
+        self.assertFalse(Teacher.objects.exists())
+        self.assertFalse(Section.objects.exists())
+
+        out = StringIO()
+        call_command('import_dataset', self.directory, '--allow-errors', stdout=out)
+
+        self.assertIn('Line 3: Invalid capacity, must be a number', out.getvalue())
+        self.assertEqual(Room.objects.count(), 1)
+        self.assertEqual(Section.objects.count(), 2)
+        self.assertTrue(Course.objects.exists() and Period.objects.exists())
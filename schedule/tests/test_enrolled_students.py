@@ -0,0 +1,83 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from ..models import Course, Period, Section, Student, Enrollment, CourseEnrollment
+from ..services.enrollment_services.course_enrollment_service import CourseEnrollmentService
+
+
+class EnrolledStudentsWithCountsTest(TestCase):
+    def setUp(self):
+        self.period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        self.math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.art = Course.objects.create(id="ART6", name="Art 6", type="elective", grade_level=6)
+        self.section = Section.objects.create(id="MATH6-1", course=self.math, section_number=1, period=self.period)
+        self.students = [
+            Student.objects.create(id=f"S{n:03d}", name=f"Student {n:03d}", grade_level=6 + n % 2, preferences="")
+            for n in range(1, 31)
+        ]
+        for student in self.students[:10]:
+            CourseEnrollment.objects.create(student=student, course=self.math)
+            Enrollment.objects.create(student=student, section=self.section)
+        CourseEnrollment.objects.create(student=self.students[0], course=self.art)
+
+    def rows(self, result):
+        return {
+            row['student'].id: (row['enrolled_course_count'], row['registered_section_count'],
+                                row['enrolled_in_selected_course'])
+            for row in result['students']
+        }
+
+    def test_counts_and_selected_flag(self):
+        """Each row has the student's course and section counts and whether they take a selected course."""
+        result = CourseEnrollmentService.get_enrolled_students_with_counts(course_ids=["ART6"], per_page=5)
+
+        self.assertEqual(result['total_count'], 30)
+        self.assertEqual(result['enrolled_count'], 1)
+        self.assertEqual(result['page'].paginator.num_pages, 6)
+        self.assertEqual(self.rows(result), {
+            "S001": (2, 1, True),
+            "S002": (1, 1, False),
+            "S003": (1, 1, False),
+            "S004": (1, 1, False),
+            "S005": (1, 1, False),
+        })
+
+    def test_grade_filter_flags_any_course(self):
+        """With a grade but no courses selected, students with any course request count as enrolled."""
+        result = CourseEnrollmentService.get_enrolled_students_with_counts(grade_filter=6, page=2, per_page=10)
+
+        self.assertEqual(result['total_count'], 15)
+        self.assertEqual(result['enrolled_count'], 5)
+        self.assertEqual(result['page'].number, 2)
+        self.assertEqual(list(self.rows(result)), ["S022", "S024", "S026", "S028", "S030"])
+        self.assertFalse(any(flag for _, _, flag in self.rows(result).values()))
+
+    def test_queries_do_not_grow_with_students(self):
+        """A page costs the same number of queries for a small and a large student body."""
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                CourseEnrollmentService.get_enrolled_students_with_counts(course_ids=["MATH6"], per_page=20)
+            return len(queries)
+
+        few = count_queries()
+        Student.objects.bulk_create([
+            Student(id=f"X{n:03d}", name=f"Extra {n:03d}", grade_level=6, preferences="") for n in range(200)
+        ])
+        self.assertEqual(count_queries(), few)
+        self.assertEqual(few, 2)
+
+    def test_enroll_students_view_paginates(self):
+        """The page shows totals for every matching student and links to the next page with the filters kept."""
+        response = self.client.get(reverse('enroll_students'), {'grade': 6, 'course_id': 'MATH6'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_students'], 15)
+        self.assertEqual(response.context['enrolled_students'], 5)
+        self.assertEqual(response.context['available_students'], 10)
+        self.assertFalse(response.context['page_obj'].has_other_pages())
+
+        response = self.client.get(reverse('enroll_students'), {'page': 99})
+        self.assertEqual(response.context['page_obj'].number, 1)
@@ -0,0 +1,111 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Course, Period, Section, Student, Enrollment
+from ..services.enrollment_services.batch_operations_service import BatchOperationsService
+from ..services.enrollment_services.enrollment_service import EnrollmentService
+from ..services.enrollment_services.enrollment_unit_of_work import EnrollmentUnitOfWork
+from ..services.section_registration_services.registration_service import RegistrationService
+from ..services.section_services.enrollment_count_service import EnrollmentCountService
+
+
+class EnrollmentCountTest(TestCase):
+    def setUp(self):
+        self.period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        self.course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.sections = [
+            Section.objects.create(id=f"MATH6-{n}", course=self.course, section_number=n,
+                                   period=self.period, max_size=3)
+            for n in range(1, 3)
+        ]
+        self.students = [
+            Student.objects.create(id=f"S{n}", name=f"Student {n}", grade_level=6, preferences="")
+            for n in range(1, 6)
+        ]
+
+    def counts(self):
+        return dict(Section.objects.order_by('id').values_list('id', 'enrolled_count'))
+
+    def test_single_writes_keep_count(self):
+        """Creating and deleting enrollments one at a time adjusts the section's count."""
+        EnrollmentService.enroll_student_in_section("S1", "MATH6-1")
+        EnrollmentService.enroll_student_in_section("S2", "MATH6-1")
+        self.assertEqual(self.counts(), {"MATH6-1": 2, "MATH6-2": 0})
+
+        EnrollmentService.remove_student_from_section("S1", "MATH6-1")
+        self.assertEqual(self.counts(), {"MATH6-1": 1, "MATH6-2": 0})
+        self.assertEqual(EnrollmentCountService.find_drift(), [])
+
+    def test_bulk_writes_keep_count(self):
+        """Bulk inserts and deletes, which skip per-row signals, keep the counts too."""
+        with EnrollmentUnitOfWork() as work:
+            for student in self.students[:3]:
+                work.add(student.id, "MATH6-1")
+            work.add("S4", "MATH6-2")
+        self.assertEqual(self.counts(), {"MATH6-1": 3, "MATH6-2": 1})
+
+        result = BatchOperationsService.bulk_enroll_students_in_sections(["S4", "S5"], "MATH6-1")
+        self.assertEqual(result['success_count'], 0)
+        self.assertEqual(result['errors'], ["Section is at capacity (3 students)"] * 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            BatchOperationsService.clear_all_enrollments_for_students(["S1", "S2", "S4"])
+        # One count update per distinct delta (-2 and -1), not one per deleted row
+        count_updates = [q for q in queries if q['sql'].startswith('UPDATE "schedule_section"')]
+        self.assertEqual(len(count_updates), 2)
+        self.assertEqual(self.counts(), {"MATH6-1": 1, "MATH6-2": 0})
+        self.assertEqual(EnrollmentCountService.find_drift(), [])
+
+    def test_ignored_conflicts_are_recounted(self):
+        """Rows skipped by an ignore-conflicts insert are not counted."""
+        Enrollment.objects.create(student_id="S1", section_id="MATH6-1")
+
+        with EnrollmentUnitOfWork(ignore_conflicts=True) as work:
+            work.add("S1", "MATH6-1")
+            work.add("S2", "MATH6-1")
+
+        self.assertEqual(self.counts(), {"MATH6-1": 2, "MATH6-2": 0})
+
+    def test_stale_instance_save_keeps_count(self):
+        """Saving a section loaded before enrollments were written does not reset its count."""
+        section = Section.objects.get(id="MATH6-1")
+        Enrollment.objects.create(student_id="S1", section_id="MATH6-1")
+
+        section.max_size = 10
+        section.save()
+
+        self.assertEqual(self.counts()["MATH6-1"], 1)
+
+    def test_section_stats_read_count_column(self):
+        """Section stats come from the stored count, without a query per section."""
+        Enrollment.objects.create(student_id="S1", section_id="MATH6-1")
+        sections = list(Section.objects.order_by('id'))
+
+        with self.assertNumQueries(0):
+            stats = RegistrationService.get_section_stats(sections)
+
+        self.assertEqual([row['enrolled_count'] for row in stats], [1, 0])
+        self.assertEqual([row['remaining_capacity'] for row in stats], [2, 3])
+
+    def test_reconcile_command_repairs_drift(self):
+        """--check reports drift without changing anything; a plain run repairs it."""
+        Enrollment.objects.create(student_id="S1", section_id="MATH6-1")
+        Section.objects.filter(id="MATH6-1").update(enrolled_count=5)
+        Section.objects.filter(id="MATH6-2").update(enrolled_count=-1)
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_enrollment_counts', '--check', stdout=StringIO())
+        self.assertEqual(self.counts(), {"MATH6-1": 5, "MATH6-2": -1})
+
+        out = StringIO()
+        call_command('reconcile_enrollment_counts', stdout=out)
+        self.assertIn("Section MATH6-1: stored 5, actual 1", out.getvalue())
+        self.assertIn("Repaired 2 section enrollment counts", out.getvalue())
+        self.assertEqual(self.counts(), {"MATH6-1": 1, "MATH6-2": 0})
+
+        call_command('reconcile_enrollment_counts', '--check', stdout=StringIO())
@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Course, Period, Section, Student, Enrollment
+from ..services.enrollment_services.enrollment_unit_of_work import EnrollmentUnitOfWork
+from ..services.section_services.conflict_index_service import ConflictIndexService
+from ..utils.language_course_utils import assign_language_courses
+
+
+class EnrollmentUnitOfWorkTest(TestCase):
+    def setUp(self):
+        self.period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        self.course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.sections = [
+            Section.objects.create(id=f"MATH6-{n}", course=self.course, section_number=n, period=self.period)
+            for n in range(1, 4)
+        ]
+        self.students = [
+            Student.objects.create(id=f"S{n}", name=f"Student {n}", grade_level=6, preferences="")
+            for n in range(1, 4)
+        ]
+
+    def test_staged_writes_are_flushed_together(self):
+        """Adds and removes reach the database only on flush, in one transaction."""
+        existing = Enrollment.objects.create(student=self.students[0], section=self.sections[0])
+
+        work = EnrollmentUnitOfWork()
+        work.add("S2", "MATH6-1")
+        work.add("S3", "MATH6-2")
+        work.remove("S1", "MATH6-1", existing.id)
+        self.assertEqual(work.pending, 3)
+        self.assertEqual(Enrollment.objects.count(), 1)
+
+        result = work.flush()
+
+        self.assertEqual(result, {'created': 2, 'deleted': 1, 'rows_written': 3})
+        self.assertEqual(
+            sorted(Enrollment.objects.values_list('student_id', 'section_id')),
+            [("S2", "MATH6-1"), ("S3", "MATH6-2")]
+        )
+        self.assertEqual(work.pending, 0)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+    def test_undo_cancels_without_writes(self):
+        """Removing a staged add, or re-adding a staged remove, writes nothing."""
+        Enrollment.objects.create(student=self.students[0], section=self.sections[0])
+
+        with self.assertNumQueries(0):
+            work = EnrollmentUnitOfWork()
+            work.add("S2", "MATH6-2")
+            work.remove("S2", "MATH6-2")
+            work.remove("S1", "MATH6-1")
+            work.add("S1", "MATH6-1")
+            self.assertEqual(work.pending, 0)
+
+        self.assertEqual(work.flush()['rows_written'], 0)
+        self.assertTrue(Enrollment.objects.filter(student_id="S1", section_id="MATH6-1").exists())
+
+    def test_context_manager_and_ignore_conflicts(self):
+        """The context manager flushes on exit and ignore_conflicts skips existing rows."""
+        Enrollment.objects.create(student=self.students[0], section=self.sections[0])
+
+        with EnrollmentUnitOfWork(ignore_conflicts=True) as work:
+            work.add("S1", "MATH6-1")
+            work.add("S1", "MATH6-2")
+
+        self.assertEqual(Enrollment.objects.filter(student_id="S1").count(), 2)
+
+        with self.assertRaises(ValueError):
+            with EnrollmentUnitOfWork() as work:
+                work.add("S2", "MATH6-3")
+                raise ValueError
+        self.assertFalse(Enrollment.objects.filter(student_id="S2").exists())
+
+    def test_language_assignment_writes_nothing_on_failure(self):
+        """Partial language assignments are dropped before they are written."""
+        spanish = Course.objects.create(id="SPA6", name="Spanish 6", type="language", grade_level=6, max_students=5)
+        french = Course.objects.create(id="FRE6", name="French 6", type="language", grade_level=6, max_students=5)
+        Section.objects.create(id="SPA6-1", course=spanish, period=self.period, when='t1')
+        Section.objects.create(id="FRE6-1", course=french, period=self.period, when='t1')
+
+        success, _, assignments = assign_language_courses(self.students[0], [spanish, french])
+
+        self.assertFalse(success)
+        self.assertEqual(assignments, [])
+        self.assertFalse(Enrollment.objects.filter(student=self.students[0]).exists())
+
+        Section.objects.filter(id="FRE6-1").update(when='t2')
+        success, _, assignments = assign_language_courses(self.students[0], [spanish, french])
+
+        self.assertTrue(success)
+        self.assertEqual(Enrollment.objects.filter(student=self.students[0]).count(), 2)
+        self.assertCountEqual([enrollment.pk for enrollment in assignments],
+                              Enrollment.objects.filter(student=self.students[0]).values_list('pk', flat=True))
+
+    def test_flush_counts_only_inserted_rows(self):
+        """A duplicate add skipped by ignore_conflicts is not reported as written."""
+        Enrollment.objects.create(student=self.students[0], section=self.sections[0])
+
+        work = EnrollmentUnitOfWork(ignore_conflicts=True)
+        work.add("S1", "MATH6-1")
+        work.add("S2", "MATH6-1")
+
+        self.assertEqual(work.flush(), {'created': 1, 'deleted': 0, 'rows_written': 1})
+        self.assertEqual(Enrollment.objects.count(), 2)
+
+    def test_removing_many_rows_costs_constant_queries(self):
+        """A flush that removes many enrollments runs as many queries as one that removes a few."""
+        Student.objects.bulk_create([
+            Student(id=f"X{n:03d}", name=f"Extra {n}", grade_level=6, preferences="") for n in range(60)
+        ])
+        with EnrollmentUnitOfWork() as work:
+            for n in range(60):
+                work.add(f"X{n:03d}", self.sections[n % 3].id)
+
+        def flush_removals(student_ids):
+            work = EnrollmentUnitOfWork()
+            for student_id in student_ids:
+                work.remove(student_id, self.sections[int(student_id[1:]) % 3].id)
+            with CaptureQueriesContext(connection) as queries:
+                result = work.flush()
+            return result, len(queries)
+
+        result, few = flush_removals([f"X{n:03d}" for n in range(3)])
+        self.assertEqual(result['deleted'], 3)
+        result, many = flush_removals([f"X{n:03d}" for n in range(3, 60)])
+        self.assertEqual(result['deleted'], 57)
+
+        self.assertEqual(few, many)
+        self.assertFalse(Enrollment.objects.exists())
+        self.assertEqual(sum(Section.objects.values_list('enrolled_count', flat=True)), 0)
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
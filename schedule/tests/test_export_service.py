@@ -0,0 +1,95 @@
+import csv
+import io
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from ..models import Course, Period, Room, Section, Student, Teacher, Enrollment
+from ..services.section_services.export_service import ExportService, stream_csv
+
+
+def read_csv(response):
+    return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+
+class ExportServiceTest(TestCase):
+    def setUp(self):
+        period1 = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        period2 = Period.objects.create(
+            id="P2", period_name="Period 2", days="M|T|W|TH|F", slot="2", start_time="09:00", end_time="09:50"
+        )
+        teacher = Teacher.objects.create(id="T1", name="Ms. Lee", availability="", subjects="Math")
+        room = Room.objects.create(id="R1", number="101", capacity=30, type="classroom")
+        math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        art = Course.objects.create(id="ART6", name="Art 6", type="elective", grade_level=6)
+
+        math1 = Section.objects.create(id="MATH6-1", course=math, period=period1, teacher=teacher, room=room)
+        art1 = Section.objects.create(id="ART6-1", course=art, period=period2)
+
+        self.ann = Student.objects.create(id="S2", name="Ann", grade_level=6, preferences="")
+        self.bob = Student.objects.create(id="S1", name="Bob", grade_level=6, preferences="")
+        Student.objects.create(id="S3", name="Cy", grade_level=6, preferences="")
+        Enrollment.objects.create(student=self.bob, section=math1)
+        Enrollment.objects.create(student=self.ann, section=math1)
+        Enrollment.objects.create(student=self.ann, section=art1)
+
+    def test_master_schedule(self):
+        """Sections stream in period order with their student names."""
+        with self.assertNumQueries(2):
+            rows = list(ExportService.master_schedule_rows())
+
+        self.assertEqual(rows, [
+            ["Period 1", "Math 6", "Ms. Lee", "101", "Ann, Bob"],
+            [],
+            ["Period 2", "Art 6", "Unassigned", "Unassigned", "Ann"],
+            [],
+        ])
+
+        response = ExportService.export_master_schedule()
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(read_csv(response)[0], ["Period", "Course", "Teacher", "Room", "Students"])
+
+    def test_student_schedules(self):
+        """Each student's sections are listed, with a placeholder for students without any."""
+        with self.assertNumQueries(2):
+            rows = list(ExportService.student_schedule_rows())
+
+        self.assertEqual(rows, [
+            ["Bob", 6, "Period 1", "Math 6", "Ms. Lee", "101"],
+            [],
+            ["Ann", 6, "Period 1", "Math 6", "Ms. Lee", "101"],
+            ["Ann", 6, "Period 2", "Art 6", "Unassigned", "Unassigned"],
+            [],
+            ["Cy", 6, "No sections assigned", "", "", ""],
+        ])
+
+        rows = read_csv(ExportService.export_student_schedules(self.bob))
+        self.assertEqual(rows[1:], [["Bob", "6", "Period 1", "Math 6", "Ms. Lee", "101"]])
+
+    def test_single_student_without_sections(self):
+        """A single student export with no sections has only the header row."""
+        rows = read_csv(ExportService.export_student_schedules(Student.objects.get(id="S3")))
+        self.assertEqual(rows, [["Student", "Grade", "Period", "Course", "Teacher", "Room"]])
+
+    def test_student_roster_view(self):
+        """The student export view streams the roster ordered by name."""
+        response = self.client.get(reverse('export_student_schedules'))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="student_schedules.csv"')
+        self.assertEqual(read_csv(response), [
+            ["Student ID", "Name", "Grade", "Period", "Course", "Teacher", "Room"],
+            ["S2", "Ann", "6", "P1", "Math 6", "Ms. Lee", "101"],
+            ["S2", "Ann", "6", "P2", "Art 6", "", ""],
+            ["S1", "Bob", "6", "P1", "Math 6", "Ms. Lee", "101"],
+            ["S3", "Cy", "6", "", "", "", ""],
+        ])
+
+    def test_chunking(self):
+        """Rows are grouped into chunks after the header chunk."""
+        chunks = list(stream_csv(["a"], ([n] for n in range(100)), chunk_size=50))
+
+        self.assertEqual(chunks[0], "a\r\n")
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual("".join(chunks).split("\r\n")[1:-1], [str(n) for n in range(100)])
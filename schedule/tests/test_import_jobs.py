@@ -0,0 +1,126 @@
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from ..models import ImportJob, Student
+from ..services.import_services.import_job_service import ImportJobService, ORPHANED_UPLOAD_AGE, STALE_JOB_AGE
+
+HEADER = "student_id,first_name,nickname,last_name,grade_level\n"
+
+
+def upload_for(content, name="students.csv"):
+    return SimpleUploadedFile(name, content.encode('utf-8'), content_type='text/csv')
+
+
+@override_settings(IMPORT_JOBS_USE_THREAD=False)
+class ImportJobTest(TestCase):
+    def test_background_upload_and_progress(self):
+        """A background upload records a job that the progress endpoint reports on."""
+        content = HEADER + "S1,Ann,,Lee,6\nS2,Bob,,,6\nS3,Cy,,Ray,7\n"
+
+        response = self.client.post(
+            reverse('csv_upload'),
+            {'data_type': 'students', 'csv_file': upload_for(content), 'background': 'on'}
+        )
+
+        job = ImportJob.objects.get()
+        self.assertRedirects(response, f"{reverse('csv_upload')}?job={job.id}")
+        self.assertEqual(job.status, 'pending')
+        self.assertFalse(Student.objects.exists())
+
+        progress = self.client.get(reverse('import_job_progress', args=[job.id])).json()
+        self.assertEqual((progress['status'], progress['percent'], progress['finished']), ('pending', 0, False))
+
+        ImportJobService.run_job(job.id)
+
+        progress = self.client.get(reverse('import_job_progress', args=[job.id])).json()
+        self.assertEqual(progress['status'], 'completed')
+        self.assertEqual(progress['percent'], 100)
+        self.assertEqual((progress['rows_processed'], progress['created'], progress['error_count']), (3, 2, 1))
+        self.assertEqual(progress['errors'], ['Line 3: Missing required field: last_name'])
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertFalse(os.path.exists(job.source_path))
+
+        page = self.client.get(f"{reverse('csv_upload')}?job={job.id}")
+        self.assertContains(page, reverse('import_job_progress', args=[job.id]))
+
+    def test_headers_checked_before_queueing(self):
+        """Files with missing headers are rejected without creating a job."""
+        response = self.client.post(
+            reverse('csv_upload'),
+            {'data_type': 'students', 'csv_file': upload_for("student_id,name\nS1,Ann\n"), 'background': 'on'},
+            follow=True
+        )
+
+        self.assertContains(response, 'CSV file missing required headers')
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_failed_job(self):
+        """A job whose file cannot be decoded is marked failed with the reason."""
+        upload = SimpleUploadedFile("students.csv", HEADER.encode() + b"S1,\xff\xfe,,Lee,6\n")
+        job = ImportJobService.create_job('students', upload)
+
+        job = ImportJobService.run_job(job.id)
+
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('Error processing CSV', job.message)
+        self.assertIsNotNone(job.finished_at)
+
+        # Finished jobs are not run again
+        self.assertEqual(ImportJobService.run_job(job.id).finished_at, job.finished_at)
+
+    def test_command_runs_pending_jobs(self):
+        """The run_import_jobs command works through the pending queue."""
+        ImportJobService.create_job('students', upload_for(HEADER + "S1,Ann,,Lee,6\n"))
+        ImportJobService.create_job('students', upload_for(HEADER + "S2,Bob,,Ray,6\n"))
+        out = StringIO()
+
+        call_command('run_import_jobs', stdout=out)
+
+        self.assertEqual(list(ImportJob.objects.values_list('status', flat=True)), ['completed', 'completed'])
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertIn('1 created, 0 updated', out.getvalue())
+
+    def test_command_recovers_interrupted_jobs(self):
+        """Jobs whose worker stopped are failed, and uploads with no job are removed; live jobs are kept."""
+        interrupted = ImportJobService.create_job('students', upload_for(HEADER + "S1,Ann,,Lee,6\n"))
+        ImportJob.objects.filter(pk=interrupted.pk).update(
+            status='running', heartbeat_at=timezone.now() - timedelta(seconds=STALE_JOB_AGE + 1)
+        )
+
+        # Still being imported by another worker, which reported progress a moment ago
+        live = ImportJobService.create_job('students', upload_for(HEADER + "S4,Di,,Ray,6\n"))
+        ImportJob.objects.filter(pk=live.pk).update(status='running', heartbeat_at=timezone.now())
+
+        # The request that saved this job was rolled back, leaving only its file behind
+        with transaction.atomic():
+            orphaned = ImportJobService.create_job('students', upload_for(HEADER + "S2,Bob,,Ray,6\n"))
+            transaction.set_rollback(True)
+        old = time.time() - ORPHANED_UPLOAD_AGE - 1
+        os.utime(orphaned.source_path, (old, old))
+
+        pending = ImportJobService.create_job('students', upload_for(HEADER + "S3,Cy,,Ray,6\n"))
+        os.utime(pending.source_path, (old, old))
+        os.utime(live.source_path, (old, old))
+        out = StringIO()
+
+        call_command('run_import_jobs', stdout=out)
+
+        interrupted.refresh_from_db()
+        self.assertEqual(interrupted.status, 'failed')
+        self.assertIn('interrupted', interrupted.message)
+        self.assertIn('Marked 1 interrupted jobs as failed', out.getvalue())
+        self.assertIn('Removed 1 orphaned upload files', out.getvalue())
+        self.assertFalse(os.path.exists(interrupted.source_path))
+        self.assertFalse(os.path.exists(orphaned.source_path))
+        self.assertEqual(ImportJob.objects.get(pk=pending.pk).status, 'completed')
+        self.assertEqual(list(Student.objects.values_list('id', flat=True)), ["S3"])
+        self.assertEqual(ImportJob.objects.get(pk=live.pk).status, 'running')
+        self.assertTrue(os.path.exists(live.source_path))
+        os.remove(live.source_path)
@@ -0,0 +1,28 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from ..models import Section, Student
+from ..services.benchmark_services.index_benchmark_service import HOT_QUERY_INDEXES, IndexBenchmarkService
+
+
+class QueryIndexBenchmarkTest(TestCase):
+    def test_indexes_declared(self):
+        """Every benchmarked index exists in the database."""
+        with connection.cursor() as cursor:
+            for model, index in IndexBenchmarkService.get_indexes():
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                self.assertIn(index.name, constraints)
+        self.assertEqual(len(IndexBenchmarkService.get_indexes()), len(HOT_QUERY_INDEXES))
+
+    def test_benchmark_rolls_back(self):
+        """The benchmark reports each hot query and leaves no data or missing indexes behind."""
+        out = StringIO()
+
+        call_command('benchmark_query_indexes', '--students-per-grade', '30', '--grades', '2', '--repeat', '1', stdout=out)
+
+        self.assertIn('conflict.teacher_sections', out.getvalue())
+        self.assertIn('registration.grade_course_requests', out.getvalue())
+        self.assertFalse(Student.objects.exists())
+        self.assertFalse(Section.objects.exists())
+        self.test_indexes_declared()
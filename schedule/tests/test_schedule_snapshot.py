@@ -0,0 +1,87 @@
+from django.test import TestCase
+from ..models import Course, Period, Section, Student, Enrollment, CourseEnrollment
+from ..services.enrollment_services.schedule_snapshot import ScheduleSnapshot
+
+
+class ScheduleSnapshotTest(TestCase):
+    def setUp(self):
+        self.period1 = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        self.period2 = Period.objects.create(
+            id="P2", period_name="Period 2", days="M|T|W|TH|F", slot="2", start_time="09:00", end_time="09:50"
+        )
+        self.math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        self.art = Course.objects.create(id="ART6", name="Art 6", type="elective", grade_level=6)
+        self.math1 = Section.objects.create(id="MATH6-1", course=self.math, section_number=1,
+                                            period=self.period1, max_size=2)
+        self.math2 = Section.objects.create(id="MATH6-2", course=self.math, section_number=2,
+                                            period=self.period2, max_size=2)
+        self.art1 = Section.objects.create(id="ART6-1", course=self.art, section_number=1,
+                                           period=self.period1, max_size=5)
+
+        self.students = [
+            Student.objects.create(id=f"S{n}", name=f"Student {n}", grade_level=6, preferences="")
+            for n in range(1, 4)
+        ]
+        for student in self.students:
+            CourseEnrollment.objects.create(student=student, course=self.math)
+        Enrollment.objects.create(student=self.students[0], section=self.art1)
+        Enrollment.objects.create(student=self.students[1], section=self.math1)
+
+    def test_load(self):
+        """The snapshot loads in a fixed number of queries and indexes everything."""
+        with self.assertNumQueries(5):
+            snapshot = ScheduleSnapshot.load(["MATH6"])
+
+        self.assertEqual(snapshot.course_ids, ["MATH6"])
+        self.assertEqual(len(snapshot.student_ids), 3)
+        s1 = snapshot.student_index["S1"]
+        math1 = snapshot.section_index["MATH6-1"]
+        math2 = snapshot.section_index["MATH6-2"]
+        art1 = snapshot.section_index["ART6-1"]
+
+        # Art is loaded for its occupancy but is not a planned course
+        self.assertIsNone(snapshot.section_course[art1])
+        self.assertEqual(snapshot.section_count[math1], 1)
+        self.assertFalse(snapshot.fits(s1, math1))
+        self.assertTrue(snapshot.fits(s1, math2))
+        self.assertEqual(snapshot.section_for_course(snapshot.student_index["S2"], 0), math1)
+
+    def test_clone_is_copy_on_write(self):
+        """Changes to a clone do not leak into the original and vice versa."""
+        snapshot = ScheduleSnapshot.load(["MATH6"])
+        s3 = snapshot.student_index["S3"]
+        math1 = snapshot.section_index["MATH6-1"]
+        math2 = snapshot.section_index["MATH6-2"]
+
+        copy = snapshot.clone()
+        self.assertIs(copy.section_count, snapshot.section_count)
+
+        copy.add(s3, math1)
+        self.assertFalse(copy.has_space(math1))
+        self.assertTrue(snapshot.has_space(math1))
+        self.assertEqual(snapshot.diff(), ([], []))
+
+        snapshot.add(s3, math2)
+        self.assertEqual(copy.section_count[math2], 0)
+
+    def test_commit_writes_diff(self):
+        """Only the changes since loading are written."""
+        snapshot = ScheduleSnapshot.load(["MATH6"])
+        s2 = snapshot.student_index["S2"]
+        s3 = snapshot.student_index["S3"]
+        math1 = snapshot.section_index["MATH6-1"]
+        math2 = snapshot.section_index["MATH6-2"]
+
+        snapshot.remove(s2, math1)
+        snapshot.add(s2, math2)
+        snapshot.add(s3, math1)
+        self.assertEqual(snapshot.diff(), ([("S2", "MATH6-2"), ("S3", "MATH6-1")], [("S2", "MATH6-1")]))
+
+        self.assertEqual(snapshot.commit(), {'created': 2, 'deleted': 1, 'rows_written': 3})
+        self.assertEqual(
+            sorted(Enrollment.objects.filter(section__course=self.math).values_list('student_id', 'section_id')),
+            [("S2", "MATH6-2"), ("S3", "MATH6-1")]
+        )
+        self.assertEqual(snapshot.diff(), ([], []))
@@ -0,0 +1,146 @@
+from django.test import TestCase
+from ..models import Course, Period, Section, Student, Enrollment, CourseEnrollment
+from ..services.enrollment_services.section_assignment_service import SectionAssignmentService
+from ..services.section_registration_services.algorithm_service import AlgorithmService
+from ..services.section_services.conflict_index_service import ConflictIndexService
+from ..utils.flow_utils import MinCostFlow
+
+
+class AssignmentDataMixin:
+    def setUp(self):
+        self.periods = [
+            Period.objects.create(
+                id=f"P{number}", period_name=f"Period {number}", days="M|T|W|TH|F", slot=str(number),
+                start_time=f"{7 + number:02d}:00", end_time=f"{7 + number:02d}:50"
+            )
+            for number in range(1, 4)
+        ]
+        self.math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6, sections_needed=3)
+        self.art = Course.objects.create(id="ART6", name="Art 6", type="elective", grade_level=6, sections_needed=1)
+
+        self.math_sections = [
+            Section.objects.create(id=f"MATH6-{n}", course=self.math, section_number=n,
+                                   period=self.periods[n - 1], max_size=10)
+            for n in range(1, 4)
+        ]
+        self.art_section = Section.objects.create(id="ART6-1", course=self.art, section_number=1,
+                                                  period=self.periods[0], max_size=10)
+
+        self.students = [
+            Student.objects.create(id=f"S{n:03d}", name=f"Student {n}", grade_level=6, preferences="")
+            for n in range(1, 13)
+        ]
+        for student in self.students:
+            CourseEnrollment.objects.create(student=student, course=self.math)
+
+    def section_counts(self):
+        return [Enrollment.objects.filter(section=section).count() for section in self.math_sections]
+
+
+class SectionAssignmentTest(AssignmentDataMixin, TestCase):
+    def test_assigns_balanced_sections(self):
+        """Students are spread evenly over the sections and written in one insert."""
+        with self.assertNumQueries(15):
+            result = SectionAssignmentService.assign_students_to_sections(grade_level=6)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_assigned'], 12)
+        self.assertEqual(self.section_counts(), [4, 4, 4])
+        self.assertTrue(ConflictIndexService.check_consistency()['consistent'])
+
+        # Running again leaves everyone where they are
+        self.assertEqual(SectionAssignmentService.assign_students_to_sections()['total_assigned'], 0)
+
+    def test_respects_student_schedules(self):
+        """Students already busy in a period are routed around it."""
+        for student in self.students[:8]:
+            CourseEnrollment.objects.create(student=student, course=self.art)
+            Enrollment.objects.create(student=student, section=self.art_section)
+
+        result = SectionAssignmentService.assign_students_to_sections()
+
+        self.assertEqual(result['total_assigned'], 12)
+        self.assertFalse(Enrollment.objects.filter(student__in=self.students[:8], section=self.math_sections[0]).exists())
+        self.assertEqual(self.section_counts(), [4, 4, 4])
+        self.assertEqual(ConflictIndexService.get_conflicts(), [])
+
+    def test_capacity_and_exact_size(self):
+        """Exact-size sections are filled first and full sections report failures."""
+        Section.objects.filter(id="MATH6-1").update(exact_size=6)
+        Section.objects.filter(id__in=["MATH6-2", "MATH6-3"]).update(max_size=2)
+
+        result = SectionAssignmentService.assign_students_to_sections()
+
+        self.assertFalse(result['success'])
+        self.assertEqual(self.section_counts(), [6, 2, 2])
+        self.assertEqual(result['total_failures'], 2)
+
+    def test_balance_section_assignments_rebalances(self):
+        """Rebalancing moves students out of an overfull section."""
+        for student in self.students[:9]:
+            Enrollment.objects.create(student=student, section=self.math_sections[0])
+
+        result = AlgorithmService.balance_section_assignments("MATH6")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['success_count'], 12)
+        self.assertEqual(self.section_counts(), [4, 4, 4])
+        self.assertFalse(AlgorithmService.balance_section_assignments("NOPE")['success'])
+
+    def test_assign_single_student(self):
+        """A single student goes to the least-full section that fits."""
+        Enrollment.objects.create(student=self.students[1], section=self.math_sections[0])
+
+        result = SectionAssignmentService.assign_student_to_course_section("S001", "MATH6")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['section'].id, "MATH6-2")
+        self.assertFalse(SectionAssignmentService.assign_student_to_course_section("S001", "MATH6")['success'])
+
+
+class MinCostFlowTest(TestCase):
+    def test_prefers_cheaper_paths(self):
+        """The maximum flow is sent along the cheapest arcs."""
+        flow = MinCostFlow(4)
+        flow.add_arc(0, 1, 2, 0)
+        flow.add_arc(0, 2, 2, 0)
+        cheap = flow.add_arc(1, 3, 1, 1)
+        expensive = flow.add_arc(1, 3, 5, 10)
+        flow.add_arc(2, 3, 1, 2)
+
+        self.assertEqual(flow.solve(0, 3), (3, 13))
+        self.assertEqual(flow.flow_on(cheap), 1)
+        self.assertEqual(flow.flow_on(expensive), 1)
+
+
+class StudentScheduleTest(AssignmentDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.language = Course.objects.create(id="SPA6", name="Spanish 6", type="language", grade_level=6)
+        Section.objects.create(id="SPA6-1", course=self.language, section_number=1,
+                               period=self.periods[0], max_size=10)
+        for student in self.students[6:]:
+            CourseEnrollment.objects.create(student=student, course=self.language)
+
+    def test_whole_student_schedules(self):
+        """Language and core courses are placed together without clashes."""
+        result = AlgorithmService.register_language_and_core_courses(grade_level=6)
+
+        self.assertTrue(result['success'])
+        self.assertEqual((result['language_success'], result['core_success']), (6, 12))
+        self.assertFalse(Enrollment.objects.filter(
+            student__in=self.students[6:], section=self.math_sections[0]
+        ).exists())
+        self.assertEqual(self.section_counts(), [4, 4, 4])
+        self.assertEqual(ConflictIndexService.get_conflicts(), [])
+
+    def test_partial_schedule_when_courses_cannot_fit(self):
+        """A student whose courses cannot all fit keeps the most courses possible."""
+        Section.objects.filter(id__in=["MATH6-2", "MATH6-3"]).delete()
+
+        result = SectionAssignmentService.assign_student_schedules(grade_level=6)
+
+        self.assertEqual(result['total_assigned'], 12)
+        self.assertEqual(result['total_failures'], 6)
+        for student in self.students[6:]:
+            self.assertEqual(Enrollment.objects.filter(student=student).count(), 1)
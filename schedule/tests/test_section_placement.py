@@ -0,0 +1,127 @@
+from django.test import TestCase
+from ..models import Course, Teacher, Room, Period, Section, TrimesterCourseGroup
+from ..services.schedule_generation_services.section_placement_service import SectionPlacementService
+from ..services.section_services.conflict_service import ConflictService
+from ..utils.availability_utils import parse_availability, is_available, validate_availability
+from ..utils.occupancy_utils import day_mask
+
+
+class SectionPlacementTest(TestCase):
+    def setUp(self):
+        for number in range(1, 4):
+            Period.objects.create(
+                id=f"P{number}", period_name=f"Period {number}", days="M|T|W|TH|F", slot=str(number),
+                start_time=f"{7 + number:02d}:00", end_time=f"{7 + number:02d}:50"
+            )
+        Period.objects.create(
+            id="PL", period_name="Lunch", days="M|T|W|TH|F", slot="L",
+            start_time="12:00", end_time="12:30"
+        )
+        self.math_teacher = Teacher.objects.create(id="T1", name="John Smith", availability="", subjects="Math")
+        self.science_teacher = Teacher.objects.create(
+            id="T2", name="Mary Jones", availability="M1-M2,T1-T2,W1-W2,TH1-TH2,F1-F2", subjects="Science"
+        )
+        Room.objects.create(id="R101", number="101", capacity=30, type="classroom")
+        Room.objects.create(id="R102", number="102", capacity=25, type="classroom")
+        Room.objects.create(id="LAB1", number="Lab 1", capacity=30, type="lab")
+
+    def create_course(self, course_id, name, teachers, sections_needed, duration='year', max_students=None):
+        return Course.objects.create(
+            id=course_id, name=name, type="core", grade_level=7, eligible_teachers=teachers,
+            sections_needed=sections_needed, duration=duration, max_students=max_students
+        )
+
+    def test_places_sections_without_conflicts(self):
+        """Every section gets a period, eligible teacher and fitting room with no double-booking."""
+        self.create_course("MATH7", "Math 7", "T1", 3)
+        self.create_course("SCI7", "Science 7", "T2", 2)
+        self.create_course("ENG7", "English 7", "T1", 0)
+
+        result = SectionPlacementService.generate_sections()
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['sections_created'], 5)
+        self.assertGreaterEqual(result['stats']['nodes'], 5)
+        self.assertEqual(ConflictService.find_all_conflicts(), [])
+
+        sections = Section.objects.all()
+        self.assertFalse(sections.filter(period__slot="L").exists())
+        self.assertEqual(set(sections.filter(course_id="MATH7").values_list('teacher_id', flat=True)), {"T1"})
+        # Science needs a lab and T2 is only free in slots 1 and 2
+        for section in sections.filter(course_id="SCI7"):
+            self.assertEqual(section.room_id, "LAB1")
+            self.assertIn(section.period.slot, {"1", "2"})
+        # Sections of the same course are spread across periods
+        self.assertEqual(sections.filter(course_id="MATH7").values('period').distinct().count(), 3)
+
+    def test_trimester_sections_share_period(self):
+        """Trimester sections may share a period and teacher because they meet in different trimesters."""
+        course = self.create_course("ART7", "Studio 7", "T2", 3, duration='trimester')
+        group = TrimesterCourseGroup.objects.create(name="Rotation", group_type="elective")
+        group.courses.add(course)
+        group.preferred_period = Period.objects.get(id="P1")
+        group.save()
+
+        result = SectionPlacementService.generate_sections()
+
+        self.assertTrue(result['success'])
+        sections = Section.objects.filter(course=course)
+        self.assertEqual(set(sections.values_list('period_id', flat=True)), {"P1"})
+        self.assertEqual(sorted(sections.values_list('when', flat=True)), ['t1', 't2', 't3'])
+        self.assertEqual(ConflictService.find_all_conflicts(), [])
+
+    def test_room_capacity_and_unplaceable_courses(self):
+        """Rooms must hold the section and courses without valid placements are reported."""
+        self.create_course("BIG7", "Assembly", "T1", 1, max_students=100)
+        self.create_course("GHOST7", "Ghost", "T9", 1)
+        self.create_course("MATH7", "Math 7", "T1", 1, max_students=28)
+
+        result = SectionPlacementService.generate_sections()
+
+        self.assertTrue(result['success'])
+        self.assertEqual(
+            sorted(course['course_id'] for course in result['unplaceable']),
+            ["BIG7", "GHOST7"]
+        )
+        self.assertEqual(Section.objects.get(course_id="MATH7").room_id, "R101")
+
+    def test_overconstrained_schedule_fails(self):
+        """The solver reports failure when the teacher has more sections than periods."""
+        self.create_course("MATH7", "Math 7", "T2", 3)
+
+        result = SectionPlacementService.generate_sections()
+
+        self.assertFalse(result['success'])
+        self.assertGreater(result['stats']['backtracks'], 0)
+        self.assertFalse(Section.objects.exists())
+
+    def test_existing_sections_are_booked(self):
+        """Courses that already have sections are skipped and their teachers stay booked."""
+        math = self.create_course("MATH7", "Math 7", "T2", 1)
+        Section.objects.create(id="MATH7-1", course=math, section_number=1,
+                               teacher=self.science_teacher, period_id="P1")
+        self.create_course("SCI7", "Science 7", "T2", 1)
+
+        result = SectionPlacementService.generate_sections()
+
+        self.assertEqual(result['sections_created'], 1)
+        self.assertEqual(Section.objects.get(course_id="SCI7").period_id, "P2")
+
+
+class AvailabilityUtilsTest(TestCase):
+    def test_parse_availability(self):
+        """Ranges, single entries and the different separators are understood."""
+        slots = parse_availability("M1-M3|TH2;F1")
+        self.assertEqual(slots, {("M", "1"), ("M", "2"), ("M", "3"), ("TH", "2"), ("F", "1")})
+        self.assertIsNone(parse_availability(""))
+
+        self.assertTrue(is_available(slots, day_mask("M"), "2"))
+        self.assertFalse(is_available(slots, day_mask("M|TH"), "1"))
+        self.assertTrue(is_available(None, day_mask("M|T"), "5"))
+
+    def test_malformed_availability_is_rejected(self):
+        """A string with no readable entries is an error, not 'never available' or 'unrestricted'."""
+        self.assertEqual(parse_availability("9-5, X1"), set())
+        self.assertIn("Invalid availability '9-5, X1'", validate_availability("9-5, X1"))
+        self.assertIsNone(validate_availability(""))
+        self.assertIsNone(validate_availability("M1-M3"))
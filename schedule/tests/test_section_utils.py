@@ -0,0 +1,45 @@
+from django.test import TestCase
+from ..models import Course, Period, Section, Student, Enrollment, SectionSettings
+from ..utils.section_utils import get_section_size_summary, get_sections_below_min_size, get_sections_stats
+
+
+class SectionUtilsTest(TestCase):
+    def setUp(self):
+        SectionSettings.objects.create(name="Default", core_min_size=2, elective_min_size=1)
+        period = Period.objects.create(
+            id="P1", period_name="Period 1", days="M|T|W|TH|F", slot="1", start_time="08:00", end_time="08:50"
+        )
+        math = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6)
+        art = Course.objects.create(id="ART6", name="Art 6", type="elective", grade_level=6)
+
+        self.full = Section.objects.create(id="MATH6-1", course=math, section_number=1, period=period)
+        self.small = Section.objects.create(id="MATH6-2", course=math, section_number=2, period=period)
+        self.art = Section.objects.create(id="ART6-1", course=art, section_number=1, period=period)
+
+        for n in range(3):
+            student = Student.objects.create(id=f"S{n}", name=f"Student {n}", grade_level=6, preferences="")
+            Enrollment.objects.create(student=student, section=self.full)
+            if n == 0:
+                Enrollment.objects.create(student=student, section=self.small)
+
+    def test_summary_in_three_queries(self):
+        """Settings, grouped counts and the sections below minimum are each loaded once."""
+        with self.assertNumQueries(3):
+            summary = get_section_size_summary()
+            below_min = get_sections_below_min_size(summary)
+            stats = get_sections_stats(summary)
+
+        self.assertEqual([(section.id, size, minimum) for section, size, minimum in below_min],
+                         [("MATH6-2", 1, 2), ("ART6-1", 0, 1)])
+        self.assertEqual(stats['total_sections'], 3)
+        self.assertEqual(stats['sections_below_min'], 2)
+        self.assertEqual(stats['sections_at_or_above_min'], 1)
+        self.assertEqual(stats['by_course_type']['core'], {'total': 2, 'below_min': 1})
+        self.assertEqual(summary['sections_by_course_type'], {'core': 2, 'elective': 1})
+
+    def test_without_settings(self):
+        """Stats are empty and nothing is flagged when no settings exist."""
+        SectionSettings.objects.all().delete()
+
+        self.assertEqual(get_sections_stats(), {})
+        self.assertEqual(get_sections_below_min_size(), [])
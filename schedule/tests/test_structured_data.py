@@ -0,0 +1,102 @@
+import csv
+import io
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from ..models import Course, Period, Teacher, TeacherAvailability, CourseEligibleTeacher
+from ..services.csv_processors.course_processor import CourseProcessor
+from ..services.csv_processors.period_processor import PeriodProcessor
+from ..services.csv_processors.teacher_processor import TeacherProcessor
+from ..services.section_services.structured_data_service import StructuredDataService
+
+
+def reader_for(lines):
+    return csv.reader(io.StringIO("\n".join(lines)))
+
+
+class StructuredDataTest(TestCase):
+    def test_saving_keeps_structured_copies(self):
+        """Saving a teacher, course or period refreshes its parsed copy."""
+        teacher = Teacher.objects.create(id="T1", name="Ms. Lee", availability="M1-M3,T1", subjects="Math")
+        course = Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6,
+                                       eligible_teachers="T2|T1|T2")
+        period = Period.objects.create(id="P1", days="M|W|F", slot="1", start_time="08:00", end_time="08:50")
+
+        self.assertEqual(
+            sorted(teacher.availability_slots.values_list('day', 'slot')),
+            [('M', '1'), ('M', '2'), ('M', '3'), ('T', '1')]
+        )
+        self.assertEqual(list(course.eligible_teacher_links.values_list('teacher_id', flat=True)), ["T2", "T1"])
+        self.assertEqual(period.day_mask, 0b10101)
+
+        teacher.availability = ""
+        teacher.save()
+        period.days = "TH"
+        period.save(update_fields=['days'])
+
+        self.assertFalse(teacher.availability_slots.exists())
+        self.assertEqual(Period.objects.get(id="P1").day_mask, 0b01000)
+        self.assertEqual(StructuredDataService.get_teacher_availability(), {"T1": None})
+        self.assertEqual(StructuredDataService.get_eligible_teachers(), {"MATH6": ["T2", "T1"]})
+
+    def test_imports_parse_once(self):
+        """Bulk imports write the structured copies that signals would have written."""
+        TeacherProcessor.process_csv(reader_for(["T1,Pat,Lee,M1-M6|T1-T6,Math", "T2,Sam,Ray,,Art"]))
+        CourseProcessor.process_csv(reader_for(["ART6,Art 6,elective,T2|T1,6,1,year"]))
+        PeriodProcessor.process_csv(reader_for(["P1,Period 1,M|T,1,08:00,08:50", "P2,Period 2,W,2,09:00,09:50"]))
+
+        self.assertEqual(TeacherAvailability.objects.filter(teacher_id="T1").count(), 12)
+        self.assertEqual(
+            list(CourseEligibleTeacher.objects.filter(course_id="ART6").values_list('teacher_id', flat=True)),
+            ["T2", "T1"]
+        )
+        self.assertEqual(dict(Period.objects.values_list('id', 'day_mask')), {"P1": 0b00011, "P2": 0b00100})
+
+        # Teachers with no listed availability are free in every period
+        period = Period.objects.get(id="P1")
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                sorted(StructuredDataService.available_teachers(period).values_list('id', flat=True)), ["T1", "T2"]
+            )
+        self.assertEqual(
+            list(StructuredDataService.available_teachers(Period.objects.get(id="P2")).values_list('id', flat=True)),
+            ["T2"]
+        )
+
+    def test_malformed_availability_import_is_rejected(self):
+        """A teacher row whose availability has no readable entries is reported instead of imported as unrestricted."""
+        counts = TeacherProcessor.process_csv(reader_for(["T1,Pat,Lee,9-5,Math", "T2,Sam,Ray,M1,Art"]))
+
+        self.assertEqual(counts['created'], 1)
+        self.assertEqual(counts['errors'], [
+            "Line 2: Invalid availability '9-5', expected day/slot ranges such as 'M1-M6,T1-T3'"
+        ])
+        self.assertFalse(Teacher.objects.filter(id="T1").exists())
+        self.assertEqual(StructuredDataService.get_teacher_availability(), {"T2": {("M", "1")}})
+
+    def test_unreadable_availability_is_never_available(self):
+        """Only blank availability means no restrictions; text with no rows is never available."""
+        Teacher.objects.create(id="T1", name="Ms. Lee", availability="", subjects="Math")
+        Teacher.objects.create(id="T2", name="Mr. Ray", availability="M1", subjects="Art")
+        # As left by an old import, before unreadable availability was rejected
+        Teacher.objects.bulk_create([Teacher(id="T3", name="Ms. Kim", availability="9-5", subjects="Art")])
+        period = Period.objects.create(id="P1", days="M", slot="1", start_time="08:00", end_time="08:50")
+
+        self.assertEqual(
+            StructuredDataService.get_teacher_availability(), {"T1": None, "T2": {("M", "1")}, "T3": set()}
+        )
+        self.assertEqual(
+            sorted(StructuredDataService.available_teachers(period).values_list('id', flat=True)), ["T1", "T2"]
+        )
+
+    def test_rebuild_command(self):
+        """The rebuild command restores rows that were removed."""
+        Teacher.objects.create(id="T1", name="Ms. Lee", availability="M1", subjects="Math")
+        Course.objects.create(id="MATH6", name="Math 6", type="core", grade_level=6, eligible_teachers="T1")
+        TeacherAvailability.objects.all().delete()
+        CourseEligibleTeacher.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_structured_data', stdout=out)
+
+        self.assertIn('Rebuilt 1 availability rows and 1 eligible teacher rows', out.getvalue())
@@ -0,0 +1,64 @@
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from ..models import CourseEnrollment, Enrollment, Section, Student, TeacherAvailability, TrimesterCourseGroup
+from ..services.benchmark_services.synthetic_dataset_service import SyntheticDataset
+from ..services.import_services.dataset_import_service import DatasetImportService
+from ..services.section_services.conflict_service import ConflictService
+
+
+class SyntheticDatasetTest(TestCase):
+    def test_same_seed_same_dataset(self):
+        """A seed always produces the same rows, and a different seed does not."""
+        first = SyntheticDataset(students_per_grade=40, grades=2, seed=7)
+        second = SyntheticDataset(students_per_grade=40, grades=2, seed=7)
+        other = SyntheticDataset(students_per_grade=40, grades=2, seed=8)
+
+        self.assertEqual(first.rows, second.rows)
+        self.assertEqual(first.course_requests, second.course_requests)
+        self.assertNotEqual(first.rows['students'], other.rows['students'])
+
+    def test_shape(self):
+        """Sections cover every term segment and every student requests a full program."""
+        dataset = SyntheticDataset(students_per_grade=50, grades=2, first_grade=6)
+
+        self.assertEqual(len(dataset.rows['students']), 100)
+        self.assertEqual({row[4] for row in dataset.rows['students']}, {'6', '7'})
+        self.assertTrue({'year', 't1', 't2', 't3', 'q1', 'q4'} <= {row[6] for row in dataset.rows['sections']})
+        self.assertEqual({row[2] for row in dataset.rows['periods']}, {'M|T|W|TH|F', 'M|W|F', 'T|TH'})
+        self.assertEqual(len(dataset.course_requests), 100 * 12)
+
+    def test_csv_round_trip(self):
+        """The CSV files import cleanly with import_dataset, skipping the course requests file."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        out = StringIO()
+
+        call_command('generate_dataset', '--output', directory, '--students-per-grade', '30', '--grades', '2', stdout=out)
+        result = DatasetImportService.import_dataset(directory)
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual([item['name'] for item in result['skipped']], ['course_requests.csv'])
+        self.assertEqual(Student.objects.count(), 60)
+        self.assertTrue(Section.objects.filter(when='t2').exists())
+
+    def test_database_with_enrollments(self):
+        """Writing to the database adds requests, groups and a conflict-free set of enrollments."""
+        out = StringIO()
+
+        call_command('generate_dataset', '--database', '--enroll', '--students-per-grade', '30', '--grades', '2',
+                     '--part-time-ratio', '1', stdout=out)
+
+        self.assertEqual(Student.objects.count(), 60)
+        self.assertEqual(CourseEnrollment.objects.count(), 60 * 12)
+        self.assertTrue(Enrollment.objects.exists())
+        self.assertTrue(TeacherAvailability.objects.exists())
+        self.assertEqual(TrimesterCourseGroup.objects.count(), 2)
+        self.assertEqual(ConflictService.find_all_conflicts(), [])
+
+    def test_enroll_needs_database(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', '--output', tempfile.gettempdir(), '--enroll', stdout=StringIO())
@@ -25,7 +25,7 @@ from .views.schedule_generation_views import (
     schedule_generation, admin_reports
 )
 from .views.import_export_views import (
-    CSVUploadView, download_template_csv
+    CSVUploadView, download_template_csv, import_job_progress
 )
 from .views.enrollment_views import (
     enroll_students, enroll_student_in_course, remove_student_from_course, 
@@ -43,6 +43,7 @@ from .views.settings_views import section_settings
 urlpatterns = [
     path('', index, name='index'),
     path('upload/', CSVUploadView.as_view(), name='csv_upload'),
+    path('upload/jobs/<int:job_id>/', import_job_progress, name='import_job_progress'),
     path('generate/', schedule_generation, name='schedule_generation'),
     path('master/', master_schedule, name='master_schedule'),
     path('students/', student_schedules, name='student_schedules'),
@@ -0,0 +1,101 @@
+"""
+Utility functions for parsing teacher availability strings.
+
+Availability is written as day/slot ranges such as 'M1-M6,T1-T3'. Uploaded
+files also use '|' or ';' between ranges, so all three separators are accepted.
+"""
+import re
+
+from .occupancy_utils import DAY_CODES
+
+# A single day/slot entry such as 'M1', 'TH6' or 'FL'
+_ENTRY_PATTERN = re.compile(r'^(TH|M|T|W|F)(\w+)$')
+
+
+def _parse_entry(entry):
+    """Split an entry like 'TH3' into ('TH', '3'), or return None if it is malformed."""
+    match = _ENTRY_PATTERN.match(entry.strip().upper())
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+def parse_availability(availability):
+    """
+    Parse an availability string into the set of (day, slot) pairs it allows.
+
+    Args:
+        availability: String such as 'M1-M6,T1-T3'
+
+    Returns:
+        set: (day, slot) pairs, or None when the string is empty, meaning the
+        teacher is available at all times
+    """
+    if not availability or not availability.strip():
+        return None
+
+    slots = set()
+    for token in re.split(r'[,|;]', availability):
+        token = token.strip()
+        if not token:
+            continue
+
+        start_text, _, end_text = token.partition('-')
+        start = _parse_entry(start_text)
+        if start is None:
+            continue
+
+        end = _parse_entry(end_text) if end_text else start
+        if end is None or end[0] != start[0]:
+            slots.add(start)
+            continue
+
+        day = start[0]
+        if start[1].isdigit() and end[1].isdigit():
+            for slot in range(int(start[1]), int(end[1]) + 1):
+                slots.add((day, str(slot)))
+        else:
+            slots.add(start)
+            slots.add(end)
+
+    return slots
+
+
+def validate_availability(availability):
+    """
+    Check that an availability string allows at least one (day, slot).
+
+    An empty string means no restrictions, but a string with no readable
+    entries would leave the teacher available at no time, so it is rejected
+    rather than guessing what was meant.
+
+    Args:
+        availability: String such as 'M1-M6,T1-T3'
+
+    Returns:
+        str: Error message, or None when the string is empty or valid
+    """
+    if parse_availability(availability) == set():
+        return f"Invalid availability '{availability.strip()}', expected day/slot ranges such as 'M1-M6,T1-T3'"
+    return None
+
+
+def is_available(availability_slots, days, slot):
+    """
+    Check whether a teacher can teach in a period.
+
+    Args:
+        availability_slots: Result of parse_availability
+        days: Period.day_mask value (see occupancy_utils.day_mask)
+        slot: Period.slot value
+
+    Returns:
+        bool: True if the teacher is free on every day the period meets
+    """
+    if availability_slots is None:
+        return True
+
+    return all(
+        (day, str(slot)) in availability_slots
+        for bit, day in enumerate(DAY_CODES) if days & (1 << bit)
+    )
@@ -0,0 +1,103 @@
+"""
+Utility classes for solving small min-cost flow problems.
+
+Used to assign students to sections: students with the same set of usable
+sections are merged into one node, so the graph stays small even for a whole
+grade, and each section's seats are separate arcs with rising costs so the
+cheapest flow keeps sections balanced.
+"""
+from collections import deque
+
+
+class MinCostFlow:
+    """Successive shortest path min-cost flow with an SPFA path search."""
+
+    def __init__(self, node_count):
+        self.node_count = node_count
+        # Each arc is [to, remaining capacity, cost, index of the reverse arc]
+        self.arcs = [[] for _ in range(node_count)]
+
+    def add_arc(self, source, target, capacity, cost):
+        """
+        Add an arc and its residual reverse arc.
+
+        Returns:
+            tuple: (node, arc index) identifying the arc for flow_on()
+        """
+        self.arcs[source].append([target, capacity, cost, len(self.arcs[target])])
+        self.arcs[target].append([source, 0, -cost, len(self.arcs[source]) - 1])
+        return source, len(self.arcs[source]) - 1
+
+    def flow_on(self, arc):
+        """Get the flow sent along an arc returned by add_arc()."""
+        source, index = arc
+        target, _, _, reverse = self.arcs[source][index]
+        return self.arcs[target][reverse][1]
+
+    def solve(self, source, sink, max_flow=None):
+        """
+        Send as much flow as possible from source to sink at minimum total cost.
+
+        Args:
+            source: Source node
+            sink: Sink node
+            max_flow: Optional limit on the flow to send
+
+        Returns:
+            tuple: (flow sent, total cost)
+        """
+        total_flow = 0
+        total_cost = 0
+
+        while max_flow is None or total_flow < max_flow:
+            path = self._shortest_path(source, sink)
+            if path is None:
+                break
+
+            amount = min(self.arcs[node][index][1] for node, index in path)
+            if max_flow is not None:
+                amount = min(amount, max_flow - total_flow)
+
+            for node, index in path:
+                arc = self.arcs[node][index]
+                arc[1] -= amount
+                self.arcs[arc[0]][arc[3]][1] += amount
+                total_cost += amount * arc[2]
+            total_flow += amount
+
+        return total_flow, total_cost
+
+    def _shortest_path(self, source, sink):
+        """Find the cheapest residual path as a list of (node, arc index), or None."""
+        distance = [None] * self.node_count
+        previous = [None] * self.node_count
+        queued = [False] * self.node_count
+
+        distance[source] = 0
+        queue = deque([source])
+        queued[source] = True
+
+        while queue:
+            node = queue.popleft()
+            queued[node] = False
+            for index, (target, capacity, cost, _) in enumerate(self.arcs[node]):
+                if capacity <= 0:
+                    continue
+                candidate = distance[node] + cost
+                if distance[target] is None or candidate < distance[target]:
+                    distance[target] = candidate
+                    previous[target] = (node, index)
+                    if not queued[target]:
+                        queued[target] = True
+                        queue.append(target)
+
+        if distance[sink] is None:
+            return None
+
+        path = []
+        node = sink
+        while node != source:
+            path.append(previous[node])
+            node = previous[node][0]
+        path.reverse()
+        return path
@@ -1,7 +1,8 @@
-from django.db.models import Count
+from django.db.models import F
 from schedule.models import Student, Course, CourseGroup, Period, Section, Enrollment, CourseEnrollment
+from schedule.services.enrollment_services.enrollment_unit_of_work import EnrollmentUnitOfWork
 
-def assign_language_courses(student, language_courses=None, preferred_period=None):
+def assign_language_courses(student, language_courses=None, preferred_period=None, unit_of_work=None):
     """
     Assigns a student to language course sections based on constraints:
     - Each language course in a different trimester
@@ -11,13 +12,21 @@ def assign_language_courses(student, language_courses=None, preferred_period=Non
         student: The Student object to assign
         language_courses: Optional list of Course objects (defaults to SPA6, CHI6, FRE6)
         preferred_period: Optional preferred Period object
+        unit_of_work: Optional EnrollmentUnitOfWork to stage enrollments in; when
+            omitted the enrollments are written in one bulk insert before returning
         
     Returns:
         tuple: (success, message, assignments)
             - success: Boolean indicating if assignment was successful
             - message: Status message
-            - assignments: List of created Enrollment objects
+            - assignments: List of new Enrollment objects; saved ones when the enrollments
+              are written here, unsaved ones (no primary key) when staged in unit_of_work
     """
+    if unit_of_work is None:
+        with EnrollmentUnitOfWork() as work:
+            success, message, _ = assign_language_courses(student, language_courses, preferred_period, work)
+        return (success, message, work.created)
+    
     # Default to 6th grade language courses if none provided
     if language_courses is None:
         language_courses = Course.objects.filter(id__in=['SPA6', 'CHI6', 'FRE6'])
@@ -51,7 +60,7 @@ def assign_language_courses(student, language_courses=None, preferred_period=Non
         
         sections_by_period_trimester[period_id][trimester][section.course_id] = {
             'section': section,
-            'current_enrollment': section.students.count(),
+            'current_enrollment': section.enrolled_count,
             'max_capacity': section.course.max_students
         }
     
@@ -113,11 +122,9 @@ def assign_language_courses(student, language_courses=None, preferred_period=Non
                             section_data = sections_by_period_trimester[existing_period][trimester][course_id]
                             
                             if section_data['current_enrollment'] < section_data['max_capacity']:
-                                # Create enrollment
-                                enrollment = Enrollment.objects.create(
-                                    student=student,
-                                    section=section_data['section']
-                                )
+                                # Stage enrollment
+                                enrollment = Enrollment(student=student, section=section_data['section'])
+                                unit_of_work.add(student.id, section_data['section'].id)
                                 new_assignments.append(enrollment)
                                 
                                 # Mark this trimester as used
@@ -198,11 +205,9 @@ def assign_language_courses(student, language_courses=None, preferred_period=Non
             trimester not in assigned_trimesters and 
             section_data['current_enrollment'] < section_data['max_capacity']):
             
-            # Create enrollment
-            enrollment = Enrollment.objects.create(
-                student=student,
-                section=section_data['section']
-            )
+            # Stage enrollment
+            enrollment = Enrollment(student=student, section=section_data['section'])
+            unit_of_work.add(student.id, section_data['section'].id)
             new_assignments.append(enrollment)
             
             assigned_trimesters.add(trimester)
@@ -211,9 +216,9 @@ def assign_language_courses(student, language_courses=None, preferred_period=Non
     if len(assigned_courses) == len(language_courses):
         return (True, "Successfully assigned all language courses", new_assignments)
     else:
-        # Clean up partial assignments
+        # Drop partial assignments before they are written
         for enrollment in new_assignments:
-            enrollment.delete()
+            unit_of_work.remove(student.id, enrollment.section_id)
         return (False, "Could not assign all required language courses", [])
 
 
@@ -284,7 +289,7 @@ def balance_language_course_sections():
     for course in language_courses:
         # Get sections for this course
         sections = Section.objects.filter(course=course).annotate(
-            student_count=Count('students')
+            student_count=F('enrolled_count')
         ).order_by('student_count')
         
         if sections.count() < 2:
@@ -0,0 +1,125 @@
+"""
+Utility functions for describing when a section meets as a bitmask.
+
+A section occupies a set of (period slot, day, term segment) cells. The school
+year is split into twelve segment units so that semesters (6 units), trimesters
+(4 units) and quarters (3 units) all line up on unit boundaries. Two sections
+overlap exactly when their masks share a bit, so every conflict check reduces to
+a single bitwise AND.
+"""
+
+DAY_CODES = ['M', 'T', 'W', 'TH', 'F']
+
+# Number of units the school year is divided into (LCM of 2, 3 and 4)
+SEGMENT_UNITS = 12
+
+YEAR_SEGMENT_MASK = (1 << SEGMENT_UNITS) - 1
+
+
+def _units(first, last):
+    """Return a segment mask covering units first..last inclusive."""
+    return ((1 << (last - first + 1)) - 1) << first
+
+
+# Segment masks for every Section.when choice. The unspecific 'semester',
+# 'trimester' and 'quarter' values do not say which part of the year they
+# cover, so they are treated as occupying the whole year.
+WHEN_SEGMENT_MASKS = {
+    'year': YEAR_SEGMENT_MASK,
+    'semester': YEAR_SEGMENT_MASK,
+    'trimester': YEAR_SEGMENT_MASK,
+    'quarter': YEAR_SEGMENT_MASK,
+    's1': _units(0, 5),
+    's2': _units(6, 11),
+    't1': _units(0, 3),
+    't2': _units(4, 7),
+    't3': _units(8, 11),
+    'q1': _units(0, 2),
+    'q2': _units(3, 5),
+    'q3': _units(6, 8),
+    'q4': _units(9, 11),
+}
+
+# Number of bits used by one period slot (every day, every segment unit)
+_SLOT_WIDTH = len(DAY_CODES) * SEGMENT_UNITS
+
+
+def segment_mask(when):
+    """Get the term segment mask for a Section.when value."""
+    return WHEN_SEGMENT_MASKS.get((when or 'year').lower(), YEAR_SEGMENT_MASK)
+
+
+def day_mask(days):
+    """
+    Get a bitmask of the days in a Period.days string such as 'M|W|F'.
+    A period with no days listed is treated as meeting every day.
+    """
+    mask = 0
+    for code in (days or '').split('|'):
+        code = code.strip().upper()
+        if code in DAY_CODES:
+            mask |= 1 << DAY_CODES.index(code)
+    return mask or (1 << len(DAY_CODES)) - 1
+
+
+def masks_overlap(mask_a, mask_b):
+    """Check whether two occupancy masks share any cell."""
+    return bool(mask_a & mask_b)
+
+
+class OccupancyIndex:
+    """
+    Builds occupancy masks for sections.
+
+    Period slots are given bit positions the first time they are seen, so masks
+    built by the same index can be compared with each other. Periods sharing a
+    slot (e.g. a Monday and a Thursday row for slot 1) land in the same slot row
+    and only overlap on the days they have in common.
+    """
+
+    def __init__(self):
+        self.slot_positions = {}
+        self._mask_cache = {}
+
+    def slot_position(self, slot):
+        """Get the bit position assigned to a period slot."""
+        return self.slot_positions.setdefault(slot, len(self.slot_positions))
+
+    def section_mask(self, slot, days, when):
+        """
+        Get the mask for a section from its period slot, period day mask and when value.
+
+        Args:
+            slot: Period.slot value
+            days: Period.day_mask value (see day_mask)
+            when: Section.when value
+        """
+        if slot is None:
+            return 0
+
+        key = (slot, days, when)
+        if key not in self._mask_cache:
+            base = self.slot_position(slot) * _SLOT_WIDTH
+            segments = segment_mask(when)
+
+            # Repeat the segment mask in every day cell the period covers
+            mask = 0
+            for day_index in range(len(DAY_CODES)):
+                if days & (1 << day_index):
+                    mask |= segments << (base + day_index * SEGMENT_UNITS)
+            self._mask_cache[key] = mask
+        return self._mask_cache[key]
+
+    def period_mask(self, slot, days):
+        """Get the mask for a full-year section meeting in the given period slot and day mask."""
+        return self.section_mask(slot, days, 'year')
+
+    def mask_for_row(self, row):
+        """Get the mask for a section row loaded with period__slot, period__day_mask and when."""
+        return self.section_mask(row['period__slot'], row['period__day_mask'], row['when'])
+
+    def mask_for_section(self, section):
+        """Get the mask for a Section instance (its period should be select_related)."""
+        if not section.period_id:
+            return 0
+        return self.section_mask(section.period.slot, section.period.day_mask, section.when)
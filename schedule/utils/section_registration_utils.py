@@ -6,6 +6,7 @@ import random
 from django.db import transaction
 from django.db.models import Count, Q, F
 from schedule.models import Student, Course, Section, CourseEnrollment, Enrollment, CourseGroup
+from schedule.services.section_services.enrollment_count_service import EnrollmentCountService
 
 def get_section_stats(sections):
     """
@@ -20,7 +21,7 @@ def get_section_stats(sections):
     section_stats = []
     
     for section in sections:
-        enrolled_count = section.students.count()
+        enrolled_count = section.enrolled_count
         has_max_size = section.max_size is not None
         has_exact_size = section.exact_size is not None
         
@@ -110,8 +111,9 @@ def deregister_sections(course_id=None, grade_level=None):
         # Count enrollments before deletion for reporting
         enrollment_count = Enrollment.objects.filter(query).count()
         
-        # Delete the enrollments
-        Enrollment.objects.filter(query).delete()
+        # Delete the enrollments, adjusting each section's count once
+        with EnrollmentCountService.deferred():
+            Enrollment.objects.filter(query).delete()
         
         return enrollment_count
 
@@ -1,88 +1,121 @@
 """
 Utility functions for working with sections and section settings.
 """
-from django.db.models import Count, Q, F
+from django.db.models import Count, Q
 from ..models import Section, SectionSettings
 
+# Minimum sizes used when no SectionSettings exist
+DEFAULT_MIN_SIZES = {
+    'core': 15,
+    'elective': 10,
+    'required_elective': 12,
+    'language': 12
+}
 
-def get_section_min_size(section):
+COURSE_TYPES = ['core', 'elective', 'required_elective', 'language']
+
+
+def min_size_for_course_type(course_type, settings):
     """
-    Get the minimum size for a section based on its course type.
+    Get the minimum section size for a course type from an already loaded settings object.
     """
-    # Get active settings
-    settings = SectionSettings.objects.first()
     if not settings:
-        # Default values if no settings exist
-        return {
-            'core': 15,
-            'elective': 10,
-            'required_elective': 12,
-            'language': 12
-        }.get(section.course.type, 10)
-    
-    return settings.get_min_size_for_course_type(section.course.type)
-
-
-def get_sections_below_min_size():
+        return DEFAULT_MIN_SIZES.get(course_type, 10)
+    return settings.get_min_size_for_course_type(course_type)
+
+
+def get_section_min_size(section, settings=None):
+    """
+    Get the minimum size for a section based on its course type.
+    Pass settings when checking many sections so they are only loaded once.
+    """
+    if settings is None:
+        settings = SectionSettings.objects.first()
+    return min_size_for_course_type(section.course.type, settings)
+
+
+def get_section_size_summary(settings=None):
+    """
+    Count sections, and sections below their minimum size, per course type.
+
+    Sections are counted in one grouped query by course type and enrolled
+    count, so the number of rows read depends on the spread of section sizes
+    rather than on the number of sections. The result is plain data, so it can
+    be computed once and shared by the report functions below.
+
+    Returns:
+        dict: 'settings', 'min_sizes' ({course type: minimum size}),
+        'sections_by_course_type' ({course type or 'Unknown': number of sections})
+        and 'stats' in the shape returned by get_sections_stats
+    """
+    if settings is None:
+        settings = SectionSettings.objects.first()
+
+    rows = Section.objects.values_list('course__type', 'enrolled_count').annotate(total=Count('id')).order_by()
+
+    min_sizes = {course_type: min_size_for_course_type(course_type, settings) for course_type in COURSE_TYPES}
+    sections_by_course_type = {}
+    stats = {
+        'total_sections': 0,
+        'sections_below_min': 0,
+        'sections_at_or_above_min': 0,
+        'by_course_type': {course_type: {'total': 0, 'below_min': 0} for course_type in COURSE_TYPES}
+    }
+
+    for course_type, enrolled_count, total in rows:
+        if course_type not in min_sizes:
+            min_sizes[course_type] = min_size_for_course_type(course_type, settings)
+        key = course_type or 'Unknown'
+        sections_by_course_type[key] = sections_by_course_type.get(key, 0) + total
+
+        type_stats = stats['by_course_type'].setdefault(course_type, {'total': 0, 'below_min': 0})
+        type_stats['total'] += total
+        stats['total_sections'] += total
+        if enrolled_count < min_sizes[course_type]:
+            stats['sections_below_min'] += total
+            type_stats['below_min'] += total
+        else:
+            stats['sections_at_or_above_min'] += total
+
+    return {
+        'settings': settings,
+        'min_sizes': min_sizes,
+        'sections_by_course_type': sections_by_course_type,
+        'stats': stats,
+    }
+
+
+def get_sections_below_min_size(summary=None):
     """
     Get all sections that are below their minimum size.
+    Only those sections are loaded, in one query.
     Returns a list of tuples: (section, current_size, min_size)
     """
-    sections = Section.objects.all().prefetch_related('students').select_related('course')
-    
-    # Get settings
-    settings = SectionSettings.objects.first()
+    if summary is None:
+        summary = get_section_size_summary()
+
+    settings = summary['settings']
     if not settings or not settings.enforce_min_sizes:
         return []
-    
-    sections_below_min = []
-    
-    for section in sections:
-        current_size = section.students.count()
-        min_size = get_section_min_size(section)
-        
-        if current_size < min_size:
-            sections_below_min.append((section, current_size, min_size))
-    
-    return sorted(sections_below_min, key=lambda x: (x[0].course.type, x[0].course.name, x[0].section_number))
-
-
-def get_sections_stats():
+
+    min_sizes = summary['min_sizes']
+    below_min = Q(pk__in=[])
+    for course_type, min_size in min_sizes.items():
+        below_min |= Q(course__type=course_type, enrolled_count__lt=min_size)
+
+    sections = Section.objects.filter(below_min).select_related('course', 'period') \
+        .order_by('course__type', 'course__name', 'section_number')
+    return [(section, section.enrolled_count, min_sizes[section.course.type]) for section in sections]
+
+
+def get_sections_stats(summary=None):
     """
     Get statistics about section sizes.
     """
-    settings = SectionSettings.objects.first()
-    if not settings:
+    if summary is None:
+        summary = get_section_size_summary()
+
+    if not summary['settings']:
         return {}
-    
-    sections = Section.objects.all().prefetch_related('students').select_related('course')
-    
-    stats = {
-        'total_sections': sections.count(),
-        'sections_below_min': 0,
-        'sections_at_or_above_min': 0,
-        'by_course_type': {
-            'core': {'total': 0, 'below_min': 0},
-            'elective': {'total': 0, 'below_min': 0},
-            'required_elective': {'total': 0, 'below_min': 0},
-            'language': {'total': 0, 'below_min': 0},
-        }
-    }
-    
-    for section in sections:
-        course_type = section.course.type
-        if course_type not in stats['by_course_type']:
-            stats['by_course_type'][course_type] = {'total': 0, 'below_min': 0}
-        
-        stats['by_course_type'][course_type]['total'] += 1
-        
-        current_size = section.students.count()
-        min_size = get_section_min_size(section)
-        
-        if current_size < min_size:
-            stats['sections_below_min'] += 1
-            stats['by_course_type'][course_type]['below_min'] += 1
-        else:
-            stats['sections_at_or_above_min'] += 1
-    
-    return stats 
\ No newline at end of file
+
+    return summary['stats']
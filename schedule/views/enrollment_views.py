@@ -26,8 +26,14 @@ def enroll_students(request):
     if grade_filter:
         courses = courses.filter(grade_level=grade_filter)
     
-    # Get student data with enrollment info
-    result = CourseEnrollmentService.get_enrolled_students_with_counts(grade_filter, course_ids)
+    # Get one page of student data with enrollment info
+    result = CourseEnrollmentService.get_enrolled_students_with_counts(
+        grade_filter, course_ids, page=request.GET.get('page')
+    )
+    
+    # Keep the filters when moving between pages
+    filter_query = request.GET.copy()
+    filter_query.pop('page', None)
     
     context = {
         'grades': grades,
@@ -35,7 +41,11 @@ def enroll_students(request):
         'courses': courses,
         'selected_course_ids': course_ids,
         'student_data': result['students'],
-        'total_students': result['total_count']
+        'page_obj': result['page'],
+        'filter_query': filter_query.urlencode(),
+        'total_students': result['total_count'],
+        'enrolled_students': result['enrolled_count'],
+        'available_students': result['total_count'] - result['enrolled_count']
     }
     
     return render(request, 'schedule/enroll_students.html', context)
@@ -200,7 +210,11 @@ def assign_students_to_sections(request):
         data = json.loads(request.body)
         grade_level = data.get('grade_level')
         
-        result = SectionAssignmentService.assign_students_to_sections(grade_level)
+        if data.get('whole_student'):
+            # Solve each student's courses together instead of course by course
+            result = SectionAssignmentService.assign_student_schedules(grade_level)
+        else:
+            result = SectionAssignmentService.assign_students_to_sections(grade_level)
         
         return JsonResponse({
             'status': 'success' if result['success'] else 'error',
@@ -1,15 +1,19 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
 from django.views import View
 import csv
-from io import StringIO
-from django.db import transaction
+import logging
+from io import TextIOWrapper
 from django.core.exceptions import ValidationError
-from ..models import Teacher, Room, Student, Course, Period, Section
+from ..models import Teacher, Room, Student, Course, Period, Section, ImportJob
 from ..forms import CSVUploadForm
 from ..services.csv_processors.processor_factory import ProcessorFactory
 from ..services.template_service import TemplateService
+from ..services.import_services.import_job_service import ImportJobService
+
+logger = logging.getLogger(__name__)
 
 
 class CSVUploadView(View):
@@ -43,6 +47,12 @@ class CSVUploadView(View):
         
         # Build and return context with form and headers
         context = self.get_context_with_headers(form)
+        
+        # Show the progress of a background import that was just started
+        job_id = request.GET.get('job')
+        if job_id and job_id.isdigit():
+            context['import_job'] = ImportJob.objects.filter(pk=job_id).first()
+        
         return render(request, self.template_name, context)
     
     def post(self, request):
@@ -59,11 +69,12 @@ class CSVUploadView(View):
                 messages.error(request, 'File is not a CSV file. Please upload a file with .csv extension.')
                 return render(request, self.template_name, self.get_context_with_headers(form))
             
-            # Read the file
+            # Read the file, decoding it incrementally as rows are consumed
+            text_file = None
             try:
-                decoded_file = csv_file.read().decode('utf-8')
-                io_string = StringIO(decoded_file)
-                reader = csv.reader(io_string)
+                csv_file.seek(0)
+                text_file = TextIOWrapper(csv_file.file, encoding='utf-8', newline='')
+                reader = csv.reader(text_file)
                 
                 # Get headers from first row
                 headers = next(reader)
@@ -76,20 +87,47 @@ class CSVUploadView(View):
                     messages.error(request, str(e))
                     return render(request, self.template_name, self.get_context_with_headers(form))
                     
-                expected_headers = processor.get_expected_headers()
+                missing_headers = processor.check_headers(headers)
                 
-                if not all(header in headers for header in expected_headers):
-                    missing_headers = [h for h in expected_headers if h not in headers]
+                if missing_headers:
                     messages.error(request, f'CSV file missing required headers: {", ".join(missing_headers)}')
                     return render(request, self.template_name, self.get_context_with_headers(form))
                 
-                # Process the data using the appropriate processor
+                # Check the whole file without saving anything
+                if form.cleaned_data.get('validate_only'):
+                    report = processor.validate_csv(reader)
+                    summary = (f'{report["rows"]} rows checked: {report["create"]} to create, '
+                               f'{report["update"]} to update, {report["unchanged"]} unchanged. Nothing was saved.')
+                    if report['valid']:
+                        messages.success(request, f'{csv_file.name} is valid. {summary}')
+                    else:
+                        messages.error(request, f'{csv_file.name} has {len(report["errors"])} errors. {summary}')
+                    
+                    context = self.get_context_with_headers(form)
+                    context['validation_report'] = report
+                    return render(request, self.template_name, context)
+                
+                # Hand large files to the background worker and let the page poll for progress
+                if form.cleaned_data.get('background'):
+                    job = ImportJobService.create_job(data_type, csv_file)
+                    ImportJobService.start_job(job)
+                    messages.info(request, f'Import of {csv_file.name} started in the background.')
+                    return redirect(f"{reverse('csv_upload')}?job={job.id}")
+                
+                # Process the data in batches, each committed as it is read
+                def report_progress(totals):
+                    logger.info(
+                        "Imported %s batch %d: %d rows read, %d created, %d updated, %d unchanged",
+                        data_type, totals['batches'], totals['rows'],
+                        totals['created'], totals['updated'], totals['unchanged']
+                    )
+                
                 try:
-                    with transaction.atomic():
-                        counts = processor.process_csv(reader)
+                    counts = processor.process_csv_stream(reader, progress=report_progress)
                     
                     if 'created' in counts and 'updated' in counts:
-                        messages.success(request, f'Successfully processed {data_type} data: {counts["created"]} created, {counts["updated"]} updated.')
+                        messages.success(request, f'Successfully processed {data_type} data: {counts["created"]} created, {counts["updated"]} updated, {counts.get("unchanged", 0)} unchanged '
+                                                  f'({counts.get("rows", 0)} rows in {counts.get("batches", 0)} batches).')
                         
                         # Display any errors that occurred during processing
                         if 'errors' in counts and counts['errors']:
@@ -121,6 +159,10 @@ class CSVUploadView(View):
             except Exception as e:
                 messages.error(request, f'Error reading CSV file: {str(e)}')
                 return render(request, self.template_name, self.get_context_with_headers(form))
+            finally:
+                if text_file is not None:
+                    # Leave the uploaded file open for Django to clean up
+                    text_file.detach()
         
         # Form is invalid
         return render(request, self.template_name, self.get_context_with_headers(form))
@@ -136,4 +178,10 @@ class CSVUploadView(View):
 
 def download_template_csv(request, template_type):
     """Download a template CSV file for a specific data type."""
-    return TemplateService.get_template_csv(template_type) 
\ No newline at end of file
+    return TemplateService.get_template_csv(template_type)
+
+
+def import_job_progress(request, job_id):
+    """Get the progress of a background CSV import as JSON."""
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return JsonResponse(ImportJobService.get_progress(job))
@@ -91,10 +91,9 @@ def section_registration(request):
             
             elif action == 'assign_language_core':
                 grade_level = data.get('grade_level', 6)  # Default to 6th grade
-                undo_depth = data.get('undo_depth', 3)    # Default undo depth
                 
                 # Call the language-core algorithm service
-                result = AlgorithmService.register_language_and_core_courses(grade_level, undo_depth)
+                result = AlgorithmService.register_language_and_core_courses(grade_level)
                 
                 # Create a properly formatted response
                 return JsonResponse({
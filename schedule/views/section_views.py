@@ -154,7 +154,7 @@ def delete_section(request, section_id):
     # Confirmation page
     context = {
         'section': section,
-        'student_count': section.students.count()
+        'student_count': section.enrolled_count
     }
     
     return render(request, 'schedule/delete_section_confirm.html', context) 
\ No newline at end of file
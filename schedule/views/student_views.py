@@ -1,10 +1,10 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.http import HttpResponse, JsonResponse
-import csv
 from django.views import View
 from ..models import Student, Section, Enrollment, Course, Period
 from ..forms import StudentForm
+from ..services.section_services.export_service import ExportService
 import json
 from django.db.models import Q, Count
 
@@ -119,38 +119,7 @@ def delete_student(request, student_id):
 
 def export_student_schedules(request):
     """Export all student schedules to a CSV file."""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="student_schedules.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Student ID', 'Name', 'Grade', 'Period', 'Course', 'Teacher', 'Room'])
-    
-    students = Student.objects.all().order_by('name')
-    
-    for student in students:
-        sections = student.sections.all().select_related('period', 'course', 'teacher', 'room')
-        
-        if not sections:
-            # Write a row for students with no sections
-            writer.writerow([student.id, student.name, student.grade_level, '', '', '', ''])
-        else:
-            for section in sections:
-                period_id = section.period.id if section.period else ''
-                course_name = section.course.name if section.course else ''
-                teacher_name = section.teacher.name if section.teacher else ''
-                room_number = section.room.number if section.room else ''
-                
-                writer.writerow([
-                    student.id,
-                    student.name,
-                    student.grade_level,
-                    period_id,
-                    course_name,
-                    teacher_name,
-                    room_number
-                ])
-    
-    return response
+    return ExportService.export_student_roster()
 
 
 def student_schedule(request, student_id):
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.views import View
 from ..models import Teacher
+from ..utils.availability_utils import validate_availability
 from django.db import transaction
 
 
@@ -22,6 +23,9 @@ def create_teacher(request):
             # Validate input
             if not name:
                 raise ValueError("Name is required")
+            error = validate_availability(availability)
+            if error:
+                raise ValueError(error)
             
             # Create the teacher
             with transaction.atomic():
@@ -59,6 +63,9 @@ def edit_teacher(request, teacher_id):
             # Validate input
             if not name:
                 raise ValueError("Name is required")
+            error = validate_availability(availability)
+            if error:
+                raise ValueError(error)
             
             # Update the teacher
             with transaction.atomic():